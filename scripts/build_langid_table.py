@@ -0,0 +1,116 @@
+"""
+生成 n-gram 语言识别表
+
+以 langdetect 自带的语言 profile（1~3-gram 频次）为语料，
+计算每个哈希桶在各语言下的对数概率并量化为 uint8，写入 data/langid/ngram.bin。
+运行时只需 numpy，无需 langdetect。
+"""
+import json
+import math
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from loguru import logger
+
+from src.core.ngram_langid import (
+    TABLE_PATH, MAGIC, FORMAT_VERSION, HEADER, LANG_CODE_SIZE, MAX_N, bucket_of
+)
+
+# 未出现的 n-gram 的概率下限
+MIN_PROB = 1e-7
+
+# 合并的语言代码
+LANG_ALIASES = {"zh-cn": "zh", "zh-tw": "zh"}
+
+
+def load_profiles() -> dict:
+    """
+    读取 langdetect profile
+
+    Returns:
+        {语言代码: (n-gram 频次, 各长度总数)}
+    """
+    import langdetect
+
+    profile_dir = Path(langdetect.__file__).parent / "profiles"
+    profiles = {}
+
+    for path in sorted(profile_dir.iterdir()):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        lang = LANG_ALIASES.get(data["name"], data["name"])
+        freq, n_words = profiles.setdefault(lang, ({}, [0] * MAX_N))
+
+        for gram, count in data["freq"].items():
+            gram = gram.lower()
+            freq[gram] = freq.get(gram, 0) + count
+        for i in range(MAX_N):
+            n_words[i] += data["n_words"][i]
+
+    return profiles
+
+
+def build_table(profiles: dict, n_buckets: int):
+    """
+    计算量化后的负对数概率矩阵
+
+    Returns:
+        (语言代码列表, uint8 矩阵, 量化比例)
+    """
+    languages = sorted(profiles)
+    probs = np.zeros((n_buckets, len(languages)), dtype=np.float64)
+
+    for col, lang in enumerate(languages):
+        freq, n_words = profiles[lang]
+        for gram, count in freq.items():
+            n = len(gram)
+            if n > MAX_N or not gram.strip() or not n_words[n - 1]:
+                continue
+            probs[bucket_of(gram, n_buckets), col] += count / n_words[n - 1]
+
+    cost = -np.log(np.clip(probs, MIN_PROB, 1.0))
+    scale = 255 / -math.log(MIN_PROB)
+    quantized = np.round(cost * scale).clip(0, 255).astype(np.uint8)
+
+    return languages, quantized, scale
+
+
+def write_table(path: Path, languages: list, table: "np.ndarray", scale: float):
+    """写入表文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, table.shape[0], len(languages), MAX_N, scale))
+        for lang in languages:
+            f.write(lang.encode("ascii").ljust(LANG_CODE_SIZE, b"\0"))
+        f.write(np.ascontiguousarray(table).tobytes())
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="生成 n-gram 语言识别表")
+    parser.add_argument("--buckets", type=int, default=16384, help="哈希桶数")
+    parser.add_argument("--output", type=Path, default=TABLE_PATH, help="输出路径")
+
+    args = parser.parse_args()
+
+    try:
+        profiles = load_profiles()
+    except ImportError:
+        logger.error("生成识别表需要安装 langdetect")
+        return
+
+    languages, table, scale = build_table(profiles, args.buckets)
+    write_table(args.output, languages, table, scale)
+
+    size_kb = args.output.stat().st_size / 1024
+    logger.success(f"🎉 语言识别表已生成: {args.output} ({len(languages)} 种语言, {size_kb:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
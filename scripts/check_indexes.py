@@ -0,0 +1,78 @@
+"""
+索引诊断工具
+对仓储的每个只读查询执行 EXPLAIN，列出执行计划并标出全表扫描
+"""
+import sys
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.database import db_manager
+from src.data.index_advisor import analyze
+from src.data.repository import EntryRepository, CacheRepository, StatsRepository
+
+
+def repository_queries() -> list:
+    """需要检查的仓储查询（只读）"""
+    entry_repo = EntryRepository()
+    cache_repo = CacheRepository()
+    stats_repo = StatsRepository()
+    now = datetime.now()
+
+    def review_statistics():
+        entry_repo.invalidate_summary()
+        return entry_repo.get_review_statistics()
+
+    return [
+        ("EntryRepository.get_by_id", lambda: entry_repo.get_by_id(1)),
+        ("EntryRepository.get_all", lambda: entry_repo.get_all(limit=100)),
+        ("EntryRepository.get_page", lambda: entry_repo.get_page(limit=100, cursor=(now, 1 << 30))),
+        ("EntryRepository.iter_entries", lambda: list(islice(entry_repo.iter_entries(), 1))),
+        ("EntryRepository.search", lambda: entry_repo.search("translate", limit=50)),
+        ("EntryRepository.get_review_list", lambda: entry_repo.get_review_list(limit=50)),
+        ("EntryRepository.get_total_count", entry_repo.get_total_count),
+        ("EntryRepository.get_entries_by_date", lambda: entry_repo.get_entries_by_date(now.date())),
+        ("EntryRepository.get_entries_to_review", entry_repo.get_entries_to_review),
+        ("EntryRepository.get_mastered_entries", entry_repo.get_mastered_entries),
+        ("EntryRepository.get_due_reviews_by_urgency", entry_repo.get_due_reviews_by_urgency),
+        ("EntryRepository.get_review_statistics", review_statistics),
+        ("CacheRepository.get_total_size", cache_repo.get_total_size),
+        ("StatsRepository.get_today_stats", stats_repo.get_today_stats),
+        ("StatsRepository.get_stats", lambda: stats_repo.get_stats(30)),
+    ]
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="索引诊断：EXPLAIN 仓储查询并标出全表扫描")
+    parser.add_argument("--verbose", "-v", action="store_true", help="显示 SQL 语句")
+
+    args = parser.parse_args()
+
+    plans = analyze(db_manager.engine, repository_queries())
+    flagged = 0
+
+    for plan in plans:
+        status = "❌ 全表扫描: " + ", ".join(plan.full_scans) if plan.full_scans else "✅"
+        print(f"\n{plan.name}  {status}")
+        if args.verbose:
+            print(f"  SQL: {' '.join(plan.statement.split())}")
+        for line in plan.plan:
+            print(f"    {line}")
+        flagged += bool(plan.full_scans)
+
+    print("\n" + "=" * 70)
+    print(f"共 {len(plans)} 条查询，{flagged} 条存在全表扫描")
+    if flagged:
+        print("提示: 运行 python scripts/init_database.py 补齐索引；"
+              "未建立全文索引时搜索会退化为 LIKE 全表扫描")
+
+
+if __name__ == "__main__":
+    main()
@@ -142,10 +142,14 @@ def test_database():
         from src.utils.config_loader import config
         
         print(f"  ℹ️  数据库配置:")
-        print(f"     主机: {config.database.host}")
-        print(f"     端口: {config.database.port}")
-        print(f"     用户: {config.database.user}")
-        print(f"     数据库: {config.database.database}")
+        print(f"     后端: {config.database.backend}")
+        if config.database.backend == "sqlite":
+            print(f"     文件: {config.database.sqlite_file}")
+        else:
+            print(f"     主机: {config.database.host}")
+            print(f"     端口: {config.database.port}")
+            print(f"     用户: {config.database.user}")
+            print(f"     数据库: {config.database.database}")
         
         # 尝试连接
         try:
@@ -12,7 +12,6 @@ import sys
 import json
 import hashlib
 from pathlib import Path
-from datetime import datetime
 
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent.parent
@@ -37,7 +36,7 @@ class ExcelDictImporter:
         
     def import_from_excel(self, excel_path: str, update_local_dict: bool = True, 
                           save_to_db: bool = True, start_row: int = 0, 
-                          max_rows: int = None):
+                          max_rows: int = None, chunk_size: int = 1000):
         """
         从 Excel 文件导入词库
         
@@ -47,6 +46,7 @@ class ExcelDictImporter:
             save_to_db: 是否保存到数据库
             start_row: 起始行（0-based，默认从第一行开始）
             max_rows: 最多导入多少行（None 表示全部导入）
+            chunk_size: 数据库批量写入每块条数
         """
         logger.info(f"开始导入 Excel 词库: {excel_path}")
         
@@ -129,7 +129,7 @@ class ExcelDictImporter:
         
         # 6. 保存到数据库
         if save_to_db:
-            success = self._save_to_db(dict_data)
+            success = self._save_to_db(dict_data, chunk_size)
             if not success:
                 return False
         
@@ -162,8 +162,8 @@ class ExcelDictImporter:
             logger.error(f"更新本地词典失败: {e}")
             return False
     
-    def _save_to_db(self, dict_data: dict) -> bool:
-        """保存到数据库"""
+    def _save_to_db(self, dict_data: dict, chunk_size: int = 1000) -> bool:
+        """保存到数据库（分块批量写入，已存在的词条更新译文）"""
         try:
             # 初始化数据库
             self.db_manager = DatabaseManager()
@@ -172,48 +172,27 @@ class ExcelDictImporter:
             
             logger.info(f"开始保存到数据库...")
             
-            saved_count = 0
-            skipped_count = 0
-            error_count = 0
+            entries = [
+                Entry(
+                    source_text=word,
+                    translation=entry_data['translation'],
+                    source_lang='en',
+                    target_lang='zh',
+                    notes=entry_data.get('example', '')
+                )
+                for word, entry_data in dict_data.items()
+            ]
             
-            for word, entry_data in dict_data.items():
-                try:
-                    # 检查是否已存在
-                    existing = self.entry_repo.get_by_text(word)
-                    if existing:
-                        skipped_count += 1
-                        continue
-                    
-                    # 创建词条
-                    entry = Entry(
-                        source_text=word,
-                        translation=entry_data['translation'],
-                        source_lang='en',
-                        target_lang='zh',
-                        notes=entry_data.get('example', ''),
-                        created_at=datetime.now(),
-                        updated_at=datetime.now()
-                    )
-                    
-                    # 保存
-                    self.entry_repo.save(entry)
-                    saved_count += 1
-                    
-                    # 每 100 条打印一次进度
-                    if saved_count % 100 == 0:
-                        logger.info(f"已保存 {saved_count} 条...")
-                
-                except Exception as e:
-                    error_count += 1
-                    logger.warning(f"保存词条失败 '{word}': {e}")
-                    if error_count > 10:  # 如果错误太多，提前终止
-                        logger.error("错误过多，终止导入")
-                        return False
+            totals = {"inserted": 0, "updated": 0, "skipped": 0}
+            for i, stats in enumerate(self.entry_repo.bulk_upsert(entries, chunk_size), 1):
+                for key in totals:
+                    totals[key] += stats[key]
+                logger.info(f"第 {i} 块: 新增 {stats['inserted']}，更新 {stats['updated']}，跳过 {stats['skipped']}")
             
             logger.success(f"数据库保存完成！")
-            logger.info(f"  - 新增: {saved_count} 条")
-            logger.info(f"  - 跳过（已存在）: {skipped_count} 条")
-            logger.info(f"  - 失败: {error_count} 条")
+            logger.info(f"  - 新增: {totals['inserted']} 条")
+            logger.info(f"  - 更新: {totals['updated']} 条")
+            logger.info(f"  - 跳过（无变化）: {totals['skipped']} 条")
             
             return True
         
@@ -232,6 +211,7 @@ def main():
     parser.add_argument("--no-db", action="store_true", help="不保存到数据库")
     parser.add_argument("--start", type=int, default=0, help="起始行（0-based）")
     parser.add_argument("--max", type=int, help="最多导入多少行")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="数据库批量写入每块条数")
     
     args = parser.parse_args()
     
@@ -248,7 +228,8 @@ def main():
         update_local_dict=not args.no_local,
         save_to_db=not args.no_db,
         start_row=args.start,
-        max_rows=args.max
+        max_rows=args.max,
+        chunk_size=args.chunk_size
     )
     
     if success:
@@ -0,0 +1,258 @@
+"""
+翻译链路压测工具
+
+按目标 QPS 驱动 TranslationService.translate / translate_many（开环发压），
+统计 p50/p95/p99 延迟、吞吐量、错误数和 tokens 消耗。
+
+示例：
+    # 启动内置模拟服务，不依赖数据库，20 QPS 压测 30 秒
+    python scripts/load_test.py --mock --no-db --qps 20 --duration 30
+
+    # 批量模式，每批 8 条
+    python scripts/load_test.py --mock --no-db --mode translate_many --batch-size 8
+"""
+import sys
+import asyncio
+import random
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.utils.config_loader import config
+from src.utils.logger import setup_logger
+
+
+# 默认压测语料：单词走本地词典，短语走在线词典，句子走 AI
+DEFAULT_CORPUS = [
+    "hello", "world", "apple", "computer", "language", "beautiful", "translate",
+    "take off", "look forward to", "in spite of", "break the ice", "as a matter of fact",
+    "The quick brown fox jumps over the lazy dog.",
+    "Performance matters most when the system is under heavy load.",
+    "Could you please send me the report before the meeting tomorrow?",
+    "Learning a new language takes patience, practice and a lot of curiosity.",
+    "The weather forecast says it will rain heavily throughout the weekend.",
+]
+
+
+class _NullStatsRepository:
+    """不写数据库的统计仓储（--no-db 时使用）"""
+
+    def update_today_stats(self, **kwargs):
+        pass
+
+
+class LoadTestReport:
+    """压测结果统计"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.tokens = 0
+        self.items = 0
+        self.translator_types: Counter = Counter()
+        self.started_at = 0.0
+        self.finished_at = 0.0
+
+    def record(self, latency: float, results: list):
+        """记录一次请求"""
+        self.latencies.append(latency)
+        for result in results:
+            self.items += 1
+            self.translator_types[result.translator_type or "unknown"] += 1
+            self.tokens += result.tokens_used or 0
+            if result.translator_type in ("failed", "rate_limited") or result.translation.startswith("翻译失败"):
+                self.errors += 1
+
+    def record_error(self, latency: float):
+        """记录一次异常"""
+        self.latencies.append(latency)
+        self.errors += 1
+        self.items += 1
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        """计算分位数（最近秩法）"""
+        if not values:
+            return 0.0
+        index = max(0, min(len(values) - 1, int(round(pct / 100 * len(values))) - 1))
+        return values[index]
+
+    def print_summary(self):
+        """输出报告"""
+        elapsed = self.finished_at - self.started_at
+        latencies = sorted(self.latencies)
+
+        print("\n" + "=" * 60)
+        print("  压测结果")
+        print("=" * 60)
+        print(f"  请求数:     {len(latencies)}  (条目 {self.items})")
+        print(f"  耗时:       {elapsed:.2f}s")
+        print(f"  吞吐量:     {len(latencies) / elapsed if elapsed else 0:.2f} req/s"
+              f"  ({self.items / elapsed if elapsed else 0:.2f} 条/s)")
+        print(f"  错误数:     {self.errors} ({self.errors / self.items * 100 if self.items else 0:.1f}%)")
+        print(f"  tokens:     {self.tokens}")
+        print(f"  延迟 p50:   {self._percentile(latencies, 50) * 1000:.1f} ms")
+        print(f"  延迟 p95:   {self._percentile(latencies, 95) * 1000:.1f} ms")
+        print(f"  延迟 p99:   {self._percentile(latencies, 99) * 1000:.1f} ms")
+        print(f"  延迟 max:   {(latencies[-1] if latencies else 0) * 1000:.1f} ms")
+        print("  翻译器分布:")
+        for translator_type, count in self.translator_types.most_common():
+            print(f"    - {translator_type:28} {count}")
+        print("=" * 60)
+
+
+async def run_load(
+    service,
+    corpus: List[str],
+    qps: float,
+    duration: float,
+    mode: str,
+    batch_size: int
+) -> LoadTestReport:
+    """
+    按固定速率发压
+
+    Args:
+        service: TranslationService 实例
+        corpus: 语料
+        qps: 每秒请求数（translate_many 模式下为每秒批次数）
+        duration: 持续时间（秒）
+        mode: translate / translate_many
+        batch_size: 每批条数
+
+    Returns:
+        压测报告
+    """
+    report = LoadTestReport()
+    tasks = []
+
+    async def one_request():
+        start = time.perf_counter()
+        try:
+            if mode == "translate_many":
+                texts = random.choices(corpus, k=batch_size)
+                results = await service.translate_many(texts)
+            else:
+                results = [await service.translate(random.choice(corpus))]
+            report.record(time.perf_counter() - start, results)
+        except Exception as e:
+            logger.debug(f"请求失败: {e}")
+            report.record_error(time.perf_counter() - start)
+
+    interval = 1 / qps
+    report.started_at = time.perf_counter()
+    next_at = report.started_at
+
+    while next_at - report.started_at < duration:
+        tasks.append(asyncio.create_task(one_request()))
+        next_at += interval
+        await asyncio.sleep(max(0, next_at - time.perf_counter()))
+
+    await asyncio.gather(*tasks)
+    report.finished_at = time.perf_counter()
+
+    return report
+
+
+def _point_config_to_mock(base_url: str):
+    """将翻译配置指向模拟服务"""
+    ai = config.translation.ai
+    ai.api_key = ai.api_key or "mock"
+    ai.base_url = f"{base_url}/v1" if ai.provider == "openai" else f"{base_url}/api/v1"
+
+    online = config.translation.online_dict
+    online.api_key = online.api_key or "mock"
+    online.app_key = online.app_key or "mock"
+    online.app_secret = online.app_secret or "mock"
+    online.base_url = f"{base_url}/{online.provider}"
+
+
+def _load_corpus(path: Optional[str]) -> List[str]:
+    """加载语料（每行一条）"""
+    if not path:
+        return DEFAULT_CORPUS
+
+    with open(path, "r", encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+
+    if not corpus:
+        raise ValueError(f"语料文件为空: {path}")
+    return corpus
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="翻译链路压测")
+    parser.add_argument("--qps", type=float, default=10, help="目标 QPS")
+    parser.add_argument("--duration", type=float, default=10, help="持续时间（秒）")
+    parser.add_argument("--mode", default="translate", choices=["translate", "translate_many"], help="压测接口")
+    parser.add_argument("--batch-size", type=int, default=8, help="translate_many 每批条数")
+    parser.add_argument("--corpus", help="语料文件（每行一条）")
+    parser.add_argument("--provider", choices=["openai", "dashscope"], help="覆盖 AI 提供商")
+    parser.add_argument("--no-db", action="store_true", help="关闭缓存/自动保存/统计写库")
+    parser.add_argument("--mock", action="store_true", help="启动内置模拟服务并将配置指向它")
+    parser.add_argument("--mock-latency-ms", type=float, default=200, help="模拟服务平均延迟")
+    parser.add_argument("--mock-jitter-ms", type=float, default=50, help="模拟服务延迟抖动")
+    parser.add_argument("--mock-latency-dist", default="lognormal",
+                        choices=["fixed", "uniform", "normal", "lognormal"], help="模拟服务延迟分布")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0, help="模拟服务错误率")
+    parser.add_argument("--mock-miss-rate", type=float, default=0.0, help="模拟词典未收录比例")
+    parser.add_argument("--log-level", default="WARNING", help="日志级别")
+
+    args = parser.parse_args()
+
+    # 压测时减少日志开销
+    config.performance.log_level = args.log_level
+    setup_logger()
+
+    if args.provider:
+        config.translation.ai.provider = args.provider
+
+    server = None
+    if args.mock:
+        from scripts.mock_provider_server import MockProviderServer, MockSettings
+
+        settings = MockSettings(
+            latency_ms=args.mock_latency_ms,
+            jitter_ms=args.mock_jitter_ms,
+            latency_dist=args.mock_latency_dist,
+            error_rate=args.mock_error_rate,
+            miss_rate=args.mock_miss_rate,
+        )
+        server = MockProviderServer(port=0, settings=settings).start()
+        _point_config_to_mock(server.base_url)
+
+    if args.no_db:
+        config.cache.enabled = False
+        config.features.auto_save = False
+
+    from src.services.translation_service import TranslationService
+
+    service = TranslationService()
+    if args.no_db:
+        service.stats_repo = _NullStatsRepository()
+
+    corpus = _load_corpus(args.corpus)
+    print(f"开始压测: mode={args.mode} qps={args.qps} duration={args.duration}s 语料={len(corpus)} 条")
+
+    try:
+        report = asyncio.run(
+            run_load(service, corpus, args.qps, args.duration, args.mode, args.batch_size)
+        )
+        report.print_summary()
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+本地模拟翻译服务（用于离线压测）
+
+模拟以下接口，可配置延迟分布、错误率和流式输出：
+1. OpenAI:    POST /v1/chat/completions
+2. DashScope: POST /api/v1/services/aigc/text-generation/generation
+3. 有道:      GET  /youdao/api
+4. 金山词霸:  GET  /iciba/api/dictionary.php
+
+配置示例（data/config.toml）：
+    [translation.ai]
+    provider = "openai"
+    base_url = "http://127.0.0.1:8765/v1"
+    api_key = "mock"
+
+    [translation.online_dict]
+    provider = "iciba"
+    base_url = "http://127.0.0.1:8765/iciba"
+"""
+import sys
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+
+@dataclass
+class MockSettings:
+    """模拟服务配置"""
+    latency_ms: float = 200         # 平均延迟
+    jitter_ms: float = 50           # 延迟抖动（uniform 为半宽，normal 为标准差）
+    latency_dist: str = "lognormal"  # fixed/uniform/normal/lognormal
+    error_rate: float = 0.0         # 错误率（一半 429，一半 500）
+    miss_rate: float = 0.0          # 词典未收录比例
+    stream_chunk_ms: float = 20     # 流式输出每块间隔
+
+    def sample_latency(self) -> float:
+        """按分布采样一次延迟（秒）"""
+        mean, jitter = self.latency_ms, self.jitter_ms
+
+        if self.latency_dist == "fixed":
+            value = mean
+        elif self.latency_dist == "uniform":
+            value = random.uniform(mean - jitter, mean + jitter)
+        elif self.latency_dist == "normal":
+            value = random.gauss(mean, jitter)
+        elif self.latency_dist == "lognormal":
+            sigma = jitter / mean if mean > 0 else 0
+            value = mean * random.lognormvariate(0, sigma)
+        else:
+            raise ValueError(f"不支持的延迟分布: {self.latency_dist}")
+
+        return max(value, 0) / 1000
+
+
+def _fake_translate(text: str) -> str:
+    """生成确定性的模拟译文"""
+    return f"[译]{text}"
+
+
+def _extract_prompt_texts(prompt: str) -> tuple:
+    """
+    从翻译提示词中提取原文
+
+    Returns:
+        (原文列表, 是否为批量提示词)
+    """
+    batch = re.search(r"原文（按编号）：\n(.*?)\n\n", prompt, re.S)
+    if batch:
+        items = re.findall(r"^\d+\. (.*)$", batch.group(1), re.M)
+        return items, True
+
+    single = re.search(r"原文：\n(.*?)\n\n请直接返回", prompt, re.S)
+    return [single.group(1) if single else prompt], False
+
+
+def _count_tokens(text: str) -> int:
+    """粗略估算 tokens"""
+    return len(text) // 2 + 1
+
+
+class MockProviderHandler(BaseHTTPRequestHandler):
+    """请求处理器"""
+
+    settings: MockSettings = MockSettings()
+
+    def log_message(self, format, *args):
+        """关闭默认的访问日志"""
+        pass
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if self._maybe_fail():
+            return
+
+        if path.endswith("/chat/completions"):
+            self._handle_openai(body)
+        elif path.endswith("/services/aigc/text-generation/generation"):
+            self._handle_dashscope(body)
+        else:
+            self._send_json(404, {"error": {"message": f"未知接口: {path}"}})
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+        if self._maybe_fail():
+            return
+
+        if parsed.path.endswith("/dictionary.php"):
+            self._handle_iciba(params)
+        elif parsed.path.endswith("/api"):
+            self._handle_youdao(params)
+        else:
+            self._send_json(404, {"error": f"未知接口: {parsed.path}"})
+
+    def _maybe_fail(self) -> bool:
+        """按错误率返回 429/500"""
+        time.sleep(self.settings.sample_latency())
+
+        if random.random() >= self.settings.error_rate:
+            return False
+
+        if random.random() < 0.5:
+            self._send_json(429, {"code": "Throttling", "message": "Rate limit exceeded"})
+        else:
+            self._send_json(500, {"code": "InternalError", "message": "Mock internal error"})
+        return True
+
+    def _completion_content(self, prompt: str) -> str:
+        """生成模型回复内容"""
+        texts, is_batch = _extract_prompt_texts(prompt)
+        if is_batch:
+            return json.dumps([_fake_translate(t) for t in texts], ensure_ascii=False)
+        return _fake_translate(texts[0])
+
+    def _handle_openai(self, body: dict):
+        """OpenAI chat completions"""
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        content = self._completion_content(prompt)
+        prompt_tokens = sum(_count_tokens(m.get("content", "")) for m in body.get("messages", []))
+        completion_tokens = _count_tokens(content)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "mock")
+
+        if body.get("stream"):
+            self._stream_openai(completion_id, model, content)
+            return
+
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _stream_openai(self, completion_id: str, model: str, content: str):
+        """OpenAI 流式输出（SSE）"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        chunk_size = 8
+        for i in range(0, len(content), chunk_size):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": content[i:i + chunk_size]},
+                    "finish_reason": None,
+                }],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.settings.stream_chunk_ms / 1000)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _handle_dashscope(self, body: dict):
+        """DashScope text generation"""
+        prompt = body.get("input", {}).get("prompt", "")
+        content = self._completion_content(prompt)
+        input_tokens = _count_tokens(prompt)
+        output_tokens = _count_tokens(content)
+
+        self._send_json(200, {
+            "request_id": str(uuid.uuid4()),
+            "output": {"text": content, "finish_reason": "stop"},
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        })
+
+    def _handle_youdao(self, params: dict):
+        """有道翻译"""
+        text = params.get("q", "")
+
+        if random.random() < self.settings.miss_rate:
+            self._send_json(200, {"errorCode": "302", "query": text})
+            return
+
+        self._send_json(200, {
+            "errorCode": "0",
+            "query": text,
+            "translation": [_fake_translate(text)],
+            "basic": {
+                "phonetic": "mɒk",
+                "explains": [f"n. {_fake_translate(text)}"],
+            },
+            "web": [{"key": text, "value": [_fake_translate(text)]}],
+        })
+
+    def _handle_iciba(self, params: dict):
+        """金山词霸"""
+        word = params.get("w", "")
+
+        if random.random() < self.settings.miss_rate:
+            self._send_json(200, {"word_name": word, "symbols": []})
+            return
+
+        self._send_json(200, {
+            "word_name": word,
+            "symbols": [{
+                "ph_en": "mɒk",
+                "ph_am": "mɑːk",
+                "parts": [{"part": "n.", "means": [_fake_translate(word)]}],
+            }],
+        })
+
+    def _send_json(self, status: int, data: dict):
+        """发送 JSON 响应"""
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    """监听队列加长的 ThreadingHTTPServer（默认 5，压测并发连接时会被拒绝或重传 SYN）"""
+    request_queue_size = 128
+
+
+class MockProviderServer:
+    """模拟服务（可在后台线程运行）"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, settings: Optional[MockSettings] = None,
+                 backlog: int = MockHTTPServer.request_queue_size):
+        handler = type("Handler", (MockProviderHandler,), {"settings": settings or MockSettings()})
+        server_class = type("Server", (MockHTTPServer,), {"request_queue_size": backlog})
+        self.httpd = server_class((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockProviderServer":
+        """在后台线程启动"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"模拟服务已启动: {self.base_url}")
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        logger.info("模拟服务已停止")
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="本地模拟翻译服务（OpenAI/DashScope/有道/金山词霸）")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--latency-ms", type=float, default=200, help="平均延迟（毫秒）")
+    parser.add_argument("--jitter-ms", type=float, default=50, help="延迟抖动（毫秒）")
+    parser.add_argument("--latency-dist", default="lognormal",
+                        choices=["fixed", "uniform", "normal", "lognormal"], help="延迟分布")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="错误率 (0-1)")
+    parser.add_argument("--miss-rate", type=float, default=0.0, help="词典未收录比例 (0-1)")
+    parser.add_argument("--stream-chunk-ms", type=float, default=20, help="流式输出每块间隔（毫秒）")
+    parser.add_argument("--backlog", type=int, default=MockHTTPServer.request_queue_size, help="监听队列长度")
+
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        latency_dist=args.latency_dist,
+        error_rate=args.error_rate,
+        miss_rate=args.miss_rate,
+        stream_chunk_ms=args.stream_chunk_ms,
+    )
+
+    server = MockProviderServer(args.host, args.port, settings, backlog=args.backlog)
+    logger.info(f"模拟服务监听: {server.base_url} (Ctrl+C 退出)")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+训练大文本压缩字典
+
+从缓存译文和词条上下文中抽样训练 zstd 字典，保存到 data/compression/<dict_id>.dict。
+之后写入的大文本使用新字典压缩；旧数据依赖的字典文件请勿删除。
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.data.database import db_manager
+from src.data.models import Entry, TranslationCache
+from src.data.compression import TextCompressor
+from src.utils.logger import setup_logger
+
+
+def collect_samples(limit: int) -> list:
+    """
+    抽样训练数据
+
+    Args:
+        limit: 每张表最多抽取的行数
+
+    Returns:
+        样本文本列表
+    """
+    samples = []
+
+    with db_manager.get_session() as session:
+        for (source_text, translation) in session.query(
+            TranslationCache.source_text, TranslationCache.translation
+        ).order_by(TranslationCache.created_at.desc()).limit(limit):
+            samples.extend([source_text, translation])
+
+        for (context,) in session.query(Entry.context).filter(
+            Entry.context.isnot(None)
+        ).order_by(Entry.created_at.desc()).limit(limit):
+            samples.append(context)
+
+    return [s for s in samples if s]
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="训练大文本压缩字典")
+    parser.add_argument("--limit", type=int, default=5000, help="每张表最多抽样行数")
+    parser.add_argument("--dict-size", type=int, default=112640, help="字典大小（字节）")
+
+    args = parser.parse_args()
+
+    setup_logger()
+
+    samples = collect_samples(args.limit)
+    logger.info(f"收集样本: {len(samples)} 条")
+
+    if len(samples) < 100:
+        logger.error("样本过少（至少需要 100 条），请积累更多数据后再训练")
+        return
+
+    try:
+        path = TextCompressor.train_dict(samples, args.dict_size)
+        logger.success(f"🎉 字典训练完成: {path}")
+    except Exception as e:
+        logger.error(f"❌ 字典训练失败: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -49,6 +49,14 @@ class Application:
         from src.utils.activity_tracker import get_activity_tracker
         self.activity_tracker = get_activity_tracker()
 
+        # 缓存后台维护（过期清理、容量淘汰）
+        from src.services.cache_maintenance_service import CacheMaintenanceService
+        self.cache_maintenance = CacheMaintenanceService()
+
+        # 已删除词条后台归档
+        from src.services.entry_archive_service import EntryArchiveService
+        self.entry_archive = EntryArchiveService()
+
         # 创建信号对象（用于跨线程通信）
         self.signals = TranslateSignals()
         self.signals.translate_requested.connect(self._do_translate)
@@ -209,6 +217,12 @@ class Application:
         # 启动学习会话
         self.activity_tracker.start_session()
 
+        # 启动缓存维护
+        self.cache_maintenance.start()
+
+        # 启动词条归档
+        self.entry_archive.start()
+
         # 启动热键监听
         self.hotkey_manager.start()
 
@@ -231,6 +245,26 @@ class Application:
 
         self.hotkey_manager.stop()
         self.clipboard_monitor.stop()
+        self.cache_maintenance.stop()
+        self.entry_archive.stop()
+
+        # 写回缓冲中的缓存命中次数
+        self.cache_maintenance.cache_repo.flush_hits()
+
+        # 输出本次运行最耗时的 SQL
+        if config.database.query_metrics_enabled:
+            from src.data.query_metrics import query_metrics
+            query_metrics.dump()
+
+        # 输出连接池统计，保存并发观测数据供下次启动确定池大小
+        from src.data.pool_metrics import pool_metrics
+        logger.info(pool_metrics.format_report())
+        pool_metrics.save_sizing()
+
+        # 关闭后台事件循环（释放 AI 连接池）
+        from src.utils.async_runner import get_async_runner
+        get_async_runner().stop()
+
         self.app.quit()
 
 
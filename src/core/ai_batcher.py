@@ -0,0 +1,89 @@
+"""
+AI 请求微批处理器
+在极短的时间窗口内收集同类请求，合并为一次调用后再把结果分发给各调用方
+"""
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+from loguru import logger
+
+
+class MicroBatcher:
+    """微批处理器"""
+
+    def __init__(
+        self,
+        flush_func: Callable[[Hashable, List[Any]], Awaitable[List[Any]]],
+        window_ms: int = 20,
+        max_items: int = 8
+    ):
+        """
+        Args:
+            flush_func: 批处理函数，接收 (分组键, 请求列表)，按顺序返回结果列表
+            window_ms: 收集窗口（毫秒）
+            max_items: 单批最大请求数，达到后立即发送
+        """
+        self.flush_func = flush_func
+        self.window = window_ms / 1000
+        self.max_items = max_items
+
+        # (事件循环, 分组键) -> [(请求, Future)]
+        self._pending: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.TimerHandle] = {}
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """
+        提交请求并等待结果
+
+        Args:
+            key: 分组键（只有相同分组的请求会被合并）
+            item: 请求内容
+
+        Returns:
+            该请求对应的结果
+        """
+        loop = asyncio.get_running_loop()
+        bucket = (loop, key)
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(bucket, [])
+        pending.append((item, future))
+
+        if len(pending) >= self.max_items:
+            self._flush(bucket)
+        elif len(pending) == 1:
+            self._timers[bucket] = loop.call_later(
+                self.window, self._flush, bucket, context=contextvars.Context()
+            )
+
+        return await future
+
+    def _flush(self, bucket: Tuple[asyncio.AbstractEventLoop, Hashable]):
+        """发送当前分组中收集到的请求"""
+        timer = self._timers.pop(bucket, None)
+        if timer:
+            timer.cancel()
+
+        items = self._pending.pop(bucket, [])
+        if items:
+            loop, key = bucket
+            # 批次属于多个调用方，不继承触发发送的那个调用方的上下文变量
+            contextvars.Context().run(loop.create_task, self._run(key, items))
+
+    async def _run(self, key: Hashable, items: List[Tuple[Any, asyncio.Future]]):
+        """执行批处理并分发结果"""
+        try:
+            results = await self.flush_func(key, [item for item, _ in items])
+
+            if len(results) != len(items):
+                raise ValueError(f"批处理结果数量不匹配: {len(results)} != {len(items)}")
+
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+        except Exception as e:
+            logger.error(f"批处理失败: {e}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
@@ -0,0 +1,131 @@
+"""
+AI 客户端池
+按 (provider, base_url, api_key) 复用长连接客户端，避免每次请求重建 HTTP 连接
+"""
+import asyncio
+from typing import Any, Dict, Set, Tuple
+import httpx
+from loguru import logger
+
+from src.utils.config_loader import config
+
+
+# DashScope 原生 REST 接口地址
+DASHSCOPE_BASE_URL = "https://dashscope.aliyuncs.com/api/v1"
+DASHSCOPE_GENERATION_PATH = "/services/aigc/text-generation/generation"
+
+
+class AIClientPool:
+    """AI 客户端池（单例模式）"""
+
+    # (provider, base_url, api_key) -> (客户端, 所属事件循环)
+    _clients: Dict[Tuple[str, str, str], Tuple[Any, asyncio.AbstractEventLoop]] = {}
+    # 正在关闭的旧客户端任务（保留引用，避免任务被回收）
+    _closing: Set[asyncio.Task] = set()
+
+    @classmethod
+    def get_client(cls, provider: str, base_url: str, api_key: str) -> Any:
+        """
+        获取客户端实例（必须在事件循环中调用）
+
+        httpx 的连接绑定在创建它的事件循环上，事件循环变化时会重建客户端；
+        被替换的旧客户端（事件循环变化或 API Key 变更）会被移出并关闭。
+
+        Args:
+            provider: AI 提供商 (openai/dashscope)
+            base_url: 接口地址（空字符串表示默认地址）
+            api_key: API Key
+
+        Returns:
+            openai 为 AsyncOpenAI，dashscope 为 httpx.AsyncClient
+        """
+        loop = asyncio.get_running_loop()
+        key = (provider, base_url or "", api_key)
+
+        cached = cls._clients.get(key)
+        if cached and cached[1] is loop:
+            return cached[0]
+
+        if cached:
+            logger.debug(f"事件循环已变化，重建 AI 客户端: {provider}")
+
+        # 同一接口地址只保留当前 API Key 的客户端
+        for old_key in [k for k in cls._clients if k[:2] == key[:2]]:
+            old_client, old_loop = cls._clients.pop(old_key)
+            cls._close_later(old_client, old_loop)
+
+        client = cls._create_client(provider, base_url, api_key)
+        cls._clients[key] = (client, loop)
+        logger.debug(f"创建 AI 客户端: {provider} {base_url or '(默认地址)'}")
+
+        return client
+
+    @classmethod
+    def _create_client(cls, provider: str, base_url: str, api_key: str) -> Any:
+        """创建带连接池的客户端"""
+        ai_config = config.translation.ai
+
+        http_client = httpx.AsyncClient(
+            timeout=ai_config.timeout,
+            limits=httpx.Limits(
+                max_connections=ai_config.max_connections,
+                max_keepalive_connections=ai_config.max_connections,
+                keepalive_expiry=ai_config.keepalive_expiry,
+            ),
+            base_url=(base_url or DASHSCOPE_BASE_URL) if provider == "dashscope" else "",
+            headers={"Authorization": f"Bearer {api_key}"} if provider == "dashscope" else None,
+        )
+
+        if provider == "openai":
+            import openai
+
+            return openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url or None,
+                http_client=http_client,
+            )
+        elif provider == "dashscope":
+            return http_client
+        else:
+            raise ValueError(f"不支持的 AI 提供商: {provider}")
+
+    @staticmethod
+    async def _close_client(client: Any):
+        """关闭客户端（释放连接）"""
+        try:
+            if hasattr(client, "aclose"):
+                await client.aclose()
+            else:
+                await client.close()
+        except Exception as e:
+            logger.warning(f"关闭 AI 客户端失败: {e}")
+
+    @classmethod
+    def _close_later(cls, client: Any, client_loop: asyncio.AbstractEventLoop):
+        """
+        在客户端所属的事件循环中异步关闭客户端
+
+        事件循环已关闭时其连接已随之释放，无需处理。
+        """
+        if client_loop.is_closed():
+            return
+
+        if client_loop is asyncio.get_running_loop():
+            task = client_loop.create_task(cls._close_client(client))
+            cls._closing.add(task)
+            task.add_done_callback(cls._closing.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(cls._close_client(client), client_loop)
+
+    @classmethod
+    async def close_all(cls):
+        """关闭当前事件循环中的所有客户端"""
+        loop = asyncio.get_running_loop()
+
+        for key, (client, client_loop) in list(cls._clients.items()):
+            if client_loop is not loop:
+                continue
+            await cls._close_client(client)
+            del cls._clients[key]
+
+        logger.debug("AI 客户端已关闭")
@@ -3,10 +3,13 @@ AI 翻译器
 """
 import json
 import asyncio
-from typing import Optional
+from typing import List, Optional, Tuple
 from loguru import logger
 
 from src.core.translator_interface import TranslatorInterface, TranslationResult
+from src.core.ai_client_pool import AIClientPool, DASHSCOPE_GENERATION_PATH
+from src.core.ai_batcher import MicroBatcher
+from src.core.rate_limiter import AIRateLimiter, AIRateLimitError, ai_priority, PRIORITY_INTERACTIVE
 from src.utils.config_loader import config
 
 
@@ -17,7 +20,18 @@ class AITranslator(TranslatorInterface):
         self.provider = config.translation.ai.provider
         self.model = config.translation.ai.model
         self.api_key = config.translation.ai.api_key
+        self.base_url = config.translation.ai.base_url
         self.timeout = config.translation.ai.timeout
+
+        # 请求限流与每日 token 预算
+        self.limiter = AIRateLimiter()
+
+        # 短文本微批处理
+        self.batcher = MicroBatcher(
+            self._translate_batch,
+            window_ms=config.translation.ai.batch_window_ms,
+            max_items=config.translation.ai.batch_max_items
+        )
         
         if not self.api_key:
             logger.warning("AI API Key 未配置")
@@ -40,12 +54,18 @@ class AITranslator(TranslatorInterface):
             翻译结果
         """
         try:
-            if self.provider == "openai":
-                return await self._translate_openai(text, source_lang, target_lang)
-            elif self.provider == "dashscope":
-                return await self._translate_dashscope(text, source_lang, target_lang)
-            else:
+            if self.provider not in ("openai", "dashscope"):
                 raise ValueError(f"不支持的 AI 提供商: {self.provider}")
+
+            if self._should_batch(text):
+                # 优先级作为分组键的一部分，批次按提交方的优先级排队
+                return await self.batcher.submit((source_lang, target_lang, ai_priority.get()), text)
+
+            return await self._translate_single(text, source_lang, target_lang)
+
+        except AIRateLimitError:
+            # 限流交给上层降级处理，不当作翻译结果返回
+            raise
         
         except Exception as e:
             logger.error(f"AI 翻译失败: {e}")
@@ -53,26 +73,134 @@ class AITranslator(TranslatorInterface):
             return TranslationResult(
                 translation=f"翻译失败: {str(e)}",
                 source_lang=source_lang,
-                target_lang=target_lang
+                target_lang=target_lang,
+                translator_type="failed"
             )
     
-    async def _translate_openai(
+    def _should_batch(self, text: str) -> bool:
+        """
+        判断文本是否适合合并批量翻译（非交互请求中的短文本且不含换行）
+
+        交互式翻译不等待批处理窗口，直接单独请求。
+        """
+        ai_config = config.translation.ai
+        return (
+            ai_config.batch_enabled
+            and ai_priority.get() > PRIORITY_INTERACTIVE
+            and ai_config.batch_max_items > 1
+            and len(text) <= ai_config.batch_max_chars
+            and "\n" not in text
+        )
+
+    async def _translate_single(
         self,
         text: str,
         source_lang: str,
-        target_lang: str
+        target_lang: str,
+        priority: Optional[int] = None
     ) -> TranslationResult:
-        """使用 OpenAI API 翻译"""
+        """单条翻译"""
+        prompt = self._build_prompt(text, source_lang, target_lang)
+        content, tokens_used = await self._call_model(prompt, priority=priority)
+
+        result = self._parse_response(content, source_lang, target_lang)
+        result.tokens_used = tokens_used
+
+        return result
+
+    async def _translate_batch(
+        self,
+        key: Tuple[str, str, int],
+        texts: List[str]
+    ) -> List[TranslationResult]:
+        """
+        批量翻译（由微批处理器调用）
+
+        Args:
+            key: (源语言, 目标语言, 优先级)
+            texts: 待翻译文本列表
+
+        Returns:
+            与 texts 顺序一致的翻译结果
+        """
+        source_lang, target_lang, priority = key
+
+        if len(texts) == 1:
+            return [await self._translate_single(texts[0], source_lang, target_lang, priority)]
+
+        logger.debug(f"合并 {len(texts)} 条文本为一次 AI 请求")
+
+        prompt = self._build_batch_prompt(texts, source_lang, target_lang)
+        content, tokens_used = await self._call_model(
+            prompt,
+            max_tokens=config.translation.ai.max_tokens * len(texts),
+            priority=priority
+        )
+
+        items = self._parse_batch_response(content, len(texts))
+        if items is None:
+            # 模型未按要求返回，逐条重试
+            logger.warning("批量翻译响应格式错误，降级为逐条翻译")
+            return list(await asyncio.gather(*[
+                self._translate_single(text, source_lang, target_lang, priority) for text in texts
+            ]))
+
+        # 按条目平摊 tokens
+        shares = [None] * len(texts)
+        if tokens_used:
+            shares = [tokens_used // len(texts)] * len(texts)
+            shares[0] += tokens_used % len(texts)
+
+        # 每条与单条翻译的响应解析方式一致（保留释义、领域等字段）
+        results = []
+        for item, share in zip(items, shares):
+            result = self._parse_response(item, source_lang, target_lang)
+            result.tokens_used = share
+            results.append(result)
+
+        return results
+
+    async def _call_model(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        priority: Optional[int] = None
+    ) -> Tuple[str, Optional[int]]:
+        """
+        调用模型
+
+        Args:
+            prompt: 提示词
+            max_tokens: 最大输出 tokens（None 使用配置值）
+            priority: 排队优先级（None 使用当前上下文的优先级）
+
+        Returns:
+            (响应内容, 消耗 tokens)
+        """
+        max_tokens = max_tokens or config.translation.ai.max_tokens
+
+        # 限流：排队获取许可，超出预算或排队过久时抛出 AIRateLimitError
+        estimated = self.limiter.estimate_tokens(prompt, max_tokens)
+        await self.limiter.acquire(estimated, priority)
+
+        tokens_used = 0
         try:
-            import openai
+            if self.provider == "openai":
+                content, tokens_used = await self._call_openai(prompt, max_tokens)
+            elif self.provider == "dashscope":
+                content, tokens_used = await self._call_dashscope(prompt, max_tokens)
+            else:
+                raise ValueError(f"不支持的 AI 提供商: {self.provider}")
+        finally:
+            # 用实际消耗修正令牌桶（失败时返还预估值）
+            self.limiter.record(estimated, tokens_used)
             
-            client = openai.AsyncOpenAI(
-                api_key=self.api_key,
-                base_url=config.translation.ai.base_url or None
-            )
+        return content, tokens_used
             
-            # 构建提示词
-            prompt = self._build_prompt(text, source_lang, target_lang)
+    async def _call_openai(self, prompt: str, max_tokens: int) -> Tuple[str, Optional[int]]:
+        """调用 OpenAI API"""
+        try:
+            client = AIClientPool.get_client("openai", self.base_url, self.api_key)
             
             # 调用 API
             response = await asyncio.wait_for(
@@ -83,7 +211,7 @@ class AITranslator(TranslatorInterface):
                         {"role": "user", "content": prompt}
                     ],
                     temperature=config.translation.ai.temperature,
-                    max_tokens=config.translation.ai.max_tokens,
+                    max_tokens=max_tokens,
                 ),
                 timeout=self.timeout
             )
@@ -97,59 +225,52 @@ class AITranslator(TranslatorInterface):
                 tokens_used = response.usage.total_tokens
                 logger.debug(f"OpenAI tokens使用: {tokens_used}")
 
-            result = self._parse_response(content, source_lang, target_lang)
-            result.tokens_used = tokens_used
-
-            return result
+            return content, tokens_used
         
         except Exception as e:
             logger.error(f"OpenAI 翻译失败: {e}")
             raise
     
-    async def _translate_dashscope(
-        self,
-        text: str,
-        source_lang: str,
-        target_lang: str
-    ) -> TranslationResult:
-        """使用 DashScope API 翻译"""
+    async def _call_dashscope(self, prompt: str, max_tokens: int) -> Tuple[str, Optional[int]]:
+        """调用 DashScope API"""
         try:
-            import dashscope
-            from dashscope import Generation
+            client = AIClientPool.get_client("dashscope", self.base_url, self.api_key)
             
-            dashscope.api_key = self.api_key
-            
-            # 构建提示词
-            prompt = self._build_prompt(text, source_lang, target_lang)
-            
-            # 调用 API
+            # 调用 API（原生异步 HTTP，复用连接池）
             response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    Generation.call,
-                    model=self.model,
-                    prompt=prompt,
-                    temperature=config.translation.ai.temperature,
-                    max_tokens=config.translation.ai.max_tokens,
+                client.post(
+                    DASHSCOPE_GENERATION_PATH,
+                    json={
+                        "model": self.model,
+                        "input": {"prompt": prompt},
+                        "parameters": {
+                            "temperature": config.translation.ai.temperature,
+                            "max_tokens": max_tokens,
+                            "result_format": "text",
+                        },
+                    },
                 ),
                 timeout=self.timeout
             )
-            
-            # 解析结果
-            if response.status_code == 200:
-                content = response.output.text
+            # 错误响应可能不是 JSON（如网关返回的 HTML 错误页），先检查状态码
+            if response.status_code != 200:
+                try:
+                    message = response.json().get("message")
+                except (ValueError, AttributeError):
+                    message = None
+                raise Exception(f"API 错误: {message or response.status_code}")
 
-                # 提取token使用量
-                tokens_used = None
-                if hasattr(response, 'usage') and response.usage:
-                    tokens_used = response.usage.get('total_tokens')
-                    logger.debug(f"DashScope tokens使用: {tokens_used}")
+            # 解析结果
+            data = response.json()
+            content = data["output"]["text"]
 
-                result = self._parse_response(content, source_lang, target_lang)
-                result.tokens_used = tokens_used
+            # 提取token使用量
+            tokens_used = None
+            if data.get("usage"):
+                tokens_used = data["usage"].get("total_tokens")
+                logger.debug(f"DashScope tokens使用: {tokens_used}")
 
-                return result
-            else:
-                raise Exception(f"API 错误: {response.message}")
+            return content, tokens_used
         
         except Exception as e:
             logger.error(f"DashScope 翻译失败: {e}")
@@ -157,15 +278,7 @@ class AITranslator(TranslatorInterface):
     
     def _build_prompt(self, text: str, source_lang: str, target_lang: str) -> str:
         """构建提示词"""
-        lang_map = {
-            "en": "英语",
-            "zh": "中文",
-            "ja": "日语",
-            "ko": "韩语"
-        }
-        
-        source_name = lang_map.get(source_lang, source_lang)
-        target_name = lang_map.get(target_lang, target_lang)
+        source_name, target_name = self._lang_names(source_lang, target_lang)
         
         prompt = f"""请将以下{source_name}文本翻译成{target_name}，要求：
 1. 准确传达原意
@@ -178,6 +291,36 @@ class AITranslator(TranslatorInterface):
 请直接返回翻译结果，无需其他说明。"""
         
         return prompt
+
+    def _build_batch_prompt(self, texts: List[str], source_lang: str, target_lang: str) -> str:
+        """构建批量翻译提示词（编号条目 + JSON 数组响应）"""
+        source_name, target_name = self._lang_names(source_lang, target_lang)
+
+        items = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+
+        prompt = f"""请将以下 {len(texts)} 条{source_name}文本分别翻译成{target_name}，要求：
+1. 准确传达原意
+2. 符合{target_name}表达习惯
+3. 保持原文的语气和风格
+
+原文（按编号）：
+{items}
+
+请严格返回一个 JSON 字符串数组，按编号顺序包含 {len(texts)} 条译文，例如 ["译文1", "译文2"]，不要返回其他内容。"""
+
+        return prompt
+
+    @staticmethod
+    def _lang_names(source_lang: str, target_lang: str) -> Tuple[str, str]:
+        """获取语言的中文名称"""
+        lang_map = {
+            "en": "英语",
+            "zh": "中文",
+            "ja": "日语",
+            "ko": "韩语"
+        }
+
+        return lang_map.get(source_lang, source_lang), lang_map.get(target_lang, target_lang)
     
     def _parse_response(
         self,
@@ -189,6 +332,8 @@ class AITranslator(TranslatorInterface):
         try:
             # 尝试解析 JSON 格式
             data = json.loads(content)
+            if not isinstance(data, dict):
+                raise json.JSONDecodeError("不是 JSON 对象", content, 0)
             return TranslationResult(
                 translation=data.get("translation", content),
                 source_lang=source_lang,
@@ -204,9 +349,47 @@ class AITranslator(TranslatorInterface):
                 target_lang=target_lang,
             )
     
+    @staticmethod
+    def _parse_batch_response(content: str, expected: int) -> Optional[List[str]]:
+        """
+        解析批量翻译响应
+
+        Args:
+            content: 模型返回内容
+            expected: 期望的条目数
+
+        Returns:
+            每条的响应内容（对象条目保持为 JSON 文本，按单条响应解析），格式不符时返回 None
+        """
+        content = content.strip()
+
+        # 去除 Markdown 代码块
+        if content.startswith("```"):
+            content = content.strip("`")
+            if content.startswith("json"):
+                content = content[4:]
+
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            return None
+
+        if not isinstance(data, list) or len(data) != expected:
+            return None
+
+        items = []
+        for item in data:
+            if isinstance(item, dict) and isinstance(item.get("translation"), str):
+                items.append(json.dumps(item, ensure_ascii=False))
+            elif isinstance(item, str):
+                items.append(item.strip())
+            else:
+                return None
+
+        return items
+
     def get_cache_key(self, text: str, source_lang: str, target_lang: str) -> str:
         """生成缓存键"""
         import hashlib
         key_str = f"{self.provider}:{self.model}:{text}:{source_lang}:{target_lang}"
         return hashlib.md5(key_str.encode()).hexdigest()
-
@@ -1,10 +1,12 @@
 """
 语言检测
 """
-import re
-from typing import Optional
+from typing import List, Optional
 from loguru import logger
 
+from src.core.script_scanner import scan
+from src.core.ngram_langid import get_ngram_identifier, MIN_MARGIN
+
 try:
     from langdetect import detect, DetectorFactory
     # 设置随机种子,确保结果可复现
@@ -12,7 +14,7 @@ try:
     LANGDETECT_AVAILABLE = True
 except ImportError:
     LANGDETECT_AVAILABLE = False
-    logger.warning("langdetect 未安装,将使用简单规则检测")
+    logger.debug("langdetect 未安装,将使用规则和 n-gram 识别表检测")
 
 
 class LanguageDetector:
@@ -39,17 +41,71 @@ class LanguageDetector:
         if rule_result:
             return rule_result
         
-        # 使用 langdetect 库
-        if LANGDETECT_AVAILABLE:
-            try:
-                lang = detect(text)
+        # 使用内置 n-gram 识别表
+        identifier = get_ngram_identifier()
+        if identifier.is_available():
+            lang = identifier.detect(text, LanguageDetector._ngram_min_margin())
+            if lang:
                 logger.debug(f"语言检测结果: {lang}")
                 return lang
-            except Exception as e:
-                logger.warning(f"语言检测失败: {e}")
         
-        # 默认返回英语
-        return "en"
+        # 识别表不可用或无法确定时使用 langdetect 库，默认返回英语
+        return LanguageDetector._detect_by_langdetect(text) or "en"
+    
+    @staticmethod
+    def _ngram_min_margin() -> float:
+        """n-gram 识别的置信差距（有 langdetect 兜底时才放弃把握不大的结果）"""
+        return MIN_MARGIN if LANGDETECT_AVAILABLE else 0.0
+    
+    @staticmethod
+    def _detect_by_langdetect(text: str) -> Optional[str]:
+        """使用 langdetect 库检测"""
+        if not LANGDETECT_AVAILABLE:
+            return None
+        
+        try:
+            lang = detect(text)
+            logger.debug(f"语言检测结果: {lang}")
+            return lang
+        except Exception as e:
+            logger.warning(f"语言检测失败: {e}")
+            return None
+    
+    @staticmethod
+    def detect_many(texts: List[str]) -> List[str]:
+        """
+        批量检测文本语言（规则未能判断的文本一次性交给 n-gram 识别）
+        
+        Args:
+            texts: 待检测文本列表
+            
+        Returns:
+            与 texts 顺序一致的语言代码
+        """
+        results = []
+        pending = []
+        for i, text in enumerate(texts):
+            text = (text or "").strip()
+            lang = LanguageDetector._detect_by_rule(text) if text else "en"
+            if lang is None:
+                pending.append(i)
+            results.append(lang)
+        
+        if not pending:
+            return results
+        
+        identifier = get_ngram_identifier()
+        if identifier.is_available():
+            langs = identifier.detect_batch(
+                [texts[i].strip() for i in pending], LanguageDetector._ngram_min_margin()
+            )
+            for i, lang in zip(pending, langs):
+                results[i] = lang or LanguageDetector._detect_by_langdetect(texts[i].strip()) or "en"
+        else:
+            for i in pending:
+                results[i] = LanguageDetector.detect(texts[i])
+        
+        return results
     
     @staticmethod
     def _detect_by_rule(text: str) -> Optional[str]:
@@ -62,23 +118,22 @@ class LanguageDetector:
         Returns:
             语言代码或None
         """
+        stats = scan(text)
+
         # 中文检测
-        chinese_chars = re.findall(r'[\u4e00-\u9fff]', text)
-        if len(chinese_chars) > len(text) * 0.3:
+        if stats.han > len(text) * 0.3:
             return "zh"
         
         # 日文检测
-        japanese_chars = re.findall(r'[\u3040-\u309f\u30a0-\u30ff]', text)
-        if len(japanese_chars) > 0:
+        if stats.kana > 0:
             return "ja"
         
         # 韩文检测
-        korean_chars = re.findall(r'[\uac00-\ud7af]', text)
-        if len(korean_chars) > 0:
+        if stats.hangul > 0:
             return "ko"
         
         # 英文检测(包含字母)
-        if re.search(r'[a-zA-Z]', text):
+        if stats.latin_words > 0:
             return "en"
         
         return None
@@ -94,6 +149,5 @@ class LanguageDetector:
         Returns:
             是否为CJK
         """
-        cjk_chars = re.findall(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]', text)
-        return len(cjk_chars) > 0
+        return scan(text).cjk > 0
 
@@ -15,23 +15,29 @@ class LocalDictTranslator(TranslatorInterface):
     def __init__(self):
         self.dict_data: Dict[str, dict] = {}
         self.dict_loaded = False
+        self.version = ""
+        # 词典文件路径
+        self.dict_path = Path(__file__).parent.parent.parent / "data" / "dict" / "en-zh.json"
         self._load_dictionary()
     
     def _load_dictionary(self):
         """加载词典数据"""
         try:
-            # 词典文件路径
-            dict_path = Path(__file__).parent.parent.parent / "data" / "dict" / "en-zh.json"
+            dict_path = self.dict_path
             
             if not dict_path.exists():
                 logger.warning(f"词典文件不存在: {dict_path}")
                 return
             
+            # 先取版本再读取，读取期间文件被替换时下次检查会再次加载
+            version = self._file_version()
+            
             # 加载JSON数据
             with open(dict_path, "r", encoding="utf-8") as f:
                 self.dict_data = json.load(f)
             
             self.dict_loaded = True
+            self.version = version
             logger.info(f"本地词典加载完成，共 {len(self.dict_data)} 个词条")
         
         except Exception as e:
@@ -89,6 +95,25 @@ class LocalDictTranslator(TranslatorInterface):
         key_str = f"local_dict:{text.lower()}:{source_lang}:{target_lang}"
         return hashlib.md5(key_str.encode()).hexdigest()
     
+    def _file_version(self) -> str:
+        """词典文件的版本标识（修改时间和大小），文件不存在时为空"""
+        try:
+            stat = self.dict_path.stat()
+        except OSError:
+            return ""
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    
+    def get_version(self) -> str:
+        """词典版本（文件修改时间和大小），词典文件更新后重新加载"""
+        version = self._file_version()
+        if version and version != self.version:
+            if self.version:
+                logger.info("词典文件已更新，重新加载")
+            self._load_dictionary()
+            # 加载失败（如文件正在写入）时不逐次重试，等文件再次变化
+            self.version = version
+        return self.version
+    
     def exists(self, word: str) -> bool:
         """
         检查词典中是否存在该单词
@@ -0,0 +1,87 @@
+"""
+词典未命中缓存（负缓存）
+记录 (文本, 翻译器, 词典版本) 的未命中结果，重复查询时跳过已知查不到的词典；
+同时记录每个文本最近一次翻译成功的翻译器，便于直接路由
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from src.core.translator_interface import TranslatorType
+from src.utils.config_loader import config
+
+
+class NegativeCache:
+    """有界、带过期时间的未命中缓存（LRU 淘汰）"""
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # (文本, 源语言, 目标语言, 翻译器, 版本) -> 过期时间
+        self._misses: "OrderedDict[Tuple, float]" = OrderedDict()
+        # (文本, 源语言, 目标语言) -> 最近成功的翻译器
+        self._last_success: "OrderedDict[Tuple, TranslatorType]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _text_key(text: str, source_lang: str, target_lang: str) -> Tuple:
+        return (text.strip().lower(), source_lang, target_lang)
+
+    def is_miss(self, text: str, source_lang: str, target_lang: str,
+                translator_type: TranslatorType, version: str) -> bool:
+        """该翻译器（当前词典版本）是否已知查不到该文本"""
+        key = self._text_key(text, source_lang, target_lang) + (translator_type, version)
+        with self._lock:
+            expires_at = self._misses.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._misses[key]
+                return False
+            self._misses.move_to_end(key)
+            return True
+
+    def record_miss(self, text: str, source_lang: str, target_lang: str,
+                    translator_type: TranslatorType, version: str):
+        """记录未命中"""
+        if self.max_entries <= 0:
+            return
+        key = self._text_key(text, source_lang, target_lang) + (translator_type, version)
+        with self._lock:
+            self._misses[key] = time.monotonic() + self.ttl_seconds
+            self._misses.move_to_end(key)
+            while len(self._misses) > self.max_entries:
+                self._misses.popitem(last=False)
+
+    def get_last_success(self, text: str, source_lang: str,
+                         target_lang: str) -> Optional[TranslatorType]:
+        """获取最近一次翻译成功的翻译器"""
+        key = self._text_key(text, source_lang, target_lang)
+        with self._lock:
+            return self._last_success.get(key)
+
+    def record_success(self, text: str, source_lang: str, target_lang: str,
+                       translator_type: TranslatorType):
+        """记录翻译成功的翻译器"""
+        if self.max_entries <= 0:
+            return
+        key = self._text_key(text, source_lang, target_lang)
+        with self._lock:
+            self._last_success[key] = translator_type
+            self._last_success.move_to_end(key)
+            while len(self._last_success) > self.max_entries:
+                self._last_success.popitem(last=False)
+
+    def clear(self):
+        """清空"""
+        with self._lock:
+            self._misses.clear()
+            self._last_success.clear()
+
+
+# 全局未命中缓存
+negative_cache = NegativeCache(
+    max_entries=config.cache.negative_cache_size,
+    ttl_seconds=config.cache.negative_cache_ttl_hours * 3600
+)
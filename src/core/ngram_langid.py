@@ -0,0 +1,229 @@
+"""
+字符 n-gram 语言识别
+使用预先计算好的 n-gram 对数概率表（内存映射加载），支持批量向量化打分
+
+表文件由 scripts/build_langid_table.py 生成，格式:
+    [头部][语言代码 n_langs × 8 字节][uint8 矩阵 n_buckets × n_langs]
+n-gram 经 CRC32 哈希到桶，矩阵值为量化后的负对数概率（越小越可能）。
+
+近似语言（同一文字、词汇接近）短文本上难以区分，差距不大时偏向更常用的语言；
+与其他语言差距过小时视为无法确定，由调用方交给 langdetect。
+"""
+import re
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+TABLE_PATH = Path(__file__).parent.parent.parent / "data" / "langid" / "ngram.bin"
+
+MAGIC = b"NGID"
+FORMAT_VERSION = 1
+# 魔数, 版本, 桶数, 语言数, n-gram 最大长度, 量化比例
+HEADER = struct.Struct("<4sHIHBf")
+LANG_CODE_SIZE = 8
+MAX_N = 3
+
+# 近似语言组（首位为更常用的语言）
+CLOSE_LANGUAGES = (
+    ("ru", "bg", "mk"),
+    ("hi", "mr", "ne"),
+)
+# 常用语言与最优结果的平均每个 n-gram 代价（nats）相差不超过该值时，选常用语言
+CLOSE_MARGIN = 0.35
+# 调用方要求的默认置信差距（nats/n-gram）：与组外其他语言的差距小于该值视为无法确定
+MIN_MARGIN = 0.1
+
+# 非字母字符统一视为分隔符
+_NON_LETTER = re.compile(r"[\W\d_]+")
+
+
+def extract_ngrams(text: str, max_n: int = MAX_N) -> List[str]:
+    """
+    提取字符 n-gram（1..max_n，词首尾以空格补齐）
+
+    Args:
+        text: 文本
+        max_n: n-gram 最大长度
+
+    Returns:
+        n-gram 列表
+    """
+    normalized = _NON_LETTER.sub(" ", text.lower()).strip()
+    if not normalized:
+        return []
+
+    padded = f" {normalized} "
+    grams = []
+    for n in range(1, max_n + 1):
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram.strip():
+                grams.append(gram)
+    return grams
+
+
+def bucket_of(gram: str, n_buckets: int) -> int:
+    """n-gram 的哈希桶（跨进程稳定）"""
+    return zlib.crc32(gram.encode("utf-8")) % n_buckets
+
+
+class NgramLanguageIdentifier:
+    """n-gram 语言识别器"""
+
+    def __init__(self, table_path: Path = TABLE_PATH):
+        self.table_path = table_path
+        self.languages: List[str] = []
+        self.n_buckets = 0
+        self.max_n = MAX_N
+        self.scale = 1.0
+        self._table = None
+        # 语言下标 -> 所在近似语言组中常用语言的下标（不在组内时为自身）
+        self._preferred = None
+        self._load()
+
+    def _load(self):
+        """内存映射加载概率表"""
+        if not NUMPY_AVAILABLE:
+            logger.debug("numpy 未安装，n-gram 语言识别不可用")
+            return
+
+        if not self.table_path.exists():
+            logger.debug(f"语言识别表不存在: {self.table_path}")
+            return
+
+        try:
+            with open(self.table_path, "rb") as f:
+                magic, version, n_buckets, n_langs, max_n, scale = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    logger.warning(f"语言识别表格式不识别: {self.table_path}")
+                    return
+                codes = f.read(n_langs * LANG_CODE_SIZE)
+
+            self.languages = [
+                codes[i:i + LANG_CODE_SIZE].rstrip(b"\0").decode("ascii")
+                for i in range(0, len(codes), LANG_CODE_SIZE)
+            ]
+            self.n_buckets = n_buckets
+            self.max_n = max_n
+            self.scale = scale
+            self._preferred = self._preferred_indices(self.languages)
+            self._table = np.memmap(
+                self.table_path, dtype=np.uint8, mode="r",
+                offset=HEADER.size + n_langs * LANG_CODE_SIZE,
+                shape=(n_buckets, n_langs)
+            )
+            logger.debug(f"语言识别表已加载: {n_langs} 种语言, {n_buckets} 个桶")
+        except Exception as e:
+            logger.warning(f"加载语言识别表失败: {e}")
+            self._table = None
+
+    def is_available(self) -> bool:
+        """是否可用"""
+        return self._table is not None
+
+    @staticmethod
+    def _preferred_indices(languages: List[str]) -> "np.ndarray":
+        """每种语言所在近似语言组中常用语言的下标"""
+        index: Dict[str, int] = {lang: i for i, lang in enumerate(languages)}
+        preferred = np.arange(len(languages))
+        for group in CLOSE_LANGUAGES:
+            members = [index[lang] for lang in group if lang in index]
+            if members:
+                preferred[members] = members[0]
+        return preferred
+
+    def _buckets(self, text: str) -> List[int]:
+        return [bucket_of(gram, self.n_buckets) for gram in extract_ngrams(text, self.max_n)]
+
+    def detect(self, text: str, min_margin: float = 0.0) -> Optional[str]:
+        """
+        识别单条文本语言
+
+        Args:
+            text: 文本
+            min_margin: 置信差距（见 detect_batch）
+
+        Returns:
+            语言代码，无法识别时返回 None
+        """
+        return self.detect_batch([text], min_margin)[0]
+
+    def detect_batch(self, texts: List[str], min_margin: float = 0.0) -> List[Optional[str]]:
+        """
+        批量识别语言（所有文本的 n-gram 一次查表、分段求和）
+
+        Args:
+            texts: 文本列表
+            min_margin: 置信差距（平均每个 n-gram 的代价，nats），
+                与近似语言组之外的次优语言差距小于该值时返回 None
+
+        Returns:
+            与 texts 顺序一致的语言代码，无法识别的为 None
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        if not self.is_available() or not texts:
+            return results
+
+        indices = []
+        offsets = []
+        counts = []
+        rows = []
+        for row, text in enumerate(texts):
+            buckets = self._buckets(text)
+            if buckets:
+                rows.append(row)
+                offsets.append(len(indices))
+                counts.append(len(buckets))
+                indices.extend(buckets)
+
+        if not rows:
+            return results
+
+        # (n-gram 总数, 语言数) → 按文本分段求和 → (文本数, 语言数)
+        costs = np.add.reduceat(
+            self._table[np.asarray(indices, dtype=np.intp)].astype(np.uint32),
+            np.asarray(offsets, dtype=np.intp),
+            axis=0
+        )
+        # 换算为平均每个 n-gram 的负对数概率，不同长度的文本可用同一阈值比较
+        costs = costs / (self.scale * np.asarray(counts, dtype=np.float64)[:, None])
+        text_index = np.arange(len(rows))
+        best = costs.argmin(axis=1)
+
+        # 近似语言差距不大时选常用语言
+        preferred = self._preferred[best]
+        chosen = np.where(
+            costs[text_index, preferred] - costs[text_index, best] <= CLOSE_MARGIN,
+            preferred, best
+        )
+
+        confident = np.ones(len(rows), dtype=bool)
+        if min_margin > 0:
+            # 以组内最优代价与组外最优语言比较（组内已按常用语言处理）
+            others = np.where(self._preferred[None, :] == preferred[:, None], np.inf, costs)
+            confident = others.min(axis=1) - costs[text_index, best] >= min_margin
+
+        for row, lang_index, ok in zip(rows, chosen, confident):
+            if ok:
+                results[row] = self.languages[lang_index]
+        return results
+
+
+_identifier: Optional[NgramLanguageIdentifier] = None
+
+
+def get_ngram_identifier() -> NgramLanguageIdentifier:
+    """获取全局识别器（首次调用时加载表）"""
+    global _identifier
+    if _identifier is None:
+        _identifier = NgramLanguageIdentifier()
+    return _identifier
@@ -20,6 +20,7 @@ class OnlineDictTranslator(TranslatorInterface):
         self.provider = config.translation.online_dict.provider if hasattr(config.translation, 'online_dict') else "youdao"
         self.api_key = config.translation.online_dict.api_key if hasattr(config.translation, 'online_dict') else ""
         self.timeout = config.translation.online_dict.timeout if hasattr(config.translation, 'online_dict') else 5
+        self.base_url = config.translation.online_dict.base_url.rstrip("/") if hasattr(config.translation, 'online_dict') else ""
 
         if not self.api_key:
             logger.warning("在线词典 API Key 未配置")
@@ -49,6 +50,8 @@ class OnlineDictTranslator(TranslatorInterface):
             else:
                 raise ValueError(f"不支持的在线词典提供商: {self.provider}")
 
+        except KeyError:
+            raise
         except Exception as e:
             logger.error(f"在线词典翻译失败: {e}")
             raise
@@ -67,7 +70,7 @@ class OnlineDictTranslator(TranslatorInterface):
         try:
             # 有道词典免费API（需要注册获取app_key和app_secret）
             # 这里使用的是有道智云的翻译API
-            if not hasattr(config.translation.online_dict, 'app_key') or not hasattr(config.translation.online_dict, 'app_secret'):
+            if not config.translation.online_dict.app_key or not config.translation.online_dict.app_secret:
                 raise Exception("有道词典需要配置 app_key 和 app_secret")
 
             app_key = config.translation.online_dict.app_key
@@ -90,7 +93,7 @@ class OnlineDictTranslator(TranslatorInterface):
             to_lang = lang_map.get(target_lang, "zh-CHS")
 
             # 构建请求
-            url = "https://openapi.youdao.com/api"
+            url = f"{self.base_url or 'https://openapi.youdao.com'}/api"
             params = {
                 "q": text,
                 "from": from_lang,
@@ -106,8 +109,14 @@ class OnlineDictTranslator(TranslatorInterface):
 
                 # 检查响应
                 if data.get("errorCode") == "0":
+                    translations = data.get("translation") or []
+                    # 无词典释义、无网络释义，且译文为空或原样返回：未收录
+                    if ("basic" not in data and "web" not in data
+                            and all(t.strip().lower() in ("", text.strip().lower()) for t in translations)):
+                        raise KeyError(f"有道词典未找到: {text}")
+
                     # 成功
-                    translation = "\n".join(data.get("translation", []))
+                    translation = "\n".join(translations)
 
                     # 提取词典信息
                     explanation = None
@@ -148,6 +157,9 @@ class OnlineDictTranslator(TranslatorInterface):
                     error_msg = data.get("errorCode", "unknown")
                     raise Exception(f"有道API错误: {error_msg}")
 
+        except KeyError:
+            # 未收录，由上层记录并降级
+            raise
         except Exception as e:
             logger.error(f"有道词典翻译失败: {e}")
             raise
@@ -165,7 +177,7 @@ class OnlineDictTranslator(TranslatorInterface):
         """
         try:
             # 金山词霸免费API
-            url = "http://dict-co.iciba.com/api/dictionary.php"
+            url = f"{self.base_url or 'http://dict-co.iciba.com'}/api/dictionary.php"
             params = {
                 "w": text,
                 "type": "json",
@@ -210,10 +222,16 @@ class OnlineDictTranslator(TranslatorInterface):
                     # 无结果
                     raise KeyError(f"金山词霸未找到: {text}")
 
+        except KeyError:
+            raise
         except Exception as e:
             logger.error(f"金山词霸翻译失败: {e}")
             raise
 
+    def get_version(self) -> str:
+        """数据版本（不同提供商收录不同）"""
+        return self.provider
+
     def get_cache_key(self, text: str, source_lang: str, target_lang: str) -> str:
         """生成缓存键"""
         import hashlib
@@ -0,0 +1,218 @@
+"""
+AI 调用限流
+令牌桶限制每分钟请求数/tokens，并按每日 token 预算控制总消耗
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+from datetime import date
+from typing import Optional
+from loguru import logger
+
+from src.utils.config_loader import config
+
+
+# 请求优先级（数值越小越优先）
+PRIORITY_INTERACTIVE = 0  # 用户主动触发（热键、剪贴板）
+PRIORITY_BATCH = 10       # 批量任务
+
+# 当前请求的优先级，批量任务通过上下文变量降低优先级
+ai_priority: ContextVar[int] = ContextVar("ai_priority", default=PRIORITY_INTERACTIVE)
+
+
+class AIRateLimitError(Exception):
+    """AI 请求被限流（排队超时或超出预算）"""
+    pass
+
+
+class TokenBudgetExceeded(AIRateLimitError):
+    """今日 token 预算已用完"""
+    pass
+
+
+class TokenBucket:
+    """令牌桶"""
+
+    def __init__(self, per_minute: int):
+        """
+        Args:
+            per_minute: 每分钟配额（<=0 表示不限制）
+        """
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self):
+        """按时间补充令牌"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """获取令牌足够前需要等待的秒数"""
+        if self.unlimited:
+            return 0.0
+
+        self._refill()
+        # 单次请求超过桶容量时按桶容量计算，避免永远等待
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        """消耗令牌"""
+        if not self.unlimited:
+            self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        """按实际消耗修正（delta>0 补扣，delta<0 返还）"""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class AIRateLimiter:
+    """AI 调用限流器"""
+
+    # 排队者轮询间隔（秒）
+    POLL_INTERVAL = 0.05
+    # 每日用量与数据库同步的间隔（秒）
+    BUDGET_REFRESH_INTERVAL = 60
+
+    def __init__(self):
+        ai_config = config.translation.ai
+
+        self.request_bucket = TokenBucket(ai_config.requests_per_minute)
+        self.token_bucket = TokenBucket(ai_config.tokens_per_minute)
+        self.daily_budget = ai_config.daily_token_budget
+        self.max_wait = ai_config.max_queue_wait
+
+        # 等待队列: (优先级, 序号)
+        self._waiters: list = []
+        self._counter = itertools.count()
+
+        # 今日 token 用量：以内存计数为准（不写库时预算同样生效），
+        # 数据库只用于持久化，同步时取两者较大值（包含重启前和其他进程的用量）
+        self._budget_date: Optional[date] = None
+        self._budget_used = 0
+        self._budget_checked_at = 0.0
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """
+        粗略估算一次调用的 tokens（输入约 2 字符/token，输出按与输入相当估计）
+
+        Args:
+            prompt: 提示词
+            max_tokens: 最大输出 tokens
+
+        Returns:
+            估算 tokens
+        """
+        input_tokens = len(prompt) // 2 + 1
+        return input_tokens + min(max_tokens, input_tokens)
+
+    async def acquire(self, estimated_tokens: int, priority: Optional[int] = None):
+        """
+        获取调用许可（按优先级排队）
+
+        Args:
+            estimated_tokens: 估算 tokens
+            priority: 优先级（None 使用上下文中的优先级）
+
+        Raises:
+            TokenBudgetExceeded: 今日预算已用完
+            AIRateLimitError: 排队时间超过 max_queue_wait
+        """
+        await self._check_budget(estimated_tokens)
+
+        if priority is None:
+            priority = ai_priority.get()
+
+        ticket = (priority, next(self._counter))
+        heapq.heappush(self._waiters, ticket)
+        deadline = time.monotonic() + self.max_wait
+
+        try:
+            while True:
+                if self._waiters[0] == ticket:
+                    wait = max(
+                        self.request_bucket.wait_time(1),
+                        self.token_bucket.wait_time(estimated_tokens)
+                    )
+                    if wait == 0:
+                        self.request_bucket.consume(1)
+                        self.token_bucket.consume(estimated_tokens)
+                        return
+                else:
+                    wait = self.POLL_INTERVAL
+
+                # 预计等待超过上限时立即放弃，避免慢速失败
+                if time.monotonic() + wait > deadline:
+                    raise AIRateLimitError("AI 请求过多，请稍后重试")
+
+                await asyncio.sleep(min(wait, self.POLL_INTERVAL))
+
+        finally:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def record(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """
+        记录实际消耗，修正令牌桶与预算
+
+        Args:
+            estimated_tokens: 调用前的估算值
+            actual_tokens: 实际消耗（None 表示未知，按估算值计；调用失败传 0 返还）
+        """
+        if actual_tokens is None:
+            actual_tokens = estimated_tokens
+
+        self.token_bucket.adjust(actual_tokens - estimated_tokens)
+        self._budget_used += actual_tokens
+
+    async def _check_budget(self, estimated_tokens: int):
+        """检查每日 token 预算"""
+        if self.daily_budget <= 0:
+            return
+
+        now = time.monotonic()
+        today = date.today()
+        if self._budget_date != today:
+            # 新的一天重新计数
+            self._budget_date = today
+            self._budget_used = 0
+            self._budget_checked_at = 0.0
+
+        if now - self._budget_checked_at > self.BUDGET_REFRESH_INTERVAL:
+            # 先更新时间，避免并发请求重复查询
+            self._budget_checked_at = now
+            # 同步仓储在线程中查询，不阻塞事件循环
+            persisted = await asyncio.to_thread(self._read_persisted_used)
+            if persisted is not None and self._budget_date == today:
+                self._budget_used = max(self._budget_used, persisted)
+
+        if self._budget_used + estimated_tokens > self.daily_budget:
+            raise TokenBudgetExceeded(
+                f"今日 AI token 预算已用完 ({self._budget_used}/{self.daily_budget})"
+            )
+
+    @staticmethod
+    def _read_persisted_used() -> Optional[int]:
+        """从每日统计读取今日已用 tokens（读取失败返回 None）"""
+        try:
+            from src.data.repository import StatsRepository
+
+            stats = StatsRepository().get_today_stats()
+            return (stats.ai_tokens or 0) if stats else 0
+        except Exception as e:
+            logger.warning(f"读取今日 token 用量失败: {e}")
+            return None
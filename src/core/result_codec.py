@@ -0,0 +1,95 @@
+"""
+翻译结果序列化
+将 TranslationResult 的扩展字段编码为紧凑的二进制，用于缓存表 payload 列
+
+格式: [版本号 1 字节][编码 1 字节][数据]
+数据为按固定顺序排列的字段列表（不含字段名），译文本身存放在缓存表 translation 列。
+"""
+import json
+from typing import Optional
+from loguru import logger
+
+from src.core.translator_interface import TranslationResult
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+# 当前格式版本，字段顺序变化时递增
+SCHEMA_VERSION = 1
+
+FORMAT_MSGPACK = ord("M")
+FORMAT_JSON = ord("J")
+
+# v1 字段顺序
+_FIELDS_V1 = (
+    "source_lang",
+    "target_lang",
+    "entry_type",
+    "explanation",
+    "pronunciation",
+    "examples",
+    "domain",
+    "translator_type",
+)
+
+
+def encode_result(result: TranslationResult) -> bytes:
+    """
+    编码翻译结果（不含译文和单次调用的耗时/tokens）
+
+    Args:
+        result: 翻译结果
+
+    Returns:
+        二进制数据
+    """
+    values = [getattr(result, field) for field in _FIELDS_V1]
+
+    if MSGPACK_AVAILABLE:
+        body = msgpack.packb(values, use_bin_type=True)
+        return bytes([SCHEMA_VERSION, FORMAT_MSGPACK]) + body
+
+    body = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return bytes([SCHEMA_VERSION, FORMAT_JSON]) + body
+
+
+def decode_result(translation: str, payload: Optional[bytes]) -> Optional[TranslationResult]:
+    """
+    解码翻译结果
+
+    Args:
+        translation: 译文
+        payload: encode_result 生成的二进制数据
+
+    Returns:
+        翻译结果，数据缺失或版本不识别时返回 None
+    """
+    if not payload or len(payload) < 2:
+        return None
+
+    version, fmt = payload[0], payload[1]
+    if version != SCHEMA_VERSION:
+        logger.debug(f"缓存格式版本不匹配: {version}")
+        return None
+
+    try:
+        if fmt == FORMAT_MSGPACK:
+            if not MSGPACK_AVAILABLE:
+                return None
+            values = msgpack.unpackb(payload[2:], raw=False)
+        elif fmt == FORMAT_JSON:
+            values = json.loads(payload[2:].decode("utf-8"))
+        else:
+            return None
+    except Exception as e:
+        logger.warning(f"解码缓存数据失败: {e}")
+        return None
+
+    if len(values) != len(_FIELDS_V1):
+        return None
+
+    return TranslationResult(translation=translation, **dict(zip(_FIELDS_V1, values)))
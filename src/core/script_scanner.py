@@ -0,0 +1,72 @@
+"""
+文字脚本扫描
+一次遍历文本，同时统计各文字脚本字符数和词数，供语言检测和文本分类共用（按文本缓存结果）
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# 汉字 / 日文假名 / 韩文音节
+_HAN = "\u4e00-\u9fff"
+_KANA = "\u3040-\u309f\u30a0-\u30ff"
+_HANGUL = "\uac00-\ud7af"
+
+# 单遍扫描：CJK 逐字匹配，其余按词（\w 连续片段，不含 CJK）匹配
+_SCANNER = re.compile(
+    f"(?P<han>[{_HAN}])"
+    f"|(?P<kana>[{_KANA}])"
+    f"|(?P<hangul>[{_HANGUL}])"
+    f"|(?P<word>[^\\W{_HAN}{_KANA}{_HANGUL}]+)"
+)
+_LATIN = re.compile(r"[a-zA-Z]")
+
+
+@dataclass(frozen=True)
+class ScriptStats:
+    """文本的文字脚本统计"""
+    length: int = 0  # 文本长度
+    han: int = 0  # 汉字数
+    kana: int = 0  # 假名数
+    hangul: int = 0  # 韩文音节数
+    latin_words: int = 0  # 含拉丁字母的词数
+    words: int = 0  # 非 CJK 词数
+
+    @property
+    def cjk(self) -> int:
+        """中日韩字符数"""
+        return self.han + self.kana + self.hangul
+
+    @property
+    def word_count(self) -> int:
+        """词数（含 CJK 时按字符计）"""
+        return self.cjk if self.cjk else self.words
+
+
+@lru_cache(maxsize=256)
+def scan(text: str) -> ScriptStats:
+    """
+    扫描文本
+
+    Args:
+        text: 文本
+
+    Returns:
+        统计结果
+    """
+    counts = {"han": 0, "kana": 0, "hangul": 0, "word": 0}
+    latin_words = 0
+
+    for match in _SCANNER.finditer(text):
+        group = match.lastgroup
+        counts[group] += 1
+        if group == "word" and _LATIN.search(match.group()):
+            latin_words += 1
+
+    return ScriptStats(
+        length=len(text),
+        han=counts["han"],
+        kana=counts["kana"],
+        hangul=counts["hangul"],
+        latin_words=latin_words,
+        words=counts["word"],
+    )
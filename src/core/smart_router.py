@@ -1,11 +1,12 @@
 """
 智能路由器 - 选择合适的翻译器
 """
-import re
+from typing import List
 from loguru import logger
 
 from src.core.translator_interface import TranslatorType
 from src.core.language_detector import LanguageDetector
+from src.core.script_scanner import scan
 from src.utils.config_loader import config
 
 
@@ -27,6 +28,18 @@ class SmartRouter:
         """
         return self.detector.detect(text)
     
+    async def detect_languages(self, texts: List[str]) -> List[str]:
+        """
+        批量检测语言
+        
+        Args:
+            texts: 待检测文本列表
+            
+        Returns:
+            与 texts 顺序一致的语言代码
+        """
+        return self.detector.detect_many(texts)
+    
     def choose_translator(self, text: str, source_lang: str) -> TranslatorType:
         """
         智能选择翻译器
@@ -101,12 +114,5 @@ class SmartRouter:
         Returns:
             词数
         """
-        # 中日韩文字：按字符数
-        if LanguageDetector.is_cjk(text):
-            cjk_chars = re.findall(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]', text)
-            return len(cjk_chars)
-        
-        # 英文等：按空格分隔的词数
-        words = re.findall(r'\b\w+\b', text)
-        return len(words)
-
+        # 中日韩文字按字符数，英文等按词数
+        return scan(text).word_count
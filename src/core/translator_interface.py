@@ -75,4 +75,12 @@ class TranslatorInterface(ABC):
             缓存键
         """
         pass
-
+    
+    def get_version(self) -> str:
+        """
+        数据版本（词典更新后变化，用于使未命中缓存失效）
+        
+        Returns:
+            版本标识
+        """
+        return ""
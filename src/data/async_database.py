@@ -0,0 +1,244 @@
+"""
+异步数据库管理（SQLAlchemy asyncio 扩展）
+MySQL 使用 asyncmy / aiomysql，SQLite 使用 aiosqlite；未安装对应驱动时不可用，调用方回退到同步仓储
+"""
+import asyncio
+import importlib.util
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional
+from sqlalchemy import event
+from loguru import logger
+
+from src.data.pool_metrics import InstrumentedAsyncQueuePool, install_idle_ping, pool_metrics, pool_sizing
+from src.utils.config_loader import config
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+    ASYNCIO_AVAILABLE = importlib.util.find_spec("greenlet") is not None
+except ImportError:
+    ASYNCIO_AVAILABLE = False
+
+
+# MySQL 异步驱动（按优先级）
+MYSQL_ASYNC_DRIVERS = ("asyncmy", "aiomysql")
+
+# 当前异步工作单元的会话（按协程隔离）
+_current_session: ContextVar[Optional["AsyncSession"]] = ContextVar("async_db_session", default=None)
+
+
+def _find_driver() -> Optional[str]:
+    """当前后端可用的异步驱动名"""
+    backend = config.database.backend
+    if backend == "sqlite":
+        candidates = ("aiosqlite",)
+    elif backend == "mysql":
+        candidates = MYSQL_ASYNC_DRIVERS
+    else:
+        return None
+
+    for name in candidates:
+        if importlib.util.find_spec(name) is not None:
+            return name
+    return None
+
+
+class AsyncDatabaseManager:
+    """
+    异步数据库管理器（单例模式）
+
+    异步连接绑定在创建它的事件循环上，事件循环变化时重建引擎。
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        """单例模式"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._engine = None
+            cls._instance._session_factory = None
+            cls._instance._loop = None
+            cls._instance._driver = _find_driver() if ASYNCIO_AVAILABLE else None
+        return cls._instance
+
+    def is_available(self) -> bool:
+        """是否可以使用异步仓储"""
+        return config.database.async_enabled and self._driver is not None
+
+    def _create_engine(self) -> "AsyncEngine":
+        """创建异步引擎"""
+        db_config = config.database
+        pool_size, max_overflow = pool_sizing()
+
+        if db_config.backend == "sqlite":
+            db_path = db_config.sqlite_file
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+
+            engine = create_async_engine(
+                f"sqlite+aiosqlite:///{db_path}",
+                poolclass=InstrumentedAsyncQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                connect_args={"timeout": db_config.sqlite_busy_timeout_ms / 1000},
+                echo=False,
+            )
+
+            @event.listens_for(engine.sync_engine, "connect")
+            def set_sqlite_pragmas(dbapi_conn, connection_record):
+                """每个新连接设置 PRAGMA（与同步引擎一致）"""
+                cursor = dbapi_conn.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute(f"PRAGMA busy_timeout={db_config.sqlite_busy_timeout_ms}")
+                cursor.execute(f"PRAGMA cache_size=-{db_config.sqlite_cache_mb * 1024}")
+                cursor.execute(f"PRAGMA mmap_size={db_config.sqlite_mmap_mb * 1024 * 1024}")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.execute("PRAGMA foreign_keys=ON")
+                cursor.close()
+
+            return engine
+
+        from urllib.parse import quote_plus
+
+        connection_url = (
+            f"mysql+{self._driver}://{quote_plus(db_config.user)}:{quote_plus(db_config.password)}"
+            f"@{db_config.host}:{db_config.port}/{db_config.database}"
+            f"?charset={db_config.charset}"
+        )
+
+        # 与同步引擎相同：按观测确定池大小，只探活空闲连接（见 DatabaseManager._create_mysql_engine）
+        return create_async_engine(
+            connection_url,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=db_config.pool_recycle,
+            echo=False,
+        )
+
+    def _discard_engine(self):
+        """释放旧事件循环上的引擎"""
+        engine, loop = self._engine, self._loop
+        if loop is not None and loop.is_running():
+            # 旧事件循环仍在其他线程运行，在其中关闭连接
+            asyncio.run_coroutine_threadsafe(engine.dispose(), loop)
+        else:
+            # 旧事件循环已停止，连接无法再在其中关闭，只丢弃连接池
+            engine.sync_engine.dispose(close=False)
+
+    def _get_session_factory(self) -> "async_sessionmaker":
+        """获取当前事件循环的会话工厂（必须在事件循环中调用）"""
+        loop = asyncio.get_running_loop()
+
+        if self._engine is None or self._loop is not loop:
+            if self._engine is not None:
+                logger.debug("事件循环已变化，重建异步数据库引擎")
+                self._discard_engine()
+
+            self._engine = self._create_engine()
+            # 连接池: 空闲探活（只对 MySQL，需先于统计注册）与统计
+            if self._engine.dialect.name == "mysql":
+                install_idle_ping(self._engine.sync_engine, config.database.pool_ping_idle_seconds)
+            pool_metrics.install(self._engine.sync_engine)
+            if config.database.query_metrics_enabled:
+                from src.data.query_metrics import query_metrics
+                query_metrics.install(self._engine.sync_engine)
+            self._session_factory = async_sessionmaker(
+                bind=self._engine,
+                expire_on_commit=False,
+            )
+            self._loop = loop
+            logger.info(f"异步数据库引擎初始化完成: {config.database.backend} ({self._driver})")
+
+        return self._session_factory
+
+    @property
+    def engine(self) -> "AsyncEngine":
+        """获取当前事件循环的异步引擎（必须在事件循环中调用）"""
+        self._get_session_factory()
+        return self._engine
+
+    @asynccontextmanager
+    async def get_session(self) -> AsyncGenerator["AsyncSession", None]:
+        """
+        获取异步会话（异步上下文管理器）
+
+        使用示例:
+            async with async_db_manager.get_session() as session:
+                result = await session.execute(select(Entry))
+
+        处于 unit_of_work() 中时复用工作单元的会话，由工作单元统一提交。
+        """
+        current = _current_session.get()
+        if current is not None:
+            yield current
+            return
+
+        session = self._get_session_factory()()
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"数据库事务回滚: {e}")
+            raise
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncGenerator["AsyncSession", None]:
+        """
+        异步工作单元：范围内所有异步仓储调用共用一个会话（一个连接、一次提交）
+
+        嵌套使用时加入外层工作单元。
+        """
+        if _current_session.get() is not None:
+            async with self.get_session() as session:
+                yield session
+            return
+
+        session = self._get_session_factory()()
+        token = _current_session.set(session)
+        try:
+            if self._engine.dialect.name == "sqlite":
+                # 显式开始写事务，保存点嵌套其中（见 DatabaseManager.unit_of_work）
+                await (await session.connection()).exec_driver_sql("BEGIN IMMEDIATE")
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"数据库事务回滚: {e}")
+            raise
+        finally:
+            _current_session.reset(token)
+            await session.close()
+
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncGenerator["AsyncSession", None]:
+        """
+        工作单元中的保存点：范围内的写入失败只回滚到保存点并抛出异常，工作单元中其他写入不受影响
+
+        不在工作单元中时等同于 get_session()（单独提交）。
+        """
+        current = _current_session.get()
+        if current is None:
+            async with self.get_session() as session:
+                yield session
+            return
+
+        async with current.begin_nested():
+            yield current
+
+    async def close(self):
+        """关闭异步连接（在引擎所属的事件循环中调用）"""
+        if self._engine is not None and self._loop is asyncio.get_running_loop():
+            await self._engine.dispose()
+            logger.info("异步数据库连接已关闭")
+        self._engine = None
+        self._session_factory = None
+        self._loop = None
+
+
+# 全局异步数据库管理器实例
+async_db_manager = AsyncDatabaseManager()
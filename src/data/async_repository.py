@@ -0,0 +1,219 @@
+"""
+异步数据仓储
+与 repository.py 中的同步仓储语义一致，供异步翻译链路使用，数据库 I/O 不阻塞事件循环
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import asc, desc, or_, func, select
+from sqlalchemy import text as sql_text
+from loguru import logger
+
+from src.data.async_database import async_db_manager
+from src.data.cache_hits import cache_hit_buffer, HIT_UPDATE
+from src.data.models import Entry, DailyStat, TranslationCache
+from src.data.fulltext import fulltext_available, build_search_sql
+from src.data.repository import EntryRepository, CacheRepository, StatsRepository
+
+
+class AsyncEntryRepository:
+    """词条仓储（异步）"""
+
+    async def save(self, entry: Entry) -> Entry:
+        """保存词条"""
+        async with async_db_manager.get_session() as session:
+            EntryRepository.invalidate_summary_on_commit(session.sync_session)
+            if not entry.source_text_hash:
+                entry.source_text_hash = EntryRepository._compute_hash(entry.source_text)
+
+            existing = (await session.execute(
+                select(Entry).where(
+                    Entry.source_text_hash == entry.source_text_hash,
+                    Entry.source_lang == entry.source_lang,
+                    Entry.target_lang == entry.target_lang,
+                    Entry.is_deleted == False
+                ).limit(1)
+            )).scalar_one_or_none()
+
+            if existing:
+                existing.translation = entry.translation
+                existing.updated_at = datetime.now()
+                logger.debug(f"更新词条: {entry.source_text[:30]}...")
+                return existing
+
+            session.add(entry)
+            logger.debug(f"新增词条: {entry.source_text[:30]}...")
+            return entry
+
+    async def get_by_id(self, entry_id: int) -> Optional[Entry]:
+        """根据ID获取词条"""
+        async with async_db_manager.get_session() as session:
+            return (await session.execute(
+                select(Entry).where(Entry.id == entry_id, Entry.is_deleted == False)
+            )).scalar_one_or_none()
+
+    async def get_all(self, limit: int = 100, offset: int = 0) -> List[Entry]:
+        """获取所有词条"""
+        async with async_db_manager.get_session() as session:
+            result = await session.execute(
+                select(Entry).where(
+                    Entry.is_deleted == False
+                ).order_by(
+                    desc(Entry.created_at)
+                ).limit(limit).offset(offset)
+            )
+            return list(result.scalars())
+
+    async def search(self, keyword: str, limit: int = 50) -> List[Entry]:
+        """搜索词条（全文索引优先，否则 LIKE）"""
+        async with async_db_manager.get_session() as session:
+            search_sql = None
+            if await session.run_sync(lambda s: fulltext_available(s.connection())):
+                search_sql = build_search_sql(keyword, session.bind.dialect.name)
+
+            if search_sql:
+                sql, params = search_sql
+                result = await session.execute(
+                    select(Entry).from_statement(sql_text(sql)),
+                    {**params, "limit": limit}
+                )
+                return list(result.scalars())
+
+            result = await session.execute(
+                select(Entry).where(
+                    or_(
+                        Entry.source_text.like(f"%{keyword}%"),
+                        Entry.translation.like(f"%{keyword}%")
+                    ),
+                    Entry.is_deleted == False
+                ).order_by(
+                    desc(Entry.created_at)
+                ).limit(limit)
+            )
+            return list(result.scalars())
+
+    async def get_query_count(self, text: str) -> int:
+        """获取文本查询次数（从缓存 hit_count 获取）"""
+        try:
+            cache_key = hashlib.md5(f"{text}:auto:zh".encode()).hexdigest()
+
+            async with async_db_manager.get_session() as session:
+                hit_count = (await session.execute(
+                    select(TranslationCache.hit_count).where(
+                        TranslationCache.cache_key == cache_key
+                    )
+                )).scalar_one_or_none()
+                if hit_count is None:
+                    return 0
+                return hit_count + cache_hit_buffer.pending(cache_key)
+
+        except Exception as e:
+            logger.error(f"获取查询次数失败: {e}")
+            return 0
+
+    async def get_total_count(self) -> int:
+        """获取总词条数"""
+        async with async_db_manager.get_session() as session:
+            return (await session.execute(
+                select(func.count(Entry.id)).where(Entry.is_deleted == False)
+            )).scalar_one()
+
+
+class AsyncCacheRepository:
+    """缓存仓储（异步）"""
+
+    async def get(self, cache_key: str) -> Optional[TranslationCache]:
+        """获取缓存（命中次数在内存累计，批量写回）"""
+        async with async_db_manager.get_session() as session:
+            cache = (await session.execute(
+                select(TranslationCache).where(TranslationCache.cache_key == cache_key)
+            )).scalar_one_or_none()
+
+        # 过期视为未命中，由后台清理删除
+        if not cache or (cache.expires_at and cache.expires_at < datetime.now()):
+            return None
+
+        if cache_hit_buffer.record(cache_key):
+            await self.flush_hits()
+        return cache
+
+    async def flush_hits(self) -> int:
+        """将缓冲的命中次数和访问时间批量写回"""
+        rows = cache_hit_buffer.drain()
+        if not rows:
+            return 0
+
+        try:
+            async with async_db_manager.get_session() as session:
+                await (await session.connection()).execute(HIT_UPDATE, rows)
+        except Exception as e:
+            logger.warning(f"写回缓存命中次数失败: {e}")
+            return 0
+
+        return len(rows)
+
+    async def set(self, cache: TranslationCache):
+        """设置缓存"""
+        cache.size_bytes = CacheRepository._stored_size(cache)
+
+        async with async_db_manager.get_session() as session:
+            existing = (await session.execute(
+                select(TranslationCache).where(TranslationCache.cache_key == cache.cache_key)
+            )).scalar_one_or_none()
+
+            if existing:
+                existing.translation = cache.translation
+                existing.translator_type = cache.translator_type
+                existing.payload = cache.payload
+                existing.created_at = datetime.now()
+                existing.expires_at = cache.expires_at
+                existing.size_bytes = cache.size_bytes
+                existing.last_hit_at = datetime.now()
+                existing.hit_count += 1
+            else:
+                if cache.hit_count == 0:
+                    cache.hit_count = 1
+                session.add(cache)
+
+    async def get_total_size(self) -> int:
+        """获取缓存总大小（字节）"""
+        async with async_db_manager.get_session() as session:
+            total = (await session.execute(
+                select(func.sum(TranslationCache.size_bytes))
+            )).scalar_one()
+            return int(total or 0)
+
+
+class AsyncStatsRepository:
+    """统计仓储（异步）"""
+
+    async def update_today_stats(self, **kwargs):
+        """更新今日统计"""
+        async with async_db_manager.get_session() as session:
+            today = StatsRepository._day(datetime.now().date())
+            stats = await session.get(DailyStat, today)
+
+            if not stats:
+                stats = DailyStat(date=today)
+                session.add(stats)
+
+            for key, value in kwargs.items():
+                if hasattr(stats, key):
+                    current = getattr(stats, key) or 0
+                    setattr(stats, key, current + value)
+
+    async def get_today_stats(self) -> Optional[DailyStat]:
+        """获取今日统计"""
+        async with async_db_manager.get_session() as session:
+            return await session.get(DailyStat, StatsRepository._day(datetime.now().date()))
+
+    async def get_stats(self, days: int = 30) -> List[DailyStat]:
+        """获取统计数据"""
+        async with async_db_manager.get_session() as session:
+            start_date = StatsRepository._day(datetime.now().date() - timedelta(days=days))
+            result = await session.execute(
+                select(DailyStat).where(
+                    DailyStat.date >= start_date
+                ).order_by(asc(DailyStat.date))
+            )
+            return list(result.scalars())
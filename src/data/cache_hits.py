@@ -0,0 +1,78 @@
+"""
+缓存命中计数缓冲
+读缓存时只在内存中累计命中次数和最近访问时间，定期或积累到一定数量后一次批量写回，
+避免每次命中都产生一次写事务
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+from sqlalchemy import bindparam, update
+
+from src.data.models import TranslationCache
+from src.utils.config_loader import config
+
+
+# 批量写回语句（executemany，每个缓存键一组参数）
+_table = TranslationCache.__table__
+HIT_UPDATE = update(_table).where(
+    _table.c.cache_key == bindparam("b_key")
+).values(
+    hit_count=_table.c.hit_count + bindparam("b_hits"),
+    last_hit_at=bindparam("b_hit_at")
+)
+
+
+class CacheHitBuffer:
+    """命中计数缓冲（线程安全）"""
+
+    def __init__(self, flush_interval: float = 30, max_keys: int = 200):
+        """
+        Args:
+            flush_interval: 写回间隔（秒，<=0 表示每次命中立即写回）
+            max_keys: 缓冲的缓存键数量达到该值时提前写回
+        """
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+        # 缓存键 -> (累计命中次数, 最近访问时间)
+        self._hits: Dict[str, Tuple[int, datetime]] = {}
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, cache_key: str) -> bool:
+        """
+        记录一次命中
+
+        Returns:
+            是否到了写回时机
+        """
+        with self._lock:
+            count, _ = self._hits.get(cache_key, (0, None))
+            self._hits[cache_key] = (count + 1, datetime.now())
+            return (
+                len(self._hits) >= self.max_keys
+                or time.monotonic() - self._flushed_at >= self.flush_interval
+            )
+
+    def pending(self, cache_key: str) -> int:
+        """尚未写回的命中次数"""
+        with self._lock:
+            return self._hits.get(cache_key, (0, None))[0]
+
+    def drain(self) -> List[dict]:
+        """取出全部缓冲的命中（HIT_UPDATE 的参数列表）"""
+        with self._lock:
+            hits, self._hits = self._hits, {}
+            self._flushed_at = time.monotonic()
+
+        return [
+            {"b_key": key, "b_hits": count, "b_hit_at": hit_at}
+            for key, (count, hit_at) in hits.items()
+        ]
+
+
+# 全局命中缓冲
+cache_hit_buffer = CacheHitBuffer(
+    flush_interval=config.cache.hit_flush_interval_seconds,
+    max_keys=config.cache.hit_flush_max_keys
+)
@@ -0,0 +1,199 @@
+"""
+大文本透明压缩
+超过阈值的文本在写库前压缩（zstd + 训练字典，未安装 zstandard 时使用 zlib），读取时自动解压
+
+压缩数据通过帧头魔数识别，无需额外标记：
+- zstd 帧以 28 B5 2F FD 开头
+- zlib 流（固定 6 级压缩）以 78 9C 开头（0x9C 不可能出现在合法 UTF-8 的 ASCII 字符之后）
+未压缩的值按 UTF-8 原样存储。
+"""
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import TypeDecorator
+from loguru import logger
+
+from src.utils.config_loader import config
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZLIB_HEADER = b"\x78\x9c"
+ZLIB_LEVEL = 6
+
+# 每个线程记住最近压缩过的文本数：写缓存时先按压缩结果计算存储大小，
+# 随后写库绑定参数时再次压缩同一文本，直接复用结果
+RECENT_SIZE = 4
+
+# 训练字典存放目录（文件名: <dict_id>.dict）
+DICT_DIR = Path(__file__).parent.parent.parent / "data" / "compression"
+
+
+class TextCompressor:
+    """文本压缩器"""
+
+    def __init__(self):
+        self.dicts: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self._compressor = None
+        self._decompressors: Dict[int, "zstandard.ZstdDecompressor"] = {}
+        # zstd 压缩/解压对象不能被多个线程同时使用
+        self._lock = threading.Lock()
+        # 各线程最近的压缩结果 {文本: 字节}
+        self._recent = threading.local()
+        self._load_dicts()
+
+    def _load_dicts(self):
+        """加载训练好的字典，最新的用于压缩"""
+        if not ZSTD_AVAILABLE:
+            return
+
+        latest = None
+        dict_files = DICT_DIR.glob("*.dict") if DICT_DIR.exists() else []
+        for path in sorted(dict_files, key=lambda p: p.stat().st_mtime):
+            try:
+                zdict = zstandard.ZstdCompressionDict(path.read_bytes())
+                self.dicts[zdict.dict_id()] = zdict
+                latest = zdict
+            except Exception as e:
+                logger.warning(f"加载压缩字典失败 {path.name}: {e}")
+
+        if latest:
+            logger.debug(f"压缩字典已加载: {len(self.dicts)} 个，当前 id={latest.dict_id()}")
+
+        level = config.data.compression_level
+        self._compressor = zstandard.ZstdCompressor(level=level, dict_data=latest) if latest \
+            else zstandard.ZstdCompressor(level=level)
+
+    def reload(self):
+        """重新加载字典（训练新字典后调用）"""
+        with self._lock:
+            self.dicts.clear()
+            self._decompressors.clear()
+            self._load_dicts()
+        self._recent = threading.local()
+
+    def compress(self, value: str) -> bytes:
+        """
+        编码文本，超过阈值时压缩
+
+        Args:
+            value: 文本
+
+        Returns:
+            存储用的字节
+        """
+        raw = value.encode("utf-8")
+
+        if not config.data.compression_enabled or len(raw) < config.data.compression_threshold:
+            return raw
+
+        recent = getattr(self._recent, "values", None)
+        if recent is None:
+            recent = self._recent.values = {}
+        if value in recent:
+            return recent[value]
+
+        if ZSTD_AVAILABLE:
+            with self._lock:
+                compressed = self._compressor.compress(raw)
+        else:
+            compressed = zlib.compress(raw, ZLIB_LEVEL)
+
+        # 压缩无收益时保留原文
+        result = compressed if len(compressed) < len(raw) else raw
+        if len(recent) >= RECENT_SIZE:
+            del recent[next(iter(recent))]
+        recent[value] = result
+        return result
+
+    def decompress(self, value) -> Optional[str]:
+        """
+        解码存储值
+
+        Args:
+            value: 数据库中的值（bytes，或旧 TEXT 列返回的 str）
+
+        Returns:
+            文本
+        """
+        if value is None or isinstance(value, str):
+            return value
+
+        value = bytes(value)
+
+        if value.startswith(ZSTD_MAGIC):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("数据使用 zstd 压缩，请安装 zstandard")
+            dict_id = zstandard.get_frame_parameters(value).dict_id
+            with self._lock:
+                return self._get_decompressor(dict_id).decompress(value).decode("utf-8")
+
+        if value.startswith(ZLIB_HEADER):
+            return zlib.decompress(value).decode("utf-8")
+
+        return value.decode("utf-8")
+
+    def _get_decompressor(self, dict_id: int) -> "zstandard.ZstdDecompressor":
+        """按字典 id 获取解压器"""
+        if dict_id not in self._decompressors:
+            if dict_id and dict_id not in self.dicts:
+                raise RuntimeError(f"缺少压缩字典: {dict_id}.dict")
+            zdict = self.dicts.get(dict_id) if dict_id else None
+            self._decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=zdict)
+        return self._decompressors[dict_id]
+
+    @staticmethod
+    def train_dict(samples: List[str], dict_size: int = 112640) -> Optional[Path]:
+        """
+        用样本训练 zstd 字典并保存
+
+        Args:
+            samples: 样本文本
+            dict_size: 字典大小（字节）
+
+        Returns:
+            字典文件路径
+        """
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("训练字典需要安装 zstandard")
+
+        zdict = zstandard.train_dictionary(dict_size, [s.encode("utf-8") for s in samples])
+
+        DICT_DIR.mkdir(parents=True, exist_ok=True)
+        path = DICT_DIR / f"{zdict.dict_id()}.dict"
+        path.write_bytes(zdict.as_bytes())
+
+        logger.info(f"压缩字典已保存: {path} ({len(samples)} 个样本)")
+        return path
+
+
+class CompressedText(TypeDecorator):
+    """透明压缩的文本列（MySQL 中为 MEDIUMBLOB）"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(mysql.MEDIUMBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return text_compressor.compress(value)
+
+    def process_result_value(self, value, dialect):
+        return text_compressor.decompress(value)
+
+
+# 全局压缩器实例
+text_compressor = TextCompressor()
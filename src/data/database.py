@@ -1,13 +1,14 @@
 """
-MySQL 数据库管理
+数据库管理（MySQL / SQLite）
 """
 from contextlib import contextmanager
-from typing import Generator
+from contextvars import ContextVar
+from typing import Generator, Optional
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
-from sqlalchemy.pool import QueuePool
 from loguru import logger
 
+from src.data.pool_metrics import InstrumentedQueuePool, install_idle_ping, pool_metrics, pool_sizing
 from src.utils.config_loader import config
 
 
@@ -16,6 +17,10 @@ class Base(DeclarativeBase):
     pass
 
 
+# 当前工作单元的会话（按线程/协程隔离）
+_current_session: ContextVar[Optional[Session]] = ContextVar("db_session", default=None)
+
+
 class DatabaseManager:
     """数据库管理器"""
     
@@ -36,6 +41,49 @@ class DatabaseManager:
     
     def _initialize_engine(self):
         """初始化数据库引擎"""
+        db_config = config.database
+        
+        if db_config.backend == "sqlite":
+            self._engine = self._create_sqlite_engine()
+            location = db_config.sqlite_file
+        elif db_config.backend == "mysql":
+            self._engine = self._create_mysql_engine()
+            location = f"{db_config.host}:{db_config.port}/{db_config.database}"
+        else:
+            raise ValueError(f"不支持的数据库后端: {db_config.backend}")
+        
+        # 监听连接事件
+        @event.listens_for(self._engine, "connect")
+        def receive_connect(dbapi_conn, connection_record):
+            """连接建立时的回调"""
+            logger.debug("数据库连接建立")
+        
+        @event.listens_for(self._engine, "close")
+        def receive_close(dbapi_conn, connection_record):
+            """连接关闭时的回调"""
+            logger.debug("数据库连接关闭")
+        
+        # 连接池: 空闲探活（只对 MySQL，需先于统计注册）与统计
+        if db_config.backend == "mysql":
+            install_idle_ping(self._engine, db_config.pool_ping_idle_seconds)
+        pool_metrics.install(self._engine)
+        
+        # SQL 耗时统计
+        if db_config.query_metrics_enabled:
+            from src.data.query_metrics import query_metrics
+            query_metrics.install(self._engine)
+        
+        # 创建会话工厂
+        self._session_factory = sessionmaker(
+            bind=self._engine,
+            expire_on_commit=False,
+        )
+        
+        logger.info(f"数据库引擎初始化完成: {db_config.backend} {location}")
+    
+    @staticmethod
+    def _create_mysql_engine():
+        """创建 MySQL 引擎"""
         from urllib.parse import quote_plus
         
         db_config = config.database
@@ -51,35 +99,61 @@ class DatabaseManager:
             f"?charset={db_config.charset}"
         )
         
-        # 创建引擎
-        self._engine = create_engine(
+        pool_size, max_overflow = pool_sizing()
+        logger.debug(f"连接池大小: pool_size={pool_size} max_overflow={max_overflow}")
+        
+        # 不使用 pool_pre_ping（每次借出多一次往返），改为只探活空闲超过阈值的连接
+        return create_engine(
             connection_url,
-            poolclass=QueuePool,
-            pool_size=db_config.pool_size,
-            max_overflow=db_config.max_overflow,
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
             pool_recycle=db_config.pool_recycle,
-            pool_pre_ping=True,  # 连接前检测
             echo=False,  # 不输出SQL语句
         )
+    
+    @staticmethod
+    def _create_sqlite_engine():
+        """创建 SQLite 引擎（WAL 模式）"""
+        db_config = config.database
         
-        # 监听连接事件
-        @event.listens_for(self._engine, "connect")
-        def receive_connect(dbapi_conn, connection_record):
-            """连接建立时的回调"""
-            logger.debug("数据库连接建立")
+        db_path = db_config.sqlite_file
+        db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        @event.listens_for(self._engine, "close")
-        def receive_close(dbapi_conn, connection_record):
-            """连接关闭时的回调"""
-            logger.debug("数据库连接关闭")
+        pool_size, max_overflow = pool_sizing()
         
-        # 创建会话工厂
-        self._session_factory = sessionmaker(
-            bind=self._engine,
-            expire_on_commit=False,
+        engine = create_engine(
+            f"sqlite:///{db_path}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            connect_args={
+                "check_same_thread": False,  # 连接由连接池在线程间复用
+                "timeout": db_config.sqlite_busy_timeout_ms / 1000,
+            },
+            echo=False,
         )
         
-        logger.info(f"数据库引擎初始化完成: {db_config.host}:{db_config.port}/{db_config.database}")
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_conn, connection_record):
+            """每个新连接设置 PRAGMA"""
+            cursor = dbapi_conn.cursor()
+            # WAL: 读写互不阻塞；NORMAL 同步在 WAL 下只在检查点 fsync，断电最多丢失最近的事务
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={db_config.sqlite_busy_timeout_ms}")
+            cursor.execute(f"PRAGMA cache_size=-{db_config.sqlite_cache_mb * 1024}")
+            cursor.execute(f"PRAGMA mmap_size={db_config.sqlite_mmap_mb * 1024 * 1024}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+        
+        return engine
+    
+    @property
+    def is_sqlite(self) -> bool:
+        """是否为 SQLite 后端"""
+        return self._engine.dialect.name == "sqlite"
     
     @property
     def engine(self):
@@ -94,7 +168,14 @@ class DatabaseManager:
         使用示例:
             with db_manager.get_session() as session:
                 result = session.query(Entry).all()
+        
+        处于 unit_of_work() 中时复用工作单元的会话，由工作单元统一提交。
         """
+        current = _current_session.get()
+        if current is not None:
+            yield current
+            return
+
         session = self._session_factory()
         try:
             yield session
@@ -106,10 +187,79 @@ class DatabaseManager:
         finally:
             session.close()
     
+    @contextmanager
+    def unit_of_work(self) -> Generator[Session, None, None]:
+        """
+        工作单元：范围内所有仓储调用共用一个会话（一个连接、一次提交）
+        
+        使用示例:
+            with db_manager.unit_of_work():
+                cache_repo.set(cache)
+                entry_repo.save(entry)
+                stats_repo.update_today_stats(translation_count=1)
+        
+        嵌套使用时加入外层工作单元。
+        """
+        if _current_session.get() is not None:
+            with self.get_session() as session:
+                yield session
+            return
+
+        session = self._session_factory()
+        token = _current_session.set(session)
+        try:
+            if self.is_sqlite:
+                # pysqlite 只在 DML 前隐式 BEGIN，保存点会单独开启并在 RELEASE 时提交事务；
+                # 工作单元显式开始写事务，保存点嵌套其中（IMMEDIATE: 写锁按 busy_timeout 等待）
+                session.connection().exec_driver_sql("BEGIN IMMEDIATE")
+            yield session
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"数据库事务回滚: {e}")
+            raise
+        finally:
+            _current_session.reset(token)
+            session.close()
+    
+    @contextmanager
+    def savepoint(self) -> Generator[Session, None, None]:
+        """
+        工作单元中的保存点：范围内的写入失败只回滚到保存点并抛出异常，
+        工作单元中其他写入不受影响，会话仍可继续使用
+        
+        使用示例:
+            with db_manager.unit_of_work():
+                try:
+                    with db_manager.savepoint():
+                        cache_repo.set(cache)
+                except Exception as e:
+                    logger.error(f"保存缓存失败: {e}")
+                entry_repo.save(entry)
+        
+        不在工作单元中时等同于 get_session()（单独提交）。
+        """
+        current = _current_session.get()
+        if current is None:
+            with self.get_session() as session:
+                yield session
+            return
+
+        # 退出时 flush，约束冲突等错误在保存点内回滚
+        with current.begin_nested():
+            yield current
+    
     def create_all_tables(self):
         """创建所有表"""
         try:
+            # 导入迁移模块时会注册所有模型
+            from src.data.migrations import run_migrations
+
             Base.metadata.create_all(self._engine)
+
+            # 补齐已有表的新增列/索引
+            run_migrations(self._engine)
+
             logger.info("数据库表创建完成")
         except Exception as e:
             logger.error(f"创建数据库表失败: {e}")
@@ -0,0 +1,156 @@
+"""
+词条全文索引
+覆盖原文、翻译、笔记、标签：
+- MySQL: FULLTEXT 索引（ngram 分词，支持中文；建索引时关闭停用词，否则含 "a"/"in" 等停用词的 2-gram 不会被索引）
+- SQLite: FTS5 外部内容表（trigram 分词），由触发器与 entries 同步
+"""
+import re
+from typing import List, Optional
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from loguru import logger
+
+FULLTEXT_INDEX = "ft_entries"
+FTS_TABLE = "entries_fts"
+FULLTEXT_COLUMNS = ("source_text", "translation", "notes", "tags")
+
+# MySQL 索引注释，标记索引建立时已关闭停用词（之前按默认停用词表建立的索引需重建）
+MYSQL_INDEX_COMMENT = "ngram, no stopwords"
+
+# SQLite trigram 分词的最短可检索长度
+TRIGRAM_MIN_LENGTH = 3
+
+# MySQL 布尔模式中的运算符
+_MYSQL_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+_columns = ", ".join(FULLTEXT_COLUMNS)
+_new_values = ", ".join(f"new.{c}" for c in FULLTEXT_COLUMNS)
+_old_values = ", ".join(f"old.{c}" for c in FULLTEXT_COLUMNS)
+
+_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"{_columns}, content='entries', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON entries BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON entries BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON entries BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+# 检测结果缓存（每个进程检测一次）
+_available: Optional[bool] = None
+
+
+def create_fulltext_index(conn: Connection) -> bool:
+    """
+    创建全文索引（已存在时跳过）
+
+    Returns:
+        是否执行了变更
+    """
+    global _available
+
+    if conn.dialect.name == "mysql":
+        comment = conn.execute(text(
+            "SELECT INDEX_COMMENT FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'entries' AND INDEX_NAME = :name "
+            "LIMIT 1"
+        ), {"name": FULLTEXT_INDEX}).scalar()
+        if comment == MYSQL_INDEX_COMMENT:
+            return False
+        if comment is not None:
+            # 按默认停用词表建立的旧索引，重建
+            logger.info("重建全文索引（关闭停用词）")
+            conn.execute(text(f"ALTER TABLE entries DROP INDEX {FULLTEXT_INDEX}"))
+
+        # 停用词表在建索引时生效：InnoDB 默认停用词（a、in、to、of...）会让 ngram 分词
+        # 丢弃所有包含它们的 token，英文短词无法检索
+        conn.execute(text("SET SESSION innodb_ft_enable_stopword = OFF"))
+        try:
+            conn.execute(text(
+                f"ALTER TABLE entries ADD FULLTEXT INDEX {FULLTEXT_INDEX} ({_columns}) "
+                f"WITH PARSER ngram COMMENT '{MYSQL_INDEX_COMMENT}'"
+            ))
+        finally:
+            conn.execute(text("SET SESSION innodb_ft_enable_stopword = ON"))
+
+    elif conn.dialect.name == "sqlite":
+        if FTS_TABLE in inspect(conn).get_table_names():
+            return False
+        for statement in _SQLITE_DDL:
+            conn.execute(text(statement))
+
+    else:
+        return False
+
+    _available = None
+    return True
+
+
+def fulltext_available(conn: Connection) -> bool:
+    """全文索引是否已建立"""
+    global _available
+
+    if _available is None:
+        try:
+            if conn.dialect.name == "mysql":
+                indexes = {i["name"] for i in inspect(conn).get_indexes("entries")}
+                _available = FULLTEXT_INDEX in indexes
+            elif conn.dialect.name == "sqlite":
+                _available = FTS_TABLE in inspect(conn).get_table_names()
+            else:
+                _available = False
+        except Exception as e:
+            logger.warning(f"检测全文索引失败: {e}")
+            _available = False
+
+        if not _available:
+            logger.info("全文索引未建立，搜索使用 LIKE（运行 scripts/init_database.py 创建索引）")
+
+    return _available
+
+
+def build_search_sql(keyword: str, dialect: str, columns: str = "entries.*") -> Optional[tuple]:
+    """
+    构建全文检索 SQL（按相关度排序，支持前缀/子串匹配，多个词之间为 AND）
+
+    Args:
+        keyword: 搜索关键词
+        dialect: 数据库方言名
+        columns: 查询的列（SQL 片段）
+
+    Returns:
+        (SQL, 参数)，关键词无法使用全文索引时返回 None
+    """
+    terms: List[str] = keyword.split()
+
+    if dialect == "mysql":
+        terms = [t for t in (_MYSQL_OPERATORS.sub(" ", t).strip() for t in terms) if t]
+        if not terms:
+            return None
+        # ngram 分词下长于分词长度的前缀词按短语匹配，短的按前缀匹配
+        query = " ".join(f"+{t}*" for t in terms)
+        match = f"MATCH ({_columns}) AGAINST (:q IN BOOLEAN MODE)"
+        sql = (
+            f"SELECT {columns} FROM entries WHERE {match} AND is_deleted = 0 "
+            f"ORDER BY {match} DESC LIMIT :limit"
+        )
+        return sql, {"q": query}
+
+    if dialect == "sqlite":
+        # trigram 分词: 每个词按子串匹配，至少 3 个字符
+        if not terms or any(len(t) < TRIGRAM_MIN_LENGTH for t in terms):
+            return None
+        query = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        sql = (
+            f"SELECT {columns} FROM {FTS_TABLE} "
+            f"JOIN entries ON entries.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :q AND entries.is_deleted = 0 "
+            f"ORDER BY {FTS_TABLE}.rank LIMIT :limit"
+        )
+        return sql, {"q": query}
+
+    return None
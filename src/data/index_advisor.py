@@ -0,0 +1,106 @@
+"""
+索引诊断
+执行仓储的只读方法，记录它们实际发出的 SELECT，逐条 EXPLAIN 并标出全表扫描
+"""
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+# SQLite 查询计划中的全表扫描: "SCAN entries" / "SCAN TABLE entries"（走索引的是 "SCAN entries USING INDEX ..."）
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+@dataclass
+class QueryPlan:
+    """单条查询的执行计划"""
+    name: str
+    statement: str
+    parameters: object
+    plan: List[str] = field(default_factory=list)
+    full_scans: List[str] = field(default_factory=list)
+
+
+@contextmanager
+def capture_selects(engine: Engine):
+    """
+    记录上下文内执行的 SELECT 语句
+
+    Yields:
+        [(语句, 参数), ...]，退出上下文后完整
+    """
+    captured: List[Tuple[str, object]] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def explain(conn: Connection, statement: str, parameters) -> Tuple[List[str], List[str]]:
+    """
+    获取执行计划
+
+    Returns:
+        (计划各行的文字描述, 被全表扫描的表)
+    """
+    plan, full_scans = [], []
+
+    if conn.dialect.name == "mysql":
+        result = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        for row in result.mappings():
+            plan.append(
+                f"{row['table']}: type={row['type']} key={row['key']} "
+                f"rows={row['rows']} {row['Extra'] or ''}".rstrip()
+            )
+            if row["type"] == "ALL":
+                full_scans.append(row["table"])
+
+    elif conn.dialect.name == "sqlite":
+        result = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        for row in result:
+            detail = row[-1]
+            plan.append(detail)
+            match = _SQLITE_FULL_SCAN.match(detail)
+            if match:
+                full_scans.append(match.group(1))
+
+    return plan, full_scans
+
+
+def analyze(engine: Engine, queries: List[Tuple[str, Callable[[], object]]]) -> List[QueryPlan]:
+    """
+    执行每个查询函数并分析其发出的 SELECT
+
+    Args:
+        engine: 数据库引擎
+        queries: [(名称, 无参调用), ...]，应只包含只读操作
+
+    Returns:
+        执行计划列表（同一名称下重复的语句只保留一次）
+    """
+    plans = []
+
+    for name, run in queries:
+        # 先执行一次，排除首次调用时的元数据查询（如全文索引检测）
+        run()
+        with capture_selects(engine) as captured:
+            run()
+
+        seen = set()
+        with engine.connect() as conn:
+            for statement, parameters in captured:
+                if statement in seen:
+                    continue
+                seen.add(statement)
+                plan, full_scans = explain(conn, statement, parameters)
+                plans.append(QueryPlan(name, statement, parameters, plan, full_scans))
+
+    return plans
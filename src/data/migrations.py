@@ -0,0 +1,243 @@
+"""
+数据库结构迁移
+create_all 只会创建缺失的表，已有表新增的列/索引在这里补齐（幂等，可重复执行）
+"""
+from typing import Callable, List, Tuple
+from sqlalchemy import inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from loguru import logger
+
+from src.data.database import Base
+from src.data import models  # noqa: F401  确保模型已注册到 Base.metadata
+from src.data.models import Entry, EntryTag, Tag
+from src.data.fulltext import create_fulltext_index
+
+
+def _add_column(conn: Connection, table_name: str, column_name: str) -> bool:
+    """
+    按模型定义为已有表补充列
+
+    Returns:
+        是否执行了变更
+    """
+    columns = {c["name"] for c in inspect(conn).get_columns(table_name)}
+    if column_name in columns:
+        return False
+
+    column = Base.metadata.tables[table_name].c[column_name]
+    column_type = column.type.compile(dialect=conn.dialect)
+    preparer = conn.dialect.identifier_preparer
+
+    conn.execute(text(
+        f"ALTER TABLE {preparer.quote(table_name)} "
+        f"ADD COLUMN {preparer.quote(column_name)} {column_type} NULL"
+    ))
+    return True
+
+
+def _add_index(conn: Connection, table_name: str, index_name: str) -> bool:
+    """
+    按模型定义为已有表补充索引（MySQL 使用在线 DDL）
+
+    Returns:
+        是否执行了变更
+    """
+    indexes = {i["name"] for i in inspect(conn).get_indexes(table_name)}
+    if index_name in indexes:
+        return False
+
+    table = Base.metadata.tables[table_name]
+    index = next(i for i in table.indexes if i.name == index_name)
+
+    if conn.dialect.name == "mysql":
+        # 在线建索引，期间不阻塞读写
+        preparer = conn.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(c.name) for c in index.columns)
+        conn.execute(text(
+            f"ALTER TABLE {preparer.quote(table_name)} "
+            f"ADD INDEX {preparer.quote(index_name)} ({columns}), ALGORITHM=INPLACE, LOCK=NONE"
+        ))
+    else:
+        index.create(conn)
+    return True
+
+
+def _convert_to_blob(conn: Connection, table_name: str, column_name: str) -> bool:
+    """
+    将 MySQL 的 TEXT 列改为 BLOB 以存放压缩数据（已有 UTF-8 文本原样保留）
+
+    Returns:
+        是否执行了变更
+    """
+    if conn.dialect.name != "mysql":
+        return False
+
+    columns = {c["name"]: c for c in inspect(conn).get_columns(table_name)}
+    if columns[column_name]["type"].python_type is bytes:
+        return False
+
+    column = Base.metadata.tables[table_name].c[column_name]
+    column_type = column.type.compile(dialect=conn.dialect)
+    preparer = conn.dialect.identifier_preparer
+
+    conn.execute(text(
+        f"ALTER TABLE {preparer.quote(table_name)} "
+        f"MODIFY COLUMN {preparer.quote(column_name)} {column_type} "
+        f"{'NULL' if column.nullable else 'NOT NULL'}"
+    ))
+    return True
+
+
+def _compress_large_text(conn: Connection) -> bool:
+    """大文本列改为可压缩存储"""
+    changed = False
+    for table_name, column_name in (
+        ("translation_cache", "source_text"),
+        ("translation_cache", "translation"),
+        ("entries", "context"),
+    ):
+        changed = _convert_to_blob(conn, table_name, column_name) or changed
+    return changed
+
+
+def _add_cache_payload(conn: Connection) -> bool:
+    """translation_cache.payload: 完整翻译结果"""
+    return _add_column(conn, "translation_cache", "payload")
+
+
+def _add_cache_eviction(conn: Connection) -> bool:
+    """translation_cache: 淘汰所需的访问时间、大小及索引"""
+    changed = _add_column(conn, "translation_cache", "last_hit_at")
+    changed = _add_column(conn, "translation_cache", "size_bytes") or changed
+
+    if changed:
+        # 回填已有数据，大小按实际存储的字节数计算
+        # （SQLite 对 TEXT 值的 LENGTH 返回字符数，转为 BLOB 后才是字节数）
+        if conn.dialect.name == "sqlite":
+            byte_length = "LENGTH(CAST({} AS BLOB))"
+        else:
+            byte_length = "LENGTH({})"
+
+        conn.execute(text(
+            "UPDATE translation_cache SET "
+            "last_hit_at = COALESCE(last_hit_at, created_at), "
+            f"size_bytes = {byte_length.format('source_text')} + {byte_length.format('translation')} "
+            f"+ COALESCE({byte_length.format('payload')}, 0) "
+            "WHERE size_bytes IS NULL"
+        ))
+
+    return _add_index(conn, "translation_cache", "idx_cache_eviction") or changed
+
+
+def _add_entry_deleted_at(conn: Connection) -> bool:
+    """entries.deleted_at: 删除时间（已删除的词条以 updated_at 回填）"""
+    if not _add_column(conn, "entries", "deleted_at"):
+        return False
+
+    conn.execute(text(
+        "UPDATE entries SET deleted_at = updated_at "
+        "WHERE is_deleted = 1 AND deleted_at IS NULL"
+    ))
+    return True
+
+
+def _rebuild_entry_archive(conn: Connection) -> bool:
+    """entries_archive: 以原词条ID作主键的旧表改为独立自增主键 + original_id"""
+    columns = {c["name"] for c in inspect(conn).get_columns("entries_archive")}
+    if "original_id" in columns:
+        return False
+
+    # payload 按存储格式原样取出、写回（不经过 CompressedText 转换）
+    copied = "source_text, translation, source_lang, target_lang, payload, deleted_at, archived_at"
+    rows = [dict(row) for row in conn.execute(text(
+        f"SELECT id AS original_id, {copied} FROM entries_archive"
+    )).mappings()]
+
+    conn.execute(text("DROP TABLE entries_archive"))
+    Base.metadata.tables["entries_archive"].create(conn)
+    if rows:
+        placeholders = ", ".join(f":{name}" for name in ["original_id", *copied.split(", ")])
+        conn.execute(text(
+            f"INSERT INTO entries_archive (original_id, {copied}) VALUES ({placeholders})"
+        ), rows)
+    return True
+
+
+def _add_entry_indexes(conn: Connection) -> bool:
+    """entries: is_deleted 开头的复合索引"""
+    changed = False
+    for index_name in (
+        "idx_active_next_review",
+        "idx_active_proficiency",
+        "idx_active_created_at",
+        "idx_active_last_review",
+    ):
+        changed = _add_index(conn, "entries", index_name) or changed
+    return changed
+
+
+def _migrate_entry_tags(conn: Connection, batch_size: int = 1000) -> bool:
+    """entry_tags: 由 entries.tags 中的 JSON 数组回填（关联表为空时执行）"""
+    from src.data.tag_repository import TagRepository
+
+    if conn.execute(select(EntryTag.entry_id).limit(1)).first():
+        return False
+
+    # 按不区分大小写的比较键匹配（与 tags.name 的唯一约束一致）
+    tag_ids = {}
+    for name, tag_id in conn.execute(select(Tag.name, Tag.id).order_by(Tag.id)):
+        tag_ids.setdefault(TagRepository.tag_key(name), tag_id)
+    changed = False
+    last_id = 0
+
+    while True:
+        rows = conn.execute(
+            select(Entry.id, Entry.tags).where(
+                Entry.id > last_id,
+                Entry.tags.isnot(None)
+            ).order_by(Entry.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        pairs = []
+        for entry_id, value in rows:
+            # parse_tags 已按比较键去重，同一词条不会产生重复的 (entry_id, tag_id)
+            for name in TagRepository.parse_tags(value):
+                key = TagRepository.tag_key(name)
+                if key not in tag_ids:
+                    result = conn.execute(insert(Tag).values(name=name))
+                    tag_ids[key] = result.inserted_primary_key[0]
+                pairs.append({"entry_id": entry_id, "tag_id": tag_ids[key]})
+
+        if pairs:
+            conn.execute(insert(EntryTag), pairs)
+            changed = True
+        last_id = rows[-1].id
+
+    return changed
+
+
+# 迁移列表（按顺序执行）
+MIGRATIONS: List[Tuple[str, Callable[[Connection], bool]]] = [
+    ("translation_cache.payload", _add_cache_payload),
+    ("compressed large text columns", _compress_large_text),
+    ("translation_cache eviction", _add_cache_eviction),
+    ("entries full-text index", create_fulltext_index),
+    ("entries composite indexes", _add_entry_indexes),
+    ("entry_tags from entries.tags", _migrate_entry_tags),
+    ("entries.deleted_at", _add_entry_deleted_at),
+    ("entries_archive surrogate key", _rebuild_entry_archive),
+]
+
+
+def run_migrations(engine: Engine):
+    """执行所有迁移"""
+    for name, migrate in MIGRATIONS:
+        try:
+            with engine.begin() as conn:
+                if migrate(conn):
+                    logger.info(f"数据库迁移完成: {name}")
+        except Exception as e:
+            logger.error(f"数据库迁移失败 ({name}): {e}")
+            raise
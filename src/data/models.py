@@ -1,15 +1,16 @@
 """
 数据模型定义（SQLAlchemy ORM）
+时间默认值在应用层生成（本地时间），MySQL 与 SQLite 行为一致
 """
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
     Column, Integer, String, Text, Float, DateTime, 
-    Boolean, Index, UniqueConstraint
+    Boolean, Index, UniqueConstraint, LargeBinary
 )
-from sqlalchemy.sql import func
 
 from src.data.database import Base
+from src.data.compression import CompressedText
 
 
 class Entry(Base):
@@ -28,7 +29,7 @@ class Entry(Base):
     entry_type = Column(String(20), default="sentence", comment="类型: word/phrase/sentence/paragraph")
     
     # 来源信息
-    context = Column(Text, comment="上下文")
+    context = Column(CompressedText, comment="上下文(大文本压缩存储)")
     source_app = Column(String(100), comment="来源应用")
     source_url = Column(String(500), comment="来源URL")
     
@@ -44,15 +45,16 @@ class Entry(Base):
     is_starred = Column(Boolean, default=False, comment="收藏标记")
     
     # 元数据
-    tags = Column(Text, comment="标签JSON数组")
+    tags = Column(Text, comment="标签JSON数组(展示/导出/全文检索用，筛选和计数走 entry_tags)")
     notes = Column(Text, comment="用户笔记")
     translator_type = Column(String(50), comment="翻译器类型")
     translation_time = Column(Float, comment="翻译耗时(秒)")
     
     # 时间戳
-    created_at = Column(DateTime, default=func.now(), comment="创建时间")
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment="更新时间")
     is_deleted = Column(Boolean, default=False, comment="软删除")
+    deleted_at = Column(DateTime, comment="删除时间(归档保留期由此计算)")
     
     # 索引和约束
     __table_args__ = (
@@ -61,6 +63,12 @@ class Entry(Base):
         Index('idx_next_review', 'next_review'),
         Index('idx_familiarity', 'familiarity'),
         Index('idx_source_text_hash', 'source_text_hash'),
+        # 常用查询都带 is_deleted 过滤，复合索引以它开头
+        # 复习统计的聚合查询只读这个索引即可完成（覆盖索引）
+        Index('idx_active_next_review', 'is_deleted', 'next_review', 'proficiency', 'last_review', 'created_at'),
+        Index('idx_active_proficiency', 'is_deleted', 'proficiency'),
+        Index('idx_active_created_at', 'is_deleted', 'created_at', 'id'),
+        Index('idx_active_last_review', 'is_deleted', 'last_review'),
         {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
     )
     
@@ -76,7 +84,7 @@ class Tag(Base):
     name = Column(String(50), unique=True, nullable=False, comment="标签名")
     color = Column(String(20), default="#3B82F6", comment="颜色")
     icon = Column(String(50), comment="图标")
-    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
     
     __table_args__ = (
         {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
@@ -86,6 +94,48 @@ class Tag(Base):
         return f"<Tag(id={self.id}, name={self.name})>"
 
 
+class EntryTag(Base):
+    """词条-标签关联表"""
+    __tablename__ = "entry_tags"
+    
+    entry_id = Column(Integer, primary_key=True, comment="词条ID")
+    tag_id = Column(Integer, primary_key=True, comment="标签ID")
+    
+    __table_args__ = (
+        # 主键 (entry_id, tag_id) 用于查词条的标签，此索引用于按标签筛选和计数
+        Index('idx_entry_tags_tag', 'tag_id', 'entry_id'),
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
+    )
+    
+    def __repr__(self):
+        return f"<EntryTag(entry_id={self.entry_id}, tag_id={self.tag_id})>"
+
+
+class EntryArchive(Base):
+    """已删除词条归档表（超过保留期的软删除词条移出 entries 后存放于此）"""
+    __tablename__ = "entries_archive"
+
+    # entries.id 删除后可能被复用（SQLite 无 AUTOINCREMENT、MySQL 8.0 前重启后），归档表使用独立主键
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    original_id = Column(Integer, nullable=False, comment="原词条ID")
+    source_text = Column(Text, nullable=False, comment="原文")
+    translation = Column(Text, comment="翻译")
+    source_lang = Column(String(10), comment="源语言")
+    target_lang = Column(String(10), comment="目标语言")
+    payload = Column(CompressedText, nullable=False, comment="完整词条JSON(大文本压缩存储)")
+    deleted_at = Column(DateTime, comment="删除时间")
+    archived_at = Column(DateTime, default=datetime.now, comment="归档时间")
+
+    __table_args__ = (
+        Index('idx_archive_original_id', 'original_id'),
+        Index('idx_archive_deleted_at', 'deleted_at'),
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
+    )
+
+    def __repr__(self):
+        return f"<EntryArchive(id={self.id}, original_id={self.original_id}, source_text={self.source_text[:30]}...)>"
+
+
 class DailyStat(Base):
     """每日统计表"""
     __tablename__ = "daily_stats"
@@ -112,15 +162,19 @@ class TranslationCache(Base):
     __tablename__ = "translation_cache"
     
     cache_key = Column(String(64), primary_key=True, comment="缓存键(MD5)")
-    source_text = Column(Text, nullable=False, comment="原文")
-    translation = Column(Text, nullable=False, comment="翻译")
+    source_text = Column(CompressedText, nullable=False, comment="原文(大文本压缩存储)")
+    translation = Column(CompressedText, nullable=False, comment="翻译(大文本压缩存储)")
     translator_type = Column(String(50), nullable=False, comment="翻译器类型")
-    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    payload = Column(LargeBinary, comment="完整翻译结果(发音/释义/例句等,见 result_codec)")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
     expires_at = Column(DateTime, comment="过期时间")
     hit_count = Column(Integer, default=0, comment="命中次数")
+    last_hit_at = Column(DateTime, default=datetime.now, comment="最近访问时间")
+    size_bytes = Column(Integer, default=0, comment="实际存储字节数(压缩后的原文+译文+payload)")
     
     __table_args__ = (
         Index('idx_expires_at', 'expires_at'),
+        Index('idx_cache_eviction', 'hit_count', 'last_hit_at'),
         {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
     )
     
@@ -134,7 +188,7 @@ class Setting(Base):
     
     key = Column(String(100), primary_key=True, comment="配置键")
     value = Column(Text, nullable=False, comment="配置值")
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment="更新时间")
     
     __table_args__ = (
         {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
@@ -150,7 +204,7 @@ class Blacklist(Base):
     
     app_name = Column(String(100), primary_key=True, comment="应用名称")
     reason = Column(String(200), comment="原因")
-    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
     
     __table_args__ = (
         {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
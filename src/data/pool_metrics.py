@@ -0,0 +1,258 @@
+"""
+连接池监控
+- 统计借出/归还、等待时间、溢出、失效次数和并发使用数
+- 空闲检测：只对空闲超过阈值的连接在借出时探活（替代每次借出都往返一次的 pool_pre_ping）
+- 池大小：按历史观测到的并发使用数确定（配置的 pool_size / max_overflow 作为上限）
+"""
+import json
+import math
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Tuple
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from loguru import logger
+
+from src.data.query_metrics import LatencyHistogram
+from src.utils.config_loader import config
+
+
+# 观测到的并发使用数，下次启动时据此确定池大小
+SIZING_PATH = Path(__file__).parent.parent.parent / "data" / "pool_sizing.json"
+
+# 池大小下限
+MIN_POOL_SIZE = 2
+MIN_OVERFLOW = 2
+
+
+class PoolMetrics:
+    """连接池统计"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self.checkouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.pings = 0
+            self.ping_failures = 0
+            # 各连接池当前借出数（同步、异步引擎各一个池，池大小按单个池的并发确定）
+            self._pool_in_use: Counter = Counter()
+            self.peak_in_use = 0
+            self.peak_overflow = 0
+            # 借出时池已用满容量（pool_size + max_overflow）的次数
+            self.saturated = 0
+            # 每次借出时的并发使用数分布
+            self.in_use_counts: Counter = Counter()
+            self.wait = LatencyHistogram()
+
+    def install(self, engine: Engine):
+        """在引擎上注册连接池事件"""
+        pool = engine.pool
+
+        @event.listens_for(pool, "connect")
+        def on_connect(dbapi_conn, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(pool, "checkout")
+        def on_checkout(dbapi_conn, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+                self._pool_in_use[pool] += 1
+                in_use = self._pool_in_use[pool]
+                self.in_use_counts[in_use] += 1
+                self.peak_in_use = max(self.peak_in_use, in_use)
+                if isinstance(pool, QueuePool):
+                    self.peak_overflow = max(self.peak_overflow, in_use - pool.size())
+                    if pool._max_overflow >= 0 and in_use >= pool.size() + pool._max_overflow:
+                        self.saturated += 1
+
+        @event.listens_for(pool, "checkin")
+        def on_checkin(dbapi_conn, connection_record):
+            with self._lock:
+                self._pool_in_use[pool] -= 1
+                if self._pool_in_use[pool] <= 0:
+                    del self._pool_in_use[pool]
+
+        @event.listens_for(pool, "invalidate")
+        def on_invalidate(dbapi_conn, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        """记录一次借出等待"""
+        with self._lock:
+            self.wait.record(seconds * 1000)
+            if timed_out:
+                self.timeouts += 1
+
+    def record_ping(self, ok: bool):
+        """记录一次空闲探活"""
+        with self._lock:
+            self.pings += 1
+            if not ok:
+                self.ping_failures += 1
+
+    def in_use_percentile(self, pct: float) -> int:
+        """借出时并发使用数的分位数"""
+        with self._lock:
+            total = sum(self.in_use_counts.values())
+            if not total:
+                return 0
+            seen = 0
+            for in_use in sorted(self.in_use_counts):
+                seen += self.in_use_counts[in_use]
+                if seen >= total * pct / 100:
+                    return in_use
+            return self.peak_in_use
+
+    def snapshot(self) -> dict:
+        """当前统计"""
+        p95_in_use = self.in_use_percentile(95)
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+                "in_use": sum(self._pool_in_use.values()),
+                "peak_in_use": self.peak_in_use,
+                "p95_in_use": p95_in_use,
+                "peak_overflow": max(self.peak_overflow, 0),
+                "saturated": self.saturated,
+                "wait_p50_ms": self.wait.percentile(50),
+                "wait_p99_ms": self.wait.percentile(99),
+                "wait_max_ms": self.wait.max_ms,
+            }
+
+    def format_report(self) -> str:
+        """统计报告"""
+        s = self.snapshot()
+        return (
+            f"连接池: 借出={s['checkouts']} 新建={s['connects']} 失效={s['invalidations']} "
+            f"超时={s['timeouts']} 探活={s['pings']}(失败 {s['ping_failures']}) "
+            f"并发 p95/峰值={s['p95_in_use']}/{s['peak_in_use']} 溢出峰值={s['peak_overflow']} 用满={s['saturated']} "
+            f"等待 p50/p99/最大={s['wait_p50_ms']:.1f}/{s['wait_p99_ms']:.1f}/{s['wait_max_ms']:.1f}ms"
+        )
+
+    def save_sizing(self, path: Path = SIZING_PATH):
+        """保存本次运行观测到的并发使用数（供下次启动确定池大小）"""
+        s = self.snapshot()
+        if not s["checkouts"]:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({
+                "p95_in_use": s["p95_in_use"],
+                "peak_in_use": s["peak_in_use"],
+                "timeouts": s["timeouts"],
+                "saturated": s["saturated"],
+                "wait_p99_ms": s["wait_p99_ms"],
+            }), encoding="utf-8")
+        except Exception as e:
+            logger.warning(f"保存连接池观测数据失败: {e}")
+
+
+class _WaitTimingMixin:
+    """记录借出等待时间"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    """记录借出等待时间的 QueuePool"""
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    """记录借出等待时间的 AsyncAdaptedQueuePool（异步引擎）"""
+
+
+def install_idle_ping(engine: Engine, idle_seconds: float):
+    """
+    借出时探活空闲超过 idle_seconds 的连接，失效则由连接池重建
+
+    需在 pool_metrics.install 之前注册，探活失败重试借出时不会重复计数。
+
+    Args:
+        engine: 数据库引擎
+        idle_seconds: 空闲阈值（秒）
+    """
+    @event.listens_for(engine.pool, "checkin")
+    def mark_checkin(dbapi_conn, connection_record):
+        connection_record.info["checkin_time"] = time.monotonic()
+
+    @event.listens_for(engine.pool, "checkout")
+    def ping_if_idle(dbapi_conn, connection_record, connection_proxy):
+        checkin_time = connection_record.info.get("checkin_time")
+        if checkin_time is None or time.monotonic() - checkin_time < idle_seconds:
+            return
+
+        try:
+            cursor = dbapi_conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            pool_metrics.record_ping(True)
+        except Exception as e:
+            pool_metrics.record_ping(False)
+            logger.debug(f"空闲连接已失效，重新连接: {e}")
+            # 连接池收到 DisconnectionError 后丢弃该连接并重试
+            raise exc.DisconnectionError() from e
+
+
+def pool_sizing(path: Path = SIZING_PATH) -> Tuple[int, int]:
+    """
+    确定连接池大小
+
+    有历史观测时按观测到的并发使用数（p95 常驻，峰值用溢出覆盖），
+    否则按翻译并发数估算；均以配置的 pool_size / max_overflow 为上限。
+    观测到的并发数受当时的池容量限制，上次借出出现超时、用满容量或 p99 等待超过
+    pool_wait_grow_ms 时说明容量不足，直接放宽到上限。
+
+    Returns:
+        (pool_size, max_overflow)
+    """
+    db_config = config.database
+    if not db_config.pool_autosize:
+        return db_config.pool_size, db_config.max_overflow
+
+    # 无历史数据: 翻译并发 + UI 线程 + 后台维护线程
+    expected = config.performance.max_concurrent_translations + 2
+    steady, peak = expected, expected
+    try:
+        if path.exists():
+            observed = json.loads(path.read_text(encoding="utf-8"))
+            steady = observed["p95_in_use"] + 1
+            peak = observed["peak_in_use"] + 1
+            if (observed.get("timeouts") or observed.get("saturated")
+                    or observed.get("wait_p99_ms", 0) >= db_config.pool_wait_grow_ms):
+                # 上次池容量成为瓶颈，放宽到上限
+                steady, peak = math.inf, math.inf
+    except Exception as e:
+        logger.warning(f"读取连接池观测数据失败: {e}")
+
+    pool_size = max(MIN_POOL_SIZE, min(steady, db_config.pool_size))
+    max_overflow = max(MIN_OVERFLOW, min(peak - pool_size, db_config.max_overflow))
+    return int(pool_size), int(max_overflow)
+
+
+# 全局统计实例
+pool_metrics = PoolMetrics()
@@ -0,0 +1,52 @@
+"""
+列表视图使用的轻量投影
+只查询列表需要的列（原文/译文在数据库端截断），不构造 ORM 对象
+"""
+from sqlalchemy import func
+
+from src.data.models import Entry
+
+# 列表中原文/译文显示的最大字符数
+SUMMARY_TEXT_LENGTH = 50
+
+
+class EntrySummary:
+    """词条摘要（列表项）"""
+
+    __slots__ = ("id", "source_text", "translation", "entry_type", "is_starred", "proficiency")
+
+    def __init__(self, id: int, source_text: str, translation: str,
+                 entry_type: str = None, is_starred: bool = False, proficiency: int = 0):
+        self.id = id
+        self.source_text = source_text or ""
+        self.translation = translation or ""
+        self.entry_type = entry_type
+        self.is_starred = bool(is_starred)
+        self.proficiency = proficiency or 0
+
+    @classmethod
+    def from_row(cls, row) -> "EntrySummary":
+        """由查询结果行构造（列顺序同 SUMMARY_COLUMNS）"""
+        return cls(*row)
+
+    def __repr__(self):
+        return f"<EntrySummary(id={self.id}, source_text={self.source_text[:30]})>"
+
+
+# 摘要查询的列（ORM 查询用）
+SUMMARY_COLUMNS = (
+    Entry.id,
+    func.substr(Entry.source_text, 1, SUMMARY_TEXT_LENGTH).label("source_text"),
+    func.substr(Entry.translation, 1, SUMMARY_TEXT_LENGTH).label("translation"),
+    Entry.entry_type,
+    Entry.is_starred,
+    Entry.proficiency,
+)
+
+# 摘要查询的列（全文检索原生 SQL 用）
+SUMMARY_SQL_COLUMNS = (
+    f"entries.id, "
+    f"SUBSTR(entries.source_text, 1, {SUMMARY_TEXT_LENGTH}) AS source_text, "
+    f"SUBSTR(entries.translation, 1, {SUMMARY_TEXT_LENGTH}) AS translation, "
+    f"entries.entry_type, entries.is_starred, entries.proficiency"
+)
@@ -0,0 +1,263 @@
+"""
+SQL 耗时统计
+通过引擎的 before/after_cursor_execute 事件记录每条语句的耗时，
+按归一化 SQL 聚合为延迟直方图，超过阈值的记录慢查询日志；
+调用的仓储方法只对慢查询和抽样语句查找（遍历调用栈开销较大）
+"""
+import bisect
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from loguru import logger
+
+from src.utils.config_loader import config
+
+
+# 直方图桶上界（毫秒），最后一个桶为无穷大
+BUCKET_BOUNDS_MS = (0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# 查找调用方时跳过的模块（数据库基础设施本身）
+_INFRA_MODULES = ("src.data.database", "src.data.async_database", "src.data.query_metrics")
+_MAX_STACK_DEPTH = 40
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_PLACEHOLDER = re.compile(r"\?|%s|%\(\w+\)s|:\w+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    归一化 SQL：字面量和占位符替换为 ?，IN 列表 / 多行 VALUES 折叠，空白压缩
+
+    Args:
+        statement: SQL 语句
+
+    Returns:
+        查询形态
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    # 多行 INSERT ... VALUES (...), (...), ...
+    return re.sub(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+", r"\1, ...", sql)
+
+
+def _stack_frames() -> Iterator:
+    """
+    当前调用栈的帧（由内向外）
+
+    异步会话的语句在 SQLAlchemy 的 greenlet 中执行，其调用栈在这里中断，
+    继续沿父 greenlet 挂起处的栈查找发起调用的协程。
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+    try:
+        import greenlet
+    except ImportError:
+        return
+
+    current = greenlet.getcurrent().parent
+    while current is not None:
+        frame = current.gr_frame
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent
+
+
+def find_caller() -> str:
+    """调用栈中最近的业务代码位置（模块.类.方法），跳过 SQLAlchemy 和数据库基础设施"""
+    for depth, frame in enumerate(_stack_frames()):
+        if depth >= _MAX_STACK_DEPTH:
+            break
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("src.") and module not in _INFRA_MODULES:
+            # 推导式/闭包归到所在的方法
+            qualname = frame.f_code.co_qualname.split(".<locals>")[0]
+            return f"{module.rsplit('.', 1)[-1]}.{qualname}"
+    return "unknown"
+
+
+class LatencyHistogram:
+    """延迟直方图（固定对数刻度桶）"""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float):
+        """记录一次耗时"""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, pct: float) -> float:
+        """估算分位数（取所在桶的上界，不超过最大值）"""
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKET_BOUNDS_MS[i], self.max_ms) if i < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+
+class QueryMetrics:
+    """SQL 耗时统计"""
+
+    def __init__(self, slow_query_ms: float = 200, caller_sample_every: int = 100):
+        """
+        Args:
+            slow_query_ms: 慢查询阈值（毫秒）
+            caller_sample_every: 每种查询形态每隔多少条语句查找一次调用方（慢查询总是查找）
+        """
+        self.slow_query_ms = slow_query_ms
+        self.caller_sample_every = max(caller_sample_every, 1)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        # 查询形态 -> 抽样到的调用方次数
+        self._callers: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine):
+        """在引擎上注册计时事件（异步引擎传入 engine.sync_engine）"""
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append((context, time.perf_counter()))
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start_time")
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()[1]) * 1000
+        self.record(statement, elapsed_ms)
+
+    @staticmethod
+    def _on_error(exception_context):
+        """语句执行出错时不会触发 after_cursor_execute，丢弃该语句的开始时间"""
+        conn = exception_context.connection
+        context = exception_context.execution_context
+        if conn is None or context is None:
+            return
+        starts = conn.info.get("query_start_time")
+        if starts and starts[-1][0] is context:
+            starts.pop()
+
+    def record(self, statement: str, elapsed_ms: float, caller: Optional[str] = None):
+        """
+        记录一条语句的耗时
+
+        Args:
+            statement: SQL 语句
+            elapsed_ms: 耗时（毫秒）
+            caller: 调用方（None 时按抽样规则从调用栈查找）
+        """
+        shape = normalize_sql(statement)
+        slow = elapsed_ms >= self.slow_query_ms
+
+        with self._lock:
+            histogram = self._histograms.get(shape)
+            if histogram is None:
+                histogram = self._histograms[shape] = LatencyHistogram()
+            histogram.record(elapsed_ms)
+            # 每种形态的第一条及之后每隔 caller_sample_every 条
+            sampled = (histogram.count - 1) % self.caller_sample_every == 0
+
+        if caller is None and (slow or sampled):
+            caller = find_caller()
+
+        if caller is not None:
+            with self._lock:
+                self._callers.setdefault(shape, Counter())[caller] += 1
+
+        if slow:
+            logger.warning(f"慢查询 {elapsed_ms:.0f}ms [{caller}] {shape[:300]}")
+
+    def top(self, n: int = 10, by: str = "total_ms") -> List[dict]:
+        """
+        最耗时的查询形态
+
+        Args:
+            n: 返回条数
+            by: 排序字段 total_ms / avg_ms / p95_ms / max_ms / count
+
+        Returns:
+            [{'sql', 'caller', 'count', 'total_ms', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}, ...]
+            caller 为抽样到次数最多的调用方
+        """
+        with self._lock:
+            rows = [
+                {
+                    "sql": shape,
+                    "caller": self._top_caller(shape),
+                    "count": h.count,
+                    "total_ms": h.total_ms,
+                    "avg_ms": h.total_ms / h.count,
+                    "p50_ms": h.percentile(50),
+                    "p95_ms": h.percentile(95),
+                    "p99_ms": h.percentile(99),
+                    "max_ms": h.max_ms,
+                }
+                for shape, h in self._histograms.items()
+            ]
+
+        rows.sort(key=lambda row: row[by], reverse=True)
+        return rows[:n]
+
+    def format_report(self, n: int = 10, by: str = "total_ms") -> str:
+        """最耗时查询形态的文字报告"""
+        rows = self.top(n, by)
+        if not rows:
+            return "暂无 SQL 耗时数据"
+
+        lines = [f"SQL 耗时 Top {len(rows)}（按 {by}）:"]
+        for i, row in enumerate(rows, 1):
+            lines.append(
+                f"{i:>2}. {row['caller']}  次数={row['count']} 总计={row['total_ms']:.0f}ms "
+                f"平均={row['avg_ms']:.1f}ms p95={row['p95_ms']:.1f}ms 最大={row['max_ms']:.0f}ms"
+            )
+            lines.append(f"    {row['sql'][:200]}")
+        return "\n".join(lines)
+
+    def dump(self, n: int = 10, by: str = "total_ms"):
+        """把最耗时的查询形态写入日志"""
+        logger.info(self.format_report(n, by))
+
+    def _top_caller(self, shape: str) -> str:
+        """抽样到次数最多的调用方（需持有锁）"""
+        callers = self._callers.get(shape)
+        if not callers:
+            return "unknown"
+        return callers.most_common(1)[0][0]
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self._histograms.clear()
+            self._callers.clear()
+
+
+# 全局统计实例
+query_metrics = QueryMetrics(config.database.slow_query_ms, config.database.query_caller_sample_every)
@@ -1,19 +1,32 @@
 """
 数据仓储层（Repository Pattern）
 """
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import desc, asc, or_, and_
+from sqlalchemy import desc, asc, or_, and_, case, event, func, literal, select
+from sqlalchemy import text as sql_text
 from loguru import logger
 import hashlib
+import json
+import time
 
 from src.data.database import db_manager
-from src.data.models import Entry, Tag, DailyStat, TranslationCache
+from src.data.cache_hits import cache_hit_buffer, HIT_UPDATE
+from src.data.compression import text_compressor
+from src.data.models import Entry, EntryArchive, EntryTag, Tag, DailyStat, TranslationCache
+from src.data.fulltext import fulltext_available, build_search_sql
+from src.data.projections import EntrySummary, SUMMARY_COLUMNS, SUMMARY_SQL_COLUMNS
 from src.data.tag_repository import TagRepository
 
 
 class EntryRepository:
     """词条仓储"""
+
+    # 复习统计缓存 (日期, 生成时间, 统计)，所有实例共享
+    _summary: Optional[Tuple] = None
+    # 失效次数，统计查询期间发生失效时不写入缓存
+    _summary_version = 0
+    SUMMARY_TTL = 60
     
     @staticmethod
     def _compute_hash(text: str) -> str:
@@ -23,6 +36,7 @@ class EntryRepository:
     def save(self, entry: Entry) -> Entry:
         """保存词条"""
         with db_manager.get_session() as session:
+            self.invalidate_summary_on_commit(session)
             # 计算哈希值
             if not entry.source_text_hash:
                 entry.source_text_hash = self._compute_hash(entry.source_text)
@@ -47,6 +61,118 @@ class EntryRepository:
                 logger.debug(f"新增词条: {entry.source_text[:30]}...")
                 return entry
     
+    @staticmethod
+    def _to_row(entry: Entry, now: datetime) -> dict:
+        """词条转为插入用的列字典（所有行列集合一致，未设置的列取默认值）"""
+        row = {}
+        for column in Entry.__table__.columns:
+            if column.primary_key:
+                continue
+            value = getattr(entry, column.key)
+            if value is None and column.default is not None and column.default.is_scalar:
+                value = column.default.arg
+            row[column.key] = value
+
+        row["created_at"] = row["created_at"] or now
+        row["updated_at"] = now
+        row["is_deleted"] = False
+        row["deleted_at"] = None
+        return row
+
+    def _upsert_statement(self, rows: List[dict]):
+        """按 uq_entry 冲突更新的多行 INSERT（MySQL: ON DUPLICATE KEY UPDATE）"""
+        if db_manager.engine.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(Entry.__table__).values(rows)
+            return stmt.on_conflict_do_update(
+                index_elements=["source_text_hash", "source_lang", "target_lang"],
+                set_={
+                    "translation": stmt.excluded.translation,
+                    "updated_at": stmt.excluded.updated_at,
+                    "is_deleted": False,
+                    "deleted_at": None,
+                }
+            )
+
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(Entry.__table__).values(rows)
+        return stmt.on_duplicate_key_update(
+            translation=stmt.inserted.translation,
+            updated_at=stmt.inserted.updated_at,
+            is_deleted=False,
+            deleted_at=None,
+        )
+
+    def bulk_upsert(self, entries: List[Entry], chunk_size: int = 1000) -> List[dict]:
+        """
+        批量插入或更新词条（按 原文哈希+语言对 去重）
+
+        每块先一次查询已有记录，译文未变化的跳过，其余用一条多行 INSERT ... ON DUPLICATE KEY UPDATE
+        写入（已软删除的记录会恢复）。每块单独提交。
+
+        Args:
+            entries: 词条列表
+            chunk_size: 每块条数
+
+        Returns:
+            每块的统计 [{'inserted': n, 'updated': n, 'skipped': n}, ...]
+        """
+        results = []
+
+        for start in range(0, len(entries), chunk_size):
+            chunk = entries[start:start + chunk_size]
+            now = datetime.now()
+            stats = {"inserted": 0, "updated": 0, "skipped": 0}
+
+            # 预先计算哈希，块内重复的键以最后一条为准
+            rows = {}
+            for entry in chunk:
+                if not entry.source_text or not entry.translation:
+                    stats["skipped"] += 1
+                    continue
+                if not entry.source_text_hash:
+                    entry.source_text_hash = self._compute_hash(entry.source_text)
+                row = self._to_row(entry, now)
+                key = (row["source_text_hash"], row["source_lang"], row["target_lang"])
+                if key in rows:
+                    stats["skipped"] += 1
+                rows[key] = row
+
+            if not rows:
+                results.append(stats)
+                continue
+
+            with db_manager.get_session() as session:
+                existing = {
+                    (h, src, tgt): (translation, is_deleted)
+                    for h, src, tgt, translation, is_deleted in session.query(
+                        Entry.source_text_hash, Entry.source_lang, Entry.target_lang,
+                        Entry.translation, Entry.is_deleted
+                    ).filter(
+                        Entry.source_text_hash.in_({key[0] for key in rows})
+                    )
+                }
+
+                to_write = []
+                for key, row in rows.items():
+                    if key not in existing:
+                        stats["inserted"] += 1
+                    elif existing[key] == (row["translation"], False):
+                        stats["skipped"] += 1
+                        continue
+                    else:
+                        stats["updated"] += 1
+                    to_write.append(row)
+
+                if to_write:
+                    session.execute(self._upsert_statement(to_write))
+                    self.invalidate_summary_on_commit(session)
+
+            logger.debug(f"批量写入词条 {start + len(chunk)}/{len(entries)}: {stats}")
+            results.append(stats)
+
+        return results
+
     def get_by_id(self, entry_id: int) -> Optional[Entry]:
         """根据ID获取词条"""
         with db_manager.get_session() as session:
@@ -56,7 +182,7 @@ class EntryRepository:
             ).first()
     
     def get_all(self, limit: int = 100, offset: int = 0) -> List[Entry]:
-        """获取所有词条"""
+        """获取所有词条（OFFSET 分页，深翻页请使用 get_page/iter_entries）"""
         with db_manager.get_session() as session:
             return session.query(Entry).filter(
                 Entry.is_deleted == False
@@ -64,21 +190,169 @@ class EntryRepository:
                 desc(Entry.created_at)
             ).limit(limit).offset(offset).all()
     
+    @staticmethod
+    def _before_cursor(cursor: Tuple[datetime, int]):
+        """(created_at, id) 降序分页中位于游标之后的条件"""
+        created_at, entry_id = cursor
+        return or_(
+            Entry.created_at < created_at,
+            and_(Entry.created_at == created_at, Entry.id < entry_id)
+        )
+
+    def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> Tuple[List[Entry], Optional[Tuple[datetime, int]]]:
+        """
+        按创建时间倒序分页（键集分页，翻页深度不影响性能）
+
+        Args:
+            limit: 每页条数
+            cursor: 上一页返回的游标，None 表示第一页
+
+        Returns:
+            (词条列表, 下一页游标)，没有更多数据时游标为 None
+        """
+        with db_manager.get_session() as session:
+            query = session.query(Entry).filter(Entry.is_deleted == False)
+            if cursor:
+                query = query.filter(self._before_cursor(cursor))
+
+            entries = query.order_by(
+                desc(Entry.created_at), desc(Entry.id)
+            ).limit(limit).all()
+
+        next_cursor = None
+        if len(entries) == limit:
+            last = entries[-1]
+            next_cursor = (last.created_at, last.id)
+        return entries, next_cursor
+
+    def iter_entries(self, filter=None, batch_size: int = 500) -> Iterator[Entry]:
+        """
+        流式遍历词条（服务端游标，按批读取，内存占用与总数无关）
+
+        Args:
+            filter: 额外的过滤条件（SQLAlchemy 表达式），如 Entry.is_starred == True
+            batch_size: 每批读取条数
+
+        Yields:
+            词条（按创建时间倒序）
+        """
+        stmt = select(Entry).where(Entry.is_deleted == False)
+        if filter is not None:
+            stmt = stmt.where(filter)
+        stmt = stmt.order_by(desc(Entry.created_at), desc(Entry.id))
+
+        with db_manager.get_session() as session:
+            result = session.execute(stmt.execution_options(yield_per=batch_size))
+            for partition in result.scalars().partitions():
+                yield from partition
+
+    @staticmethod
+    def _like_filter(keyword: str):
+        """LIKE 匹配原文和翻译（未建立全文索引时使用）"""
+        return and_(
+            or_(
+                Entry.source_text.like(f"%{keyword}%"),
+                Entry.translation.like(f"%{keyword}%")
+            ),
+            Entry.is_deleted == False
+        )
+
+    @staticmethod
+    def _fulltext_sql(session, keyword: str, columns: str) -> Optional[tuple]:
+        """全文检索 SQL，不可用时返回 None"""
+        if fulltext_available(session.connection()):
+            return build_search_sql(keyword, session.bind.dialect.name, columns)
+        return None
+
     def search(self, keyword: str, limit: int = 50) -> List[Entry]:
-        """搜索词条"""
+        """
+        搜索词条（原文、翻译、笔记、标签）
+
+        已建立全文索引时按相关度排序，否则退化为 LIKE 匹配原文和翻译（按创建时间倒序）
+        """
         with db_manager.get_session() as session:
+            search_sql = self._fulltext_sql(session, keyword, "entries.*")
+            if search_sql:
+                sql, params = search_sql
+                return list(session.execute(
+                    select(Entry).from_statement(sql_text(sql)),
+                    {**params, "limit": limit}
+                ).scalars())
+
             return session.query(Entry).filter(
-                and_(
-                    or_(
-                        Entry.source_text.like(f"%{keyword}%"),
-                        Entry.translation.like(f"%{keyword}%")
-                    ),
-                    Entry.is_deleted == False
+                self._like_filter(keyword)
+            ).order_by(
+                desc(Entry.created_at)
+            ).limit(limit).all()
+
+    def search_summaries(self, keyword: str, limit: int = 50) -> List[EntrySummary]:
+        """搜索词条，只返回列表所需的摘要（排序规则同 search）"""
+        with db_manager.get_session() as session:
+            search_sql = self._fulltext_sql(session, keyword, SUMMARY_SQL_COLUMNS)
+            if search_sql:
+                sql, params = search_sql
+                rows = session.execute(sql_text(sql), {**params, "limit": limit})
+            else:
+                rows = session.execute(
+                    select(*SUMMARY_COLUMNS).where(
+                        self._like_filter(keyword)
+                    ).order_by(
+                        desc(Entry.created_at)
+                    ).limit(limit)
                 )
+            return [EntrySummary.from_row(row) for row in rows]
+
+    def get_summaries(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        tag_name: Optional[str] = None
+    ) -> List[EntrySummary]:
+        """
+        获取词条摘要列表（按创建时间倒序，只查询列表所需的列）
+
+        Args:
+            limit: 最多返回条数
+            offset: 偏移量
+            tag_name: 只返回带该标签的词条
+        """
+        stmt = select(*SUMMARY_COLUMNS).where(Entry.is_deleted == False)
+        if tag_name:
+            stmt = stmt.join(
+                EntryTag, EntryTag.entry_id == Entry.id
+            ).join(
+                Tag, Tag.id == EntryTag.tag_id
+            ).where(Tag.name == tag_name)
+
+        stmt = stmt.order_by(desc(Entry.created_at)).limit(limit).offset(offset)
+
+        with db_manager.get_session() as session:
+            return [EntrySummary.from_row(row) for row in session.execute(stmt)]
+
+    def get_by_tag(self, tag_name: str, limit: int = 100) -> List[Entry]:
+        """
+        获取带有指定标签的词条（经 entry_tags 索引查找，按创建时间倒序）
+
+        Args:
+            tag_name: 标签名
+            limit: 最多返回条数
+        """
+        with db_manager.get_session() as session:
+            return session.query(Entry).join(
+                EntryTag, EntryTag.entry_id == Entry.id
+            ).join(
+                Tag, Tag.id == EntryTag.tag_id
+            ).filter(
+                Tag.name == tag_name,
+                Entry.is_deleted == False
             ).order_by(
                 desc(Entry.created_at)
             ).limit(limit).all()
-    
+
     def get_query_count(self, text: str) -> int:
         """
         获取文本查询次数
@@ -104,7 +378,7 @@ class EntryRepository:
                 ).first()
 
                 if cache:
-                    return cache.hit_count
+                    return cache.hit_count + cache_hit_buffer.pending(cache_key)
                 else:
                     # 如果缓存不存在，返回0
                     return 0
@@ -127,12 +401,92 @@ class EntryRepository:
     def delete(self, entry_id: int):
         """删除词条（软删除）"""
         with db_manager.get_session() as session:
+            self.invalidate_summary_on_commit(session)
             entry = session.query(Entry).filter(Entry.id == entry_id).first()
             if entry:
                 entry.is_deleted = True
-                entry.updated_at = datetime.now()
+                entry.deleted_at = entry.updated_at = datetime.now()
                 logger.debug(f"删除词条: {entry.source_text[:30]}...")
-    
+
+    def archive_deleted(self, retention_days: int, batch_size: int = 500, pause: float = 0.05) -> int:
+        """
+        分批将删除超过保留期的词条移入归档表（按主键顺序，每批一个事务，批次间暂停）
+
+        词条及其标签关联从 entries / entry_tags 中删除，完整数据以 JSON 存入 entries_archive。
+
+        Args:
+            retention_days: 保留天数（按删除时间 deleted_at 计算，删除后的修改不影响保留期）
+            batch_size: 每批归档的条数
+            pause: 批次间暂停秒数
+
+        Returns:
+            归档的条数
+        """
+        cutoff = datetime.now() - timedelta(days=retention_days)
+        columns = Entry.__table__.columns
+        archived = 0
+        last_id = 0
+
+        while True:
+            with db_manager.get_session() as session:
+                # MySQL 锁定本批词条，避免读取后被恢复或修改
+                entries = session.query(Entry).filter(
+                    Entry.is_deleted == True,
+                    Entry.deleted_at < cutoff,
+                    Entry.id > last_id
+                ).order_by(asc(Entry.id)).limit(batch_size).with_for_update().all()
+
+                if not entries:
+                    break
+
+                ids = [entry.id for entry in entries]
+                # 删除时再次校验条件（SQLite 不支持行锁，读取后可能已被恢复），只归档实际删除的词条
+                session.query(Entry).filter(
+                    Entry.id.in_(ids),
+                    Entry.is_deleted == True,
+                    Entry.deleted_at < cutoff
+                ).delete(synchronize_session=False)
+                remaining = {
+                    row.id for row in session.query(Entry.id).filter(Entry.id.in_(ids))
+                }
+                entries = [entry for entry in entries if entry.id not in remaining]
+                deleted_ids = [entry.id for entry in entries]
+
+                session.add_all([
+                    EntryArchive(
+                        original_id=entry.id,
+                        source_text=entry.source_text,
+                        translation=entry.translation,
+                        source_lang=entry.source_lang,
+                        target_lang=entry.target_lang,
+                        payload=json.dumps({
+                            column.key: self._json_value(getattr(entry, column.key))
+                            for column in columns
+                        }, ensure_ascii=False),
+                        deleted_at=entry.deleted_at,
+                    )
+                    for entry in entries
+                ])
+                if deleted_ids:
+                    session.query(EntryTag).filter(
+                        EntryTag.entry_id.in_(deleted_ids)
+                    ).delete(synchronize_session=False)
+                archived += len(deleted_ids)
+
+            last_id = ids[-1]
+            if len(ids) < batch_size:
+                break
+            time.sleep(pause)
+
+        if archived:
+            logger.info(f"归档已删除词条: {archived} 条")
+        return archived
+
+    @staticmethod
+    def _json_value(value):
+        """归档 JSON 中的时间统一为 ISO 格式"""
+        return value.isoformat() if isinstance(value, datetime) else value
+
     def get_total_count(self) -> int:
         """获取总词条数"""
         with db_manager.get_session() as session:
@@ -199,6 +553,7 @@ class EntryRepository:
         """
         try:
             with db_manager.get_session() as session:
+                self.invalidate_summary_on_commit(session)
                 entry = session.query(Entry).filter(Entry.id == entry_id).first()
 
                 if not entry:
@@ -225,126 +580,139 @@ class EntryRepository:
             logger.error(f"更新复习数据失败: {e}")
             return False
 
-    def get_due_reviews_by_urgency(self) -> dict:
+    # 复习列表只需要的列（不加载 context、notes 等大文本）
+    REVIEW_COLUMNS = (
+        Entry.id, Entry.source_text, Entry.translation, Entry.entry_type,
+        Entry.proficiency, Entry.review_count, Entry.next_review
+    )
+
+    def get_due_reviews_by_urgency(self, limit_per_bucket: int = 200) -> dict:
         """
         按紧急程度获取待复习词条
 
+        一次 GROUP BY 按 CASE 分组（逾期/今天/3天内）计数，再按各组的 next_review 区间
+        各取最早的 limit_per_bucket 条（走 next_review 索引，不读取其余行）；
+        只取复习界面需要的列。
+
+        Args:
+            limit_per_bucket: 每组最多返回的条数
+
         Returns:
-            字典，包含 overdue, today, soon 三个列表
+            字典，包含 overdue, today, soon 三个列表（行对象，可按属性访问列），
+            以及 counts: 各组实际总数
         """
+        buckets = ('overdue', 'today', 'soon')
+        result = {name: [] for name in buckets}
+        counts = dict.fromkeys(buckets, 0)
+
         try:
             with db_manager.get_session() as session:
                 now = datetime.now()
                 today_end = datetime.combine(now.date(), datetime.max.time())
                 soon_end = now + timedelta(days=3)
 
-                # 逾期
-                overdue = session.query(Entry).filter(
-                    and_(
-                        Entry.next_review < now,
-                        Entry.is_deleted == False
-                    )
-                ).order_by(asc(Entry.next_review)).all()
-
-                # 今天
-                today = session.query(Entry).filter(
-                    and_(
-                        Entry.next_review >= now,
-                        Entry.next_review <= today_end,
-                        Entry.is_deleted == False
-                    )
-                ).order_by(asc(Entry.next_review)).all()
-
-                # 即将到期（3天内）
-                soon = session.query(Entry).filter(
-                    and_(
-                        Entry.next_review > today_end,
-                        Entry.next_review <= soon_end,
-                        Entry.is_deleted == False
-                    )
-                ).order_by(asc(Entry.next_review)).all()
-
-                return {
-                    'overdue': overdue,
-                    'today': today,
-                    'soon': soon
+                # 与 CASE 分支一一对应的 next_review 区间
+                ranges = {
+                    'overdue': Entry.next_review < now,
+                    'today': and_(Entry.next_review >= now, Entry.next_review <= today_end),
+                    'soon': Entry.next_review > today_end,
                 }
+                bucket = case(
+                    (ranges['overdue'], 'overdue'),
+                    (Entry.next_review <= today_end, 'today'),
+                    else_='soon'
+                ).label('bucket')
+                due = and_(Entry.next_review <= soon_end, Entry.is_deleted == False)
+
+                # 按别名分组：CASE 中含绑定参数，重复展开时 MySQL ONLY_FULL_GROUP_BY 可能判定为不同表达式
+                for name, count in session.execute(
+                    select(bucket, func.count()).where(due).group_by(sql_text('bucket'))
+                ):
+                    counts[name] = count
+
+                for name in buckets:
+                    if not counts[name]:
+                        continue
+                    result[name] = session.execute(
+                        select(*self.REVIEW_COLUMNS, literal(name).label('bucket')).where(
+                            due, ranges[name]
+                        ).order_by(asc(Entry.next_review)).limit(limit_per_bucket)
+                    ).all()
+
+            result['counts'] = counts
+            return result
 
         except Exception as e:
             logger.error(f"获取待复习词条失败: {e}")
-            return {'overdue': [], 'today': [], 'soon': []}
+            return {'overdue': [], 'today': [], 'soon': [], 'counts': dict.fromkeys(buckets, 0)}
 
     def get_review_statistics(self) -> dict:
         """
-        获取复习统计信息
+        获取复习统计信息（一次条件聚合查询，结果缓存）
+
+        缓存在词条保存、删除、复习后失效；待复习数随时间变化，另设短过期时间。
 
         Returns:
             统计信息字典
         """
+        now = datetime.now()
+        cached = EntryRepository._summary
+        if cached and cached[0] == now.date() and time.monotonic() - cached[1] < self.SUMMARY_TTL:
+            return dict(cached[2])
+
+        version = EntryRepository._summary_version
         try:
             with db_manager.get_session() as session:
-                now = datetime.now()
+                today_start = datetime.combine(now.date(), datetime.min.time())
 
-                # 总词条数
-                total_count = session.query(Entry).filter(
+                def bucket(condition):
+                    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+                row = session.query(
+                    func.count(Entry.id),
+                    bucket(Entry.next_review <= now),
+                    bucket(Entry.proficiency >= 80),
+                    bucket(and_(Entry.proficiency >= 40, Entry.proficiency < 80)),
+                    bucket(Entry.proficiency < 40),
+                    bucket(Entry.last_review >= today_start),
+                    bucket(Entry.created_at >= today_start)
+                ).filter(
                     Entry.is_deleted == False
-                ).count()
+                ).one()
 
-                # 待复习数
-                due_count = session.query(Entry).filter(
-                    and_(
-                        Entry.next_review <= now,
-                        Entry.is_deleted == False
-                    )
-                ).count()
+                stats = dict(zip(
+                    ('total_count', 'due_count', 'mastered_count', 'learning_count',
+                     'new_count', 'reviewed_today', 'today_new'),
+                    (int(value or 0) for value in row)
+                ))
 
-                # 已掌握数（熟练度>=80）
-                mastered_count = session.query(Entry).filter(
-                    and_(
-                        Entry.proficiency >= 80,
-                        Entry.is_deleted == False
-                    )
-                ).count()
-
-                # 学习中（熟练度40-79）
-                learning_count = session.query(Entry).filter(
-                    and_(
-                        Entry.proficiency >= 40,
-                        Entry.proficiency < 80,
-                        Entry.is_deleted == False
-                    )
-                ).count()
-
-                # 新词（熟练度<40）
-                new_count = session.query(Entry).filter(
-                    and_(
-                        Entry.proficiency < 40,
-                        Entry.is_deleted == False
-                    )
-                ).count()
-
-                # 今日已复习
-                today_start = datetime.combine(now.date(), datetime.min.time())
-                reviewed_today = session.query(Entry).filter(
-                    and_(
-                        Entry.last_review >= today_start,
-                        Entry.is_deleted == False
-                    )
-                ).count()
-
-                return {
-                    'total_count': total_count,
-                    'due_count': due_count,
-                    'mastered_count': mastered_count,
-                    'learning_count': learning_count,
-                    'new_count': new_count,
-                    'reviewed_today': reviewed_today
-                }
+            if version == EntryRepository._summary_version:
+                EntryRepository._summary = (now.date(), time.monotonic(), stats)
+            return dict(stats)
 
         except Exception as e:
             logger.error(f"获取复习统计失败: {e}")
             return {}
 
+    @classmethod
+    def invalidate_summary(cls):
+        """使复习统计缓存失效"""
+        EntryRepository._summary_version += 1
+        EntryRepository._summary = None
+
+    @classmethod
+    def invalidate_summary_on_commit(cls, session):
+        """
+        会话提交后使复习统计缓存失效
+
+        提交前失效时，其他线程可能在提交前重新缓存旧统计；
+        处于工作单元中时在工作单元提交后失效，回滚则不失效。
+
+        Args:
+            session: 同步会话（异步会话传入 session.sync_session）
+        """
+        event.listen(session, "after_commit", lambda _: cls.invalidate_summary(), once=True)
+
 
 class CacheRepository:
     """缓存仓储"""
@@ -356,20 +724,52 @@ class CacheRepository:
                 TranslationCache.cache_key == cache_key
             ).first()
             
-            if cache:
-                # 检查是否过期
-                if cache.expires_at and cache.expires_at < datetime.now():
-                    session.delete(cache)
-                    return None
-                
-                # 增加命中次数
-                cache.hit_count += 1
-                return cache
-            
+        # 过期视为未命中，由后台清理删除，读路径不做写操作
+        if not cache or (cache.expires_at and cache.expires_at < datetime.now()):
             return None
+
+        # 命中次数、访问时间（用于容量淘汰）先在内存累计，批量写回
+        if cache_hit_buffer.record(cache_key):
+            self.flush_hits()
+        return cache
+
+    def flush_hits(self) -> int:
+        """
+        将缓冲的命中次数和访问时间批量写回
+
+        Returns:
+            写回的缓存键数量
+        """
+        rows = cache_hit_buffer.drain()
+        if not rows:
+            return 0
+
+        try:
+            with db_manager.get_session() as session:
+                session.connection().execute(HIT_UPDATE, rows)
+        except Exception as e:
+            # 命中统计只影响淘汰顺序，写回失败直接丢弃
+            logger.warning(f"写回缓存命中次数失败: {e}")
+            return 0
+
+        return len(rows)
     
+    @staticmethod
+    def _stored_size(cache: TranslationCache) -> int:
+        """
+        缓存条目实际存储的字节数（原文、译文按写库时的编码/压缩结果计算，加 payload）
+
+        压缩器记住本线程最近的压缩结果，随后写库时不会再压缩一次。
+        """
+        size = len(text_compressor.compress(cache.source_text or ""))
+        size += len(text_compressor.compress(cache.translation or ""))
+        size += len(cache.payload or b"")
+        return size
+
     def set(self, cache: TranslationCache):
         """设置缓存"""
+        cache.size_bytes = self._stored_size(cache)
+
         with db_manager.get_session() as session:
             existing = session.query(TranslationCache).filter(
                 TranslationCache.cache_key == cache.cache_key
@@ -378,8 +778,12 @@ class CacheRepository:
             if existing:
                 # 更新现有缓存
                 existing.translation = cache.translation
+                existing.translator_type = cache.translator_type
+                existing.payload = cache.payload
                 existing.created_at = datetime.now()
                 existing.expires_at = cache.expires_at
+                existing.size_bytes = cache.size_bytes
+                existing.last_hit_at = datetime.now()
                 # 增加命中次数（因为这次查询触发了缓存更新）
                 existing.hit_count += 1
             else:
@@ -388,23 +792,103 @@ class CacheRepository:
                     cache.hit_count = 1
                 session.add(cache)
     
-    def clean_expired(self):
-        """清理过期缓存"""
+    def get_total_size(self) -> int:
+        """获取缓存总大小（字节）"""
         with db_manager.get_session() as session:
-            now = datetime.now()
-            deleted = session.query(TranslationCache).filter(
-                TranslationCache.expires_at < now
-            ).delete()
+            total = session.query(func.sum(TranslationCache.size_bytes)).scalar()
+            return int(total or 0)
+
+    def evict(self, bytes_to_free: int, batch_size: int = 500) -> Tuple[int, int]:
+        """
+        按命中次数和最近访问时间淘汰缓存（LFU，同频次时 LRU）
+
+        Args:
+            bytes_to_free: 需要释放的字节数
+            batch_size: 每批删除的条数
+
+        Returns:
+            (删除条数, 释放字节数)
+        """
+        deleted = 0
+        freed = 0
+
+        while freed < bytes_to_free:
+            with db_manager.get_session() as session:
+                # 走 idx_cache_eviction 索引，只取主键和大小
+                victims = session.query(
+                    TranslationCache.cache_key, TranslationCache.size_bytes
+                ).order_by(
+                    asc(TranslationCache.hit_count),
+                    asc(TranslationCache.last_hit_at)
+                ).limit(batch_size).all()
+
+                if not victims:
+                    break
+
+                keys = []
+                for cache_key, size in victims:
+                    keys.append(cache_key)
+                    freed += size or 0
+                    if freed >= bytes_to_free:
+                        break
+
+                deleted += session.query(TranslationCache).filter(
+                    TranslationCache.cache_key.in_(keys)
+                ).delete(synchronize_session=False)
+
+        return deleted, freed
+
+    def clean_expired(self, batch_size: int = 500, pause: float = 0.05) -> int:
+        """
+        分批清理过期缓存（按主键顺序，每批之间暂停，避免长时间锁表）
+
+        Args:
+            batch_size: 每批删除的条数
+            pause: 批次间暂停秒数
+
+        Returns:
+            删除的条数
+        """
+        now = datetime.now()
+        deleted = 0
+        last_key = ""
+
+        while True:
+            with db_manager.get_session() as session:
+                keys = [k for (k,) in session.query(TranslationCache.cache_key).filter(
+                    TranslationCache.expires_at < now,
+                    TranslationCache.cache_key > last_key
+                ).order_by(asc(TranslationCache.cache_key)).limit(batch_size)]
+
+                if not keys:
+                    break
+
+                deleted += session.query(TranslationCache).filter(
+                    TranslationCache.cache_key.in_(keys)
+                ).delete(synchronize_session=False)
+
+            last_key = keys[-1]
+            if len(keys) < batch_size:
+                break
+            time.sleep(pause)
+
+        if deleted:
             logger.info(f"清理过期缓存: {deleted} 条")
+        return deleted
 
 
 class StatsRepository:
     """统计仓储"""
     
+    @staticmethod
+    def _day(value) -> datetime:
+        """日期统一为当天零点的 datetime（date 列为 DATETIME，SQLite 中按文本比较）"""
+        return datetime.combine(value, datetime.min.time())
+    
     def update_today_stats(self, **kwargs):
         """更新今日统计"""
         with db_manager.get_session() as session:
-            today = datetime.now().date()
+            today = self._day(datetime.now().date())
             stats = session.query(DailyStat).filter(
                 DailyStat.date == today
             ).first()
@@ -419,10 +903,18 @@ class StatsRepository:
                     current = getattr(stats, key) or 0
                     setattr(stats, key, current + value)
     
+    def get_today_stats(self) -> Optional[DailyStat]:
+        """获取今日统计"""
+        with db_manager.get_session() as session:
+            today = self._day(datetime.now().date())
+            return session.query(DailyStat).filter(
+                DailyStat.date == today
+            ).first()
+    
     def get_stats(self, days: int = 30) -> List[DailyStat]:
         """获取统计数据"""
         with db_manager.get_session() as session:
-            start_date = datetime.now().date() - timedelta(days=days)
+            start_date = self._day(datetime.now().date() - timedelta(days=days))
             return session.query(DailyStat).filter(
                 DailyStat.date >= start_date
             ).order_by(asc(DailyStat.date)).all()
@@ -434,9 +926,9 @@ class StatsRepository:
             query = session.query(DailyStat)
             
             if start_date:
-                query = query.filter(DailyStat.date >= start_date)
+                query = query.filter(DailyStat.date >= self._day(start_date))
             
-            query = query.filter(DailyStat.date <= end_date)
+            query = query.filter(DailyStat.date <= self._day(end_date))
             
             return query.order_by(asc(DailyStat.date)).all()
 
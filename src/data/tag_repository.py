@@ -1,12 +1,18 @@
 """
 标签仓储
+词条的标签以 entry_tags 关联表为准，Entry.tags 中的 JSON 数组同步保存（用于展示、导出和全文检索）
+
+标签名不区分大小写（与 MySQL utf8mb4_unicode_ci 下 tags.name 的唯一约束一致），
+"Work" 与 "work" 视为同一标签，保留最先出现的写法。
 """
-from typing import List, Optional
+import json
+from typing import Iterable, List, Optional, Tuple
 from sqlalchemy import func
+from sqlalchemy.orm import Session
 from loguru import logger
 
 from src.data.database import db_manager
-from src.data.models import Tag
+from src.data.models import Entry, EntryTag, Tag
 
 
 class TagRepository:
@@ -48,10 +54,19 @@ class TagRepository:
             return session.query(Tag).order_by(Tag.name).all()
     
     def delete(self, tag_id: int):
-        """删除标签"""
+        """删除标签（同时从词条上移除）"""
         with db_manager.get_session() as session:
             tag = session.query(Tag).filter(Tag.id == tag_id).first()
             if tag:
+                entry_ids = [entry_id for (entry_id,) in session.query(EntryTag.entry_id).filter(
+                    EntryTag.tag_id == tag_id
+                )]
+                for entry in session.query(Entry).filter(Entry.id.in_(entry_ids)):
+                    names = [name for name in self.parse_tags(entry.tags)
+                             if self.tag_key(name) != self.tag_key(tag.name)]
+                    entry.tags = json.dumps(names, ensure_ascii=False) if names else None
+
+                session.query(EntryTag).filter(EntryTag.tag_id == tag_id).delete(synchronize_session=False)
                 session.delete(tag)
                 logger.debug(f"删除标签: {tag.name}")
     
@@ -64,3 +79,102 @@ class TagRepository:
         new_tag = Tag(name=name, color=color)
         return self.save(new_tag)
 
+    @staticmethod
+    def tag_key(name: str) -> str:
+        """标签名的比较键（忽略首尾空白和大小写）"""
+        return name.strip().casefold()
+
+    @classmethod
+    def unique_names(cls, names: Iterable[str]) -> List[str]:
+        """去空白、按比较键去重（保持顺序，保留最先出现的写法）"""
+        unique = {}
+        for name in names:
+            name = str(name).strip()
+            if name:
+                unique.setdefault(cls.tag_key(name), name)
+        return list(unique.values())
+
+    @staticmethod
+    def parse_tags(value: Optional[str]) -> List[str]:
+        """
+        解析 Entry.tags 中的 JSON 数组（去空白、不区分大小写去重，保持顺序）
+
+        Returns:
+            标签名列表，格式错误时返回空列表
+        """
+        if not value:
+            return []
+        try:
+            names = json.loads(value)
+        except (TypeError, ValueError):
+            return []
+        if not isinstance(names, list):
+            return []
+        return TagRepository.unique_names(names)
+
+    @classmethod
+    def get_or_create_ids(cls, session: Session, names: Iterable[str]) -> dict:
+        """
+        批量获取或创建标签（在调用方的会话中）
+
+        Returns:
+            {标签比较键: 标签ID}（见 tag_key）
+        """
+        names = cls.unique_names(names)
+        if not names:
+            return {}
+
+        ids = {}
+        existing = session.query(Tag.name, Tag.id).filter(
+            func.lower(Tag.name).in_([name.lower() for name in names])
+        ).order_by(Tag.id)
+        for name, tag_id in existing:
+            ids.setdefault(cls.tag_key(name), tag_id)
+
+        missing = [Tag(name=name) for name in names if cls.tag_key(name) not in ids]
+        if missing:
+            session.add_all(missing)
+            session.flush()
+            ids.update((cls.tag_key(tag.name), tag.id) for tag in missing)
+        return ids
+
+    def set_entry_tags(self, entry_id: int, names: List[str]):
+        """
+        设置词条的标签（替换原有标签）
+
+        Args:
+            entry_id: 词条ID
+            names: 标签名列表
+        """
+        names = self.unique_names(names)
+
+        with db_manager.get_session() as session:
+            tag_ids = self.get_or_create_ids(session, names)
+
+            session.query(EntryTag).filter(EntryTag.entry_id == entry_id).delete(synchronize_session=False)
+            session.add_all(EntryTag(entry_id=entry_id, tag_id=tag_ids[self.tag_key(name)]) for name in names)
+
+            entry = session.query(Entry).filter(Entry.id == entry_id).first()
+            if entry:
+                entry.tags = json.dumps(names, ensure_ascii=False) if names else None
+
+            logger.debug(f"设置词条标签: {entry_id} -> {names}")
+
+    def get_tag_counts(self) -> List[Tuple[str, int]]:
+        """
+        获取各标签下的词条数（不含已删除词条，走 idx_entry_tags_tag 索引）
+
+        Returns:
+            [(标签名, 词条数), ...]，按词条数降序
+        """
+        with db_manager.get_session() as session:
+            count = func.count(EntryTag.entry_id)
+            return [
+                (name, total) for name, total in session.query(Tag.name, count).join(
+                    EntryTag, EntryTag.tag_id == Tag.id
+                ).join(
+                    Entry, Entry.id == EntryTag.entry_id
+                ).filter(
+                    Entry.is_deleted == False
+                ).group_by(Tag.id, Tag.name).order_by(count.desc(), Tag.name)
+            ]
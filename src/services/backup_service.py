@@ -1,7 +1,9 @@
 """
 备份服务
 支持数据库备份、恢复、定时备份等功能
+MySQL 使用 mysqldump/mysql 命令（.sql），SQLite 使用在线备份 API（.db）
 """
+import sqlite3
 import subprocess
 import shutil
 from datetime import datetime, timedelta
@@ -22,6 +24,8 @@ class BackupService:
 
         # 数据库配置
         self.db_config = config.database
+        self.is_sqlite = self.db_config.backend == "sqlite"
+        self.backup_suffix = ".db" if self.is_sqlite else ".sql"
 
     def create_backup(self, backup_name: Optional[str] = None) -> Optional[Path]:
         """
@@ -37,10 +41,13 @@ class BackupService:
             # 生成备份文件名
             if backup_name is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_name = f"translearn_backup_{timestamp}.sql"
+                backup_name = f"translearn_backup_{timestamp}{self.backup_suffix}"
 
             backup_path = self.backup_dir / backup_name
 
+            if self.is_sqlite:
+                return self._create_sqlite_backup(backup_path)
+
             # 构建mysqldump命令
             cmd = [
                 "mysqldump",
@@ -52,6 +59,7 @@ class BackupService:
                 "--routines",  # 包含存储过程
                 "--triggers",  # 包含触发器
                 "--events",  # 包含事件
+                "--hex-blob",  # 压缩存储的 BLOB 列按十六进制导出，避免编码损坏
                 self.db_config.database
             ]
 
@@ -93,6 +101,68 @@ class BackupService:
             logger.error(f"创建备份失败: {e}")
             return None
 
+    def _create_sqlite_backup(self, backup_path: Path) -> Optional[Path]:
+        """
+        SQLite 在线备份（WAL 模式下读写不受影响，得到一致的快照）
+
+        Args:
+            backup_path: 备份文件路径
+
+        Returns:
+            备份文件路径，失败返回None
+        """
+        try:
+            source = sqlite3.connect(self.db_config.sqlite_file)
+            target = sqlite3.connect(backup_path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+
+            size_mb = backup_path.stat().st_size / (1024 * 1024)
+            logger.info(f"备份成功: {backup_path} ({size_mb:.2f} MB)")
+
+            self._cleanup_old_backups()
+            return backup_path
+
+        except Exception as e:
+            logger.error(f"创建备份失败: {e}")
+            if backup_path.exists():
+                backup_path.unlink()
+            return None
+
+    def _restore_sqlite_backup(self, backup_path: Path) -> bool:
+        """
+        从 SQLite 备份恢复
+
+        Args:
+            backup_path: 备份文件路径
+
+        Returns:
+            是否成功
+        """
+        from src.data.database import db_manager
+
+        try:
+            # 先释放连接池中的连接
+            db_manager.close()
+
+            source = sqlite3.connect(backup_path)
+            target = sqlite3.connect(self.db_config.sqlite_file)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+
+            logger.info(f"恢复成功: {backup_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"恢复备份失败: {e}")
+            return False
+
     def restore_backup(self, backup_path: Path) -> bool:
         """
         从备份恢复数据库
@@ -111,6 +181,9 @@ class BackupService:
             # 确认操作
             logger.warning(f"即将从备份恢复数据库，当前数据将被覆盖: {backup_path}")
 
+            if self.is_sqlite:
+                return self._restore_sqlite_backup(backup_path)
+
             # 构建mysql命令
             cmd = [
                 "mysql",
@@ -159,7 +232,7 @@ class BackupService:
         backups = []
 
         try:
-            for backup_file in sorted(self.backup_dir.glob("*.sql"), reverse=True):
+            for backup_file in sorted(self.backup_dir.glob(f"*{self.backup_suffix}"), reverse=True):
                 stat = backup_file.stat()
                 backups.append({
                     'name': backup_file.name,
@@ -282,7 +355,7 @@ class BackupService:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
             # 1. 数据库备份
-            db_backup_name = f"database_{timestamp}.sql"
+            db_backup_name = f"database_{timestamp}{self.backup_suffix}"
             db_backup = self.create_backup(db_backup_name)
 
             if db_backup:
@@ -324,7 +397,7 @@ class BackupService:
                 return False
 
             # 1. 恢复数据库
-            db_backups = list(import_dir.glob("database_*.sql"))
+            db_backups = list(import_dir.glob(f"database_*{self.backup_suffix}"))
             if db_backups:
                 # 使用最新的备份
                 latest_backup = sorted(db_backups, reverse=True)[0]
@@ -0,0 +1,88 @@
+"""
+缓存维护服务
+后台线程定期分批清理过期缓存，并在容量超出 cache.max_size_mb 时按命中次数和最近访问时间淘汰
+"""
+import threading
+from typing import Optional
+from loguru import logger
+
+from src.data.repository import CacheRepository
+from src.utils.config_loader import config
+
+
+class CacheMaintenanceService:
+    """缓存维护服务"""
+
+    def __init__(self):
+        self.cache_repo = CacheRepository()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enforce_size_limit(self) -> int:
+        """
+        将缓存容量控制在上限以内
+
+        Returns:
+            淘汰的条数
+        """
+        max_bytes = config.cache.max_size_mb * 1024 * 1024
+        if max_bytes <= 0:
+            return 0
+
+        total = self.cache_repo.get_total_size()
+        if total <= max_bytes:
+            return 0
+
+        target = int(max_bytes * config.cache.evict_target_ratio)
+        deleted, freed = self.cache_repo.evict(total - target)
+        logger.info(
+            f"缓存超出上限 ({total / 1024 / 1024:.1f}MB > {config.cache.max_size_mb}MB)，"
+            f"淘汰 {deleted} 条，释放 {freed / 1024 / 1024:.1f}MB"
+        )
+        return deleted
+
+    def sweep_expired(self) -> int:
+        """
+        分批删除过期缓存
+
+        Returns:
+            删除的条数
+        """
+        return self.cache_repo.clean_expired(
+            batch_size=config.cache.sweep_batch_size,
+            pause=config.cache.sweep_pause_ms / 1000
+        )
+
+    def run_once(self):
+        """执行一轮维护"""
+        try:
+            # 先写回缓冲的命中次数，淘汰按最新的访问情况排序
+            self.cache_repo.flush_hits()
+            self.sweep_expired()
+            self.enforce_size_limit()
+        except Exception as e:
+            logger.error(f"缓存维护失败: {e}")
+
+    def start(self):
+        """启动后台维护线程"""
+        if not config.cache.enabled or (self._thread and self._thread.is_alive()):
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="CacheMaintenance", daemon=True)
+        self._thread.start()
+        logger.info("缓存维护线程已启动")
+
+    def stop(self):
+        """停止后台维护线程"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self):
+        """维护循环：启动时先执行一次，之后按周期执行"""
+        interval = max(config.cache.maintenance_interval_minutes, 1) * 60
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(interval)
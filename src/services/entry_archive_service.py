@@ -0,0 +1,61 @@
+"""
+词条归档服务
+后台线程定期将删除超过 data.archive_retention_days 的软删除词条分批移入归档表，
+entries 表及其索引只保留有效数据
+"""
+import threading
+from typing import Optional
+from loguru import logger
+
+from src.data.repository import EntryRepository
+from src.utils.config_loader import config
+
+
+class EntryArchiveService:
+    """词条归档服务"""
+
+    def __init__(self):
+        self.entry_repo = EntryRepository()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> int:
+        """
+        执行一轮归档
+
+        Returns:
+            归档的条数
+        """
+        try:
+            return self.entry_repo.archive_deleted(
+                retention_days=config.data.archive_retention_days,
+                batch_size=config.data.archive_batch_size,
+                pause=config.data.archive_pause_ms / 1000
+            )
+        except Exception as e:
+            logger.error(f"词条归档失败: {e}")
+            return 0
+
+    def start(self):
+        """启动后台归档线程"""
+        if not config.data.archive_enabled or (self._thread and self._thread.is_alive()):
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="EntryArchive", daemon=True)
+        self._thread.start()
+        logger.info("词条归档线程已启动")
+
+    def stop(self):
+        """停止后台归档线程"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self):
+        """归档循环：启动时先执行一次，之后按周期执行"""
+        interval = max(config.data.archive_interval_hours, 1) * 3600
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(interval)
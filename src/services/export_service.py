@@ -6,7 +6,7 @@ import json
 import csv
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from loguru import logger
 
 from src.data.models import Entry
@@ -19,6 +19,17 @@ class ExportService:
     def __init__(self):
         self.entry_repo = EntryRepository()
 
+    def _source(self, entries: Optional[List[Entry]]) -> Iterable[Entry]:
+        """待导出词条，未指定时流式读取全部"""
+        return entries if entries is not None else self.entry_repo.iter_entries()
+
+    @staticmethod
+    def _discard_empty(output_path: str) -> bool:
+        """没有词条时删除已创建的空文件"""
+        logger.warning("没有词条可导出")
+        Path(output_path).unlink(missing_ok=True)
+        return False
+
     def export_to_csv(
         self,
         output_path: str,
@@ -37,13 +48,6 @@ class ExportService:
             是否成功
         """
         try:
-            if entries is None:
-                entries = self.entry_repo.get_all(limit=10000)
-
-            if not entries:
-                logger.warning("没有词条可导出")
-                return False
-
             # 确定字段
             if include_all_fields:
                 fieldnames = [
@@ -61,12 +65,13 @@ class ExportService:
                     'review_count', 'created_at'
                 ]
 
-            # 写入CSV
+            # 写入CSV（逐条写入）
+            count = 0
             with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
 
-                for entry in entries:
+                for entry in self._source(entries):
                     row = {}
                     for field in fieldnames:
                         value = getattr(entry, field, '')
@@ -78,8 +83,12 @@ class ExportService:
                         row[field] = value
 
                     writer.writerow(row)
+                    count += 1
+
+            if count == 0:
+                return self._discard_empty(output_path)
 
-            logger.info(f"成功导出 {len(entries)} 条记录到 {output_path}")
+            logger.info(f"成功导出 {count} 条记录到 {output_path}")
             return True
 
         except Exception as e:
@@ -108,16 +117,9 @@ class ExportService:
             from openpyxl import load_workbook
             from openpyxl.styles import Font, PatternFill, Alignment
 
-            if entries is None:
-                entries = self.entry_repo.get_all(limit=10000)
-
-            if not entries:
-                logger.warning("没有词条可导出")
-                return False
-
             # 构建数据
             data = []
-            for entry in entries:
+            for entry in self._source(entries):
                 if include_all_fields:
                     row = {
                         'ID': entry.id,
@@ -158,6 +160,10 @@ class ExportService:
                     }
                 data.append(row)
 
+            if not data:
+                logger.warning("没有词条可导出")
+                return False
+
             # 创建DataFrame
             df = pd.DataFrame(data)
 
@@ -193,7 +199,7 @@ class ExportService:
 
             wb.save(output_path)
 
-            logger.info(f"成功导出 {len(entries)} 条记录到 {output_path}")
+            logger.info(f"成功导出 {len(data)} 条记录到 {output_path}")
             return True
 
         except Exception as e:
@@ -218,52 +224,49 @@ class ExportService:
             是否成功
         """
         try:
-            if entries is None:
-                entries = self.entry_repo.get_all(limit=10000)
-
-            if not entries:
-                logger.warning("没有词条可导出")
-                return False
-
-            # 构建数据
-            data = []
-            for entry in entries:
-                item = {
-                    'id': entry.id,
-                    'source_text': entry.source_text,
-                    'translation': entry.translation,
-                    'source_lang': entry.source_lang,
-                    'target_lang': entry.target_lang,
-                    'entry_type': entry.entry_type,
-                    'context': entry.context,
-                    'source_app': entry.source_app,
-                    'source_url': entry.source_url,
-                    'familiarity': entry.familiarity,
-                    'proficiency': entry.proficiency,
-                    'review_count': entry.review_count,
-                    'correct_count': entry.correct_count,
-                    'last_review': entry.last_review.isoformat() if entry.last_review else None,
-                    'next_review': entry.next_review.isoformat() if entry.next_review else None,
-                    'ease_factor': entry.ease_factor,
-                    'interval': entry.interval,
-                    'is_starred': entry.is_starred,
-                    'tags': entry.tags,
-                    'notes': entry.notes,
-                    'translator_type': entry.translator_type,
-                    'translation_time': entry.translation_time,
-                    'created_at': entry.created_at.isoformat() if entry.created_at else None,
-                    'updated_at': entry.updated_at.isoformat() if entry.updated_at else None
-                }
-                data.append(item)
-
-            # 写入JSON
+            # 逐条写入 JSON 数组
+            count = 0
+            indent = 2 if pretty else None
             with open(output_path, 'w', encoding='utf-8') as f:
-                if pretty:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                else:
-                    json.dump(data, f, ensure_ascii=False)
+                f.write("[")
+                for entry in self._source(entries):
+                    item = {
+                        'id': entry.id,
+                        'source_text': entry.source_text,
+                        'translation': entry.translation,
+                        'source_lang': entry.source_lang,
+                        'target_lang': entry.target_lang,
+                        'entry_type': entry.entry_type,
+                        'context': entry.context,
+                        'source_app': entry.source_app,
+                        'source_url': entry.source_url,
+                        'familiarity': entry.familiarity,
+                        'proficiency': entry.proficiency,
+                        'review_count': entry.review_count,
+                        'correct_count': entry.correct_count,
+                        'last_review': entry.last_review.isoformat() if entry.last_review else None,
+                        'next_review': entry.next_review.isoformat() if entry.next_review else None,
+                        'ease_factor': entry.ease_factor,
+                        'interval': entry.interval,
+                        'is_starred': entry.is_starred,
+                        'tags': entry.tags,
+                        'notes': entry.notes,
+                        'translator_type': entry.translator_type,
+                        'translation_time': entry.translation_time,
+                        'created_at': entry.created_at.isoformat() if entry.created_at else None,
+                        'updated_at': entry.updated_at.isoformat() if entry.updated_at else None
+                    }
+                    text = json.dumps(item, ensure_ascii=False, indent=indent)
+                    if pretty:
+                        text = "\n" + "\n".join("  " + line for line in text.split("\n"))
+                    f.write(("," if count else "") + text)
+                    count += 1
+                f.write("\n]" if pretty and count else "]")
+
+            if count == 0:
+                return self._discard_empty(output_path)
 
-            logger.info(f"成功导出 {len(entries)} 条记录到 {output_path}")
+            logger.info(f"成功导出 {count} 条记录到 {output_path}")
             return True
 
         except Exception as e:
@@ -286,16 +289,10 @@ class ExportService:
             是否成功
         """
         try:
-            if entries is None:
-                entries = self.entry_repo.get_all(limit=10000)
-
-            if not entries:
-                logger.warning("没有词条可导出")
-                return False
-
             # 写入Anki格式
+            count = 0
             with open(output_path, 'w', encoding='utf-8') as f:
-                for entry in entries:
+                for entry in self._source(entries):
                     # Anki格式：正面	背面	标签
                     front = entry.source_text
                     back = entry.translation
@@ -309,8 +306,12 @@ class ExportService:
 
                     # 写入（tab分隔）
                     f.write(f"{front}\t{back}\t{tags}\n")
+                    count += 1
+
+            if count == 0:
+                return self._discard_empty(output_path)
 
-            logger.info(f"成功导出 {len(entries)} 条记录到 {output_path} (Anki格式)")
+            logger.info(f"成功导出 {count} 条记录到 {output_path} (Anki格式)")
             return True
 
         except Exception as e:
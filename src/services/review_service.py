@@ -39,18 +39,25 @@ class ReviewService:
             logger.error(f"获取待复习词条失败: {e}")
             return []
 
-    def get_reviews_by_urgency(self) -> Dict[str, List[Entry]]:
+    def get_reviews_by_urgency(self, limit_per_bucket: int = 200) -> Dict[str, list]:
         """
         按紧急程度获取待复习词条
 
+        Args:
+            limit_per_bucket: 每组最多返回的条数
+
         Returns:
-            字典，包含 overdue, today, soon 三个列表
+            字典，包含 overdue, today, soon 三个列表（只含复习所需的列），
+            以及 counts: 各组实际总数
         """
         try:
-            return self.entry_repo.get_due_reviews_by_urgency()
+            return self.entry_repo.get_due_reviews_by_urgency(limit_per_bucket)
         except Exception as e:
             logger.error(f"获取分类复习列表失败: {e}")
-            return {'overdue': [], 'today': [], 'soon': []}
+            return {
+                'overdue': [], 'today': [], 'soon': [],
+                'counts': {'overdue': 0, 'today': 0, 'soon': 0}
+            }
 
     def submit_review(
         self,
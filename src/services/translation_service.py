@@ -3,13 +3,20 @@
 """
 import asyncio
 import hashlib
+import inspect
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 from loguru import logger
 
 from src.core.translator_interface import TranslationResult, TranslatorType
 from src.core.translator_factory import TranslatorFactory
 from src.core.smart_router import SmartRouter
+from src.core.result_codec import encode_result, decode_result
+from src.core.rate_limiter import AIRateLimitError, ai_priority, PRIORITY_BATCH
+from src.core.negative_cache import negative_cache
+from src.data.database import db_manager
+from src.data.async_database import async_db_manager
 from src.data.repository import EntryRepository, CacheRepository, StatsRepository
 from src.data.models import Entry, TranslationCache
 from src.utils.config_loader import config
@@ -21,10 +28,63 @@ class TranslationService:
     def __init__(self):
         self.factory = TranslatorFactory()
         self.router = SmartRouter()
-        self.entry_repo = EntryRepository()
-        self.cache_repo = CacheRepository()
-        self.stats_repo = StatsRepository()
-    
+
+        # 安装了异步驱动时使用异步仓储，数据库 I/O 不阻塞事件循环
+        self.async_db = async_db_manager.is_available()
+        if self.async_db:
+            from src.data.async_repository import (
+                AsyncEntryRepository, AsyncCacheRepository, AsyncStatsRepository
+            )
+            self.entry_repo = AsyncEntryRepository()
+            self.cache_repo = AsyncCacheRepository()
+            self.stats_repo = AsyncStatsRepository()
+        else:
+            self.entry_repo = EntryRepository()
+            self.cache_repo = CacheRepository()
+            self.stats_repo = StatsRepository()
+
+    @staticmethod
+    async def _db(value):
+        """等待异步仓储的调用结果（同步仓储直接返回）"""
+        if inspect.isawaitable(value):
+            return await value
+        return value
+
+    @asynccontextmanager
+    async def _unit_of_work(self):
+        """缓存、词条、统计的写入共用一个工作单元"""
+        if self.async_db:
+            async with async_db_manager.unit_of_work():
+                yield
+        else:
+            with db_manager.unit_of_work():
+                yield
+
+    @asynccontextmanager
+    async def _savepoint(self):
+        """
+        工作单元中单项写入的保存点
+
+        写入失败只回滚这一项并抛出异常，由调用方记录日志；会话和其他写入不受影响。
+        """
+        if self.async_db:
+            async with async_db_manager.savepoint():
+                yield
+        else:
+            with db_manager.savepoint():
+                yield
+
+    @staticmethod
+    def _rate_limited_result(error: AIRateLimitError, source_lang: str, target_lang: str) -> TranslationResult:
+        """AI 被限流时的提示结果（直接调用 AI 和词典降级到 AI 共用）"""
+        logger.warning(f"AI 请求被限流: {error}")
+        return TranslationResult(
+            translation=f"⏳ {error}",
+            source_lang=source_lang,
+            target_lang=target_lang,
+            translator_type="rate_limited"
+        )
+
     async def translate(
         self,
         text: str,
@@ -59,9 +119,13 @@ class TranslationService:
             # 3. 检查缓存
             if config.cache.enabled:
                 cache_key = self._generate_cache_key(text, source_lang, target_lang)
-                cached = self.cache_repo.get(cache_key)
+                cached = await self._db(self.cache_repo.get(cache_key))
                 if cached:
                     logger.info(f"命中缓存: {text[:20]}...")
+                    result = decode_result(cached.translation, cached.payload)
+                    if result:
+                        return result
+                    # 旧格式缓存只有译文
                     return TranslationResult(
                         translation=cached.translation,
                         source_lang=source_lang,
@@ -71,6 +135,7 @@ class TranslationService:
             
             # 4. 智能路由选择翻译器
             translator_type = self.router.choose_translator(text, source_lang)
+            translator_type = self._skip_known_miss(text, source_lang, target_lang, translator_type)
             
             logger.info(f"使用翻译器: {translator_type.value} | 文本: {text[:30]}...")
             
@@ -79,10 +144,26 @@ class TranslationService:
             
             # 使用工厂获取翻译器
             translator = self.factory.get_translator(translator_type)
+            succeeded_type = translator_type
             
+            known_miss = False
             try:
+                if negative_cache.is_miss(text, source_lang, target_lang,
+                                          translator_type, translator.get_version()):
+                    # 已知查不到，不再重复查询
+                    known_miss = True
+                    raise KeyError(f"已知未收录: {text}")
                 result = await translator.translate(text, source_lang, target_lang)
+            except AIRateLimitError as e:
+                # AI 被限流，快速返回提示（不缓存、不计入统计）
+                return self._rate_limited_result(e, source_lang, target_lang)
             except KeyError as e:
+                # 只记录翻译器实际查询的未命中；命中负缓存时不刷新有效期，到期后会重新查询
+                if not known_miss:
+                    negative_cache.record_miss(text, source_lang, target_lang,
+                                               translator_type, translator.get_version())
+                succeeded_type = TranslatorType.AI
+
                 # 词典未找到，降级到 AI
                 if translator_type == TranslatorType.LOCAL_DICT:
                     logger.info(f"本地词典未找到 '{text}'，尝试 AI 翻译")
@@ -100,7 +181,10 @@ class TranslationService:
                     translator = self.factory.get_translator(TranslatorType.AI)
                     try:
                         result = await translator.translate(text, source_lang, target_lang)
-                        result.translator_type = "ai_fallback_from_local"
+                        if result.translator_type != "failed":
+                            result.translator_type = "ai_fallback_from_local"
+                    except AIRateLimitError as e:
+                        return self._rate_limited_result(e, source_lang, target_lang)
                     except Exception as ai_error:
                         logger.error(f"AI翻译失败: {ai_error}")
                         return TranslationResult(
@@ -126,7 +210,10 @@ class TranslationService:
                     translator = self.factory.get_translator(TranslatorType.AI)
                     try:
                         result = await translator.translate(text, source_lang, target_lang)
-                        result.translator_type = "ai_fallback_from_online"
+                        if result.translator_type != "failed":
+                            result.translator_type = "ai_fallback_from_online"
+                    except AIRateLimitError as e:
+                        return self._rate_limited_result(e, source_lang, target_lang)
                     except Exception as ai_error:
                         logger.error(f"AI翻译失败: {ai_error}")
                         return TranslationResult(
@@ -139,20 +226,33 @@ class TranslationService:
                     raise
             
             elapsed = asyncio.get_event_loop().time() - start_time
-            
+
+            # AI 翻译器出错时返回的是错误提示：原样返回，不记为成功，不缓存、不入库、不计入统计
+            if result.translator_type == "failed":
+                result.translation_time = elapsed
+                return result
+
+            negative_cache.record_success(text, source_lang, target_lang, succeeded_type)
             result.translator_type = translator_type.value
             result.translation_time = elapsed
             
-            # 6. 缓存结果
-            if config.cache.enabled:
-                self._save_to_cache(cache_key, text, result)
-            
-            # 7. 保存到数据库
-            if save_to_db or self._should_auto_save(text):
-                self._save_entry(text, result, context)
-            
-            # 8. 更新统计
-            self._update_stats(translator_type, result)
+            # 6~8. 缓存、入库、统计在同一个工作单元中写入（一个连接、一次提交）
+            # 不把翻译器调用包在事务里，避免网络请求期间占用连接
+            # 每项写入各有保存点，其中一项失败（如并发写入同一缓存键）不影响其他写入
+            try:
+                async with self._unit_of_work():
+                    # 6. 缓存结果
+                    if config.cache.enabled:
+                        await self._save_to_cache(cache_key, text, result)
+                    
+                    # 7. 保存到数据库
+                    if save_to_db or await self._should_auto_save(text):
+                        await self._save_entry(text, result, context)
+                    
+                    # 8. 更新统计
+                    await self._update_stats(translator_type, result)
+            except Exception as e:
+                logger.error(f"保存翻译记录失败: {e}")
             
             logger.success(f"翻译完成，耗时 {elapsed:.2f}s")
             return result
@@ -161,12 +261,82 @@ class TranslationService:
             logger.error(f"翻译失败: {e}")
             raise
     
+    async def translate_many(
+        self,
+        texts: List[str],
+        source_lang: Optional[str] = None,
+        target_lang: str = "zh",
+        save_to_db: bool = False
+    ) -> List[TranslationResult]:
+        """
+        批量翻译（并发执行，短句会被 AI 翻译器合并为一次请求）
+
+        Args:
+            texts: 待翻译文本列表
+            source_lang: 源语言（None=自动检测）
+            target_lang: 目标语言
+            save_to_db: 是否保存到数据库
+
+        Returns:
+            与 texts 顺序一致的翻译结果，失败的条目 translator_type 为 "failed"
+        """
+        # 批量任务以低优先级排队，避免挤占交互式翻译的 AI 配额
+        token = ai_priority.set(PRIORITY_BATCH)
+        try:
+            # 一次性批量检测语言
+            if source_lang:
+                source_langs = [source_lang] * len(texts)
+            else:
+                source_langs = await self.router.detect_languages([text.strip() for text in texts])
+
+            results = await asyncio.gather(
+                *[self.translate(text, lang, target_lang, save_to_db)
+                  for text, lang in zip(texts, source_langs)],
+                return_exceptions=True
+            )
+        finally:
+            ai_priority.reset(token)
+
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                results[i] = TranslationResult(
+                    translation=f"翻译失败: {str(result)}",
+                    source_lang=source_lang or "en",
+                    target_lang=target_lang,
+                    translator_type="failed"
+                )
+
+        return results
+
+    def _skip_known_miss(self, text: str, source_lang: str, target_lang: str,
+                         translator_type: TranslatorType) -> TranslatorType:
+        """
+        路由选中的词典已知查不到该文本时，直接使用上次翻译成功的翻译器
+
+        Returns:
+            实际使用的翻译器类型
+        """
+        if translator_type == TranslatorType.AI:
+            return translator_type
+
+        translator = self.factory.get_translator(translator_type)
+        if not negative_cache.is_miss(text, source_lang, target_lang,
+                                      translator_type, translator.get_version()):
+            return translator_type
+
+        last_success = negative_cache.get_last_success(text, source_lang, target_lang)
+        if last_success and last_success != translator_type:
+            logger.debug(f"{translator_type.value} 已知未收录，直接使用 {last_success.value}")
+            return last_success
+
+        return translator_type
+
     def _generate_cache_key(self, text: str, source_lang: str, target_lang: str) -> str:
         """生成缓存键"""
         key_str = f"{text}:{source_lang}:{target_lang}"
         return hashlib.md5(key_str.encode()).hexdigest()
     
-    def _save_to_cache(self, cache_key: str, text: str, result: TranslationResult):
+    async def _save_to_cache(self, cache_key: str, text: str, result: TranslationResult):
         """保存到缓存"""
         try:
             expire_days = config.cache.expire_days
@@ -177,27 +347,29 @@ class TranslationService:
                 source_text=text,
                 translation=result.translation,
                 translator_type=result.translator_type or "unknown",
+                payload=encode_result(result),
                 expires_at=expires_at
             )
             
-            self.cache_repo.set(cache)
+            async with self._savepoint():
+                await self._db(self.cache_repo.set(cache))
         except Exception as e:
             logger.error(f"保存缓存失败: {e}")
     
-    def _should_auto_save(self, text: str) -> bool:
+    async def _should_auto_save(self, text: str) -> bool:
         """判断是否应该自动保存"""
         if not config.features.auto_save:
             return False
         
         # 查询历史次数
         try:
-            count = self.entry_repo.get_query_count(text)
+            count = await self._db(self.entry_repo.get_query_count(text))
             return count >= config.features.auto_save_threshold
         except Exception as e:
             logger.error(f"查询次数失败: {e}")
             return False
     
-    def _save_entry(self, text: str, result: TranslationResult, context: Optional[dict]):
+    async def _save_entry(self, text: str, result: TranslationResult, context: Optional[dict]):
         """保存词条"""
         try:
             # 获取初始复习参数
@@ -224,12 +396,13 @@ class TranslationService:
                 correct_count=0
             )
 
-            self.entry_repo.save(entry)
+            async with self._savepoint():
+                await self._db(self.entry_repo.save(entry))
             logger.debug(f"词条已保存，下次复习时间: {next_review.strftime('%Y-%m-%d')}")
         except Exception as e:
             logger.error(f"保存词条失败: {e}")
     
-    def _update_stats(self, translator_type: TranslatorType, result: TranslationResult):
+    async def _update_stats(self, translator_type: TranslatorType, result: TranslationResult):
         """更新统计"""
         try:
             stats_data = {"translation_count": 1}
@@ -241,7 +414,8 @@ class TranslationService:
                     stats_data["ai_tokens"] = result.tokens_used
                     logger.debug(f"记录AI tokens: {result.tokens_used}")
 
-            self.stats_repo.update_today_stats(**stats_data)
+            async with self._savepoint():
+                await self._db(self.stats_repo.update_today_stats(**stats_data))
         except Exception as e:
             logger.error(f"更新统计失败: {e}")
 
@@ -10,8 +10,10 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from loguru import logger
 
+from src.data.database import db_manager
 from src.data.models import Entry
 from src.data.repository import EntryRepository
+from src.data.tag_repository import TagRepository
 
 
 class EntryDetailDialog(QDialog):
@@ -21,6 +23,7 @@ class EntryDetailDialog(QDialog):
         super().__init__(parent)
         self.entry = entry
         self.entry_repo = EntryRepository()
+        self.tag_repo = TagRepository()
         
         self.setWindowTitle("词条详情")
         self.resize(600, 700)
@@ -245,13 +248,7 @@ class EntryDetailDialog(QDialog):
                 self.last_review_label.setText("从未复习")
             
             # 标签
-            if self.entry.tags:
-                import json
-                try:
-                    tags = json.loads(self.entry.tags)
-                    self.tags_list.addItems(tags)
-                except:
-                    pass
+            self.tags_list.addItems(TagRepository.parse_tags(self.entry.tags))
             
             # 笔记
             if self.entry.notes:
@@ -269,16 +266,14 @@ class EntryDetailDialog(QDialog):
             self.entry.source_text = self.source_edit.toPlainText()
             self.entry.translation = self.translation_edit.toPlainText()
             
-            # 更新标签
-            import json
-            tags = [self.tags_list.item(i).text() for i in range(self.tags_list.count())]
-            self.entry.tags = json.dumps(tags, ensure_ascii=False) if tags else None
-            
             # 更新笔记
             self.entry.notes = self.notes_edit.toPlainText() or None
             
-            # 保存到数据库
-            self.entry_repo.save(self.entry)
+            # 保存到数据库（标签写入 entry_tags 并同步 JSON 列）
+            tags = [self.tags_list.item(i).text() for i in range(self.tags_list.count())]
+            with db_manager.unit_of_work():
+                self.entry_repo.save(self.entry)
+                self.tag_repo.set_entry_tags(self.entry.id, tags)
             
             QMessageBox.information(self, "成功", "词条已保存！")
             self.accept()
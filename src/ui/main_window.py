@@ -4,12 +4,13 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QListWidget, QLineEdit,
-    QTabWidget
+    QTabWidget, QComboBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from loguru import logger
 
 from src.data.repository import EntryRepository
+from src.data.tag_repository import TagRepository
 from src.utils.config_loader import config
 from src.ui.settings_dialog import SettingsDialog
 from src.ui.entry_detail_dialog import EntryDetailDialog
@@ -24,6 +25,7 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.entry_repo = EntryRepository()
+        self.tag_repo = TagRepository()
         self.review_service = ReviewService()
         self.review_window = ReviewWindow()
         self.init_ui()
@@ -65,7 +67,12 @@ class MainWindow(QMainWindow):
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("搜索...")
         self.search_box.setFixedWidth(300)
-        self.search_box.textChanged.connect(self._on_search)
+        # 输入停顿后再搜索，避免每次按键都查询
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(lambda: self._on_search(self.search_box.text().strip()))
+        self.search_box.textChanged.connect(self.search_timer.start)
         self.search_box.setStyleSheet("""
             QLineEdit {
                 padding: 8px 12px;
@@ -140,6 +147,13 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(16, 16, 16, 16)
         
+        # 标签筛选（显示各标签词条数）
+        self.tag_filter = QComboBox()
+        self.tag_filter.setFixedWidth(240)
+        self._load_tag_filter()
+        self.tag_filter.currentIndexChanged.connect(self._on_tag_filter_changed)
+        layout.addWidget(self.tag_filter)
+        
         # 词条列表
         self.entry_list_widget = QListWidget()
         self.entry_list_widget.setStyleSheet("""
@@ -219,10 +233,11 @@ class MainWindow(QMainWindow):
 
         # 待复习列表
         reviews_by_urgency = self.review_service.get_reviews_by_urgency()
+        urgency_counts = reviews_by_urgency['counts']
 
         # 逾期
         if reviews_by_urgency['overdue']:
-            overdue_label = QLabel(f"⚠️ 逾期复习 ({len(reviews_by_urgency['overdue'])} 个)")
+            overdue_label = QLabel(f"⚠️ 逾期复习 ({urgency_counts['overdue']} 个)")
             overdue_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #dc3545;")
             layout.addWidget(overdue_label)
 
@@ -246,7 +261,7 @@ class MainWindow(QMainWindow):
 
         # 今天
         if reviews_by_urgency['today']:
-            today_label = QLabel(f"📅 今日复习 ({len(reviews_by_urgency['today'])} 个)")
+            today_label = QLabel(f"📅 今日复习 ({urgency_counts['today']} 个)")
             today_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #007bff;")
             layout.addWidget(today_label)
 
@@ -270,7 +285,7 @@ class MainWindow(QMainWindow):
 
         # 即将到期
         if reviews_by_urgency['soon']:
-            soon_label = QLabel(f"🔜 即将到期 ({len(reviews_by_urgency['soon'])} 个)")
+            soon_label = QLabel(f"🔜 即将到期 ({urgency_counts['soon']} 个)")
             soon_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #ffc107;")
             layout.addWidget(soon_label)
 
@@ -335,14 +350,43 @@ class MainWindow(QMainWindow):
         stats_widget = StatisticsWindow()
         return stats_widget
     
+    def _load_tag_filter(self):
+        """加载标签筛选项"""
+        try:
+            current = self.tag_filter.currentData()
+            self.tag_filter.blockSignals(True)
+            self.tag_filter.clear()
+            self.tag_filter.addItem("全部标签", None)
+            
+            for name, count in self.tag_repo.get_tag_counts():
+                self.tag_filter.addItem(f"{name} ({count})", name)
+            
+            index = self.tag_filter.findData(current)
+            self.tag_filter.setCurrentIndex(max(index, 0))
+        
+        except Exception as e:
+            logger.error(f"加载标签失败: {e}")
+        finally:
+            self.tag_filter.blockSignals(False)
+    
+    def _on_tag_filter_changed(self, index: int):
+        """切换标签筛选"""
+        self.search_box.blockSignals(True)
+        self.search_box.clear()
+        self.search_box.blockSignals(False)
+        
+        self.entry_list_widget.clear()
+        self._load_entries(self.entry_list_widget)
+    
     def _load_entries(self, list_widget: QListWidget):
-        """加载词条列表"""
+        """加载词条列表（按当前标签筛选，只查询摘要，详情在打开时读取）"""
         try:
-            self.entries = self.entry_repo.get_all(limit=100)
+            self.entries = self.entry_repo.get_summaries(
+                limit=100, tag_name=self.tag_filter.currentData()
+            )
             
-            for entry in self.entries:
-                item_text = f"{entry.source_text[:50]} → {entry.translation[:50]}"
-                list_widget.addItem(item_text)
+            for summary in self.entries:
+                list_widget.addItem(f"{summary.source_text} → {summary.translation}")
             
             logger.debug(f"加载了 {len(self.entries)} 条记录")
         
@@ -361,12 +405,16 @@ class MainWindow(QMainWindow):
             # 获取对应的词条
             index = self.entry_list_widget.row(item)
             if 0 <= index < len(self.entries):
-                entry = self.entries[index]
+                entry = self.entry_repo.get_by_id(self.entries[index].id)
+                if not entry:
+                    logger.warning(f"词条不存在: {self.entries[index].id}")
+                    return
                 
                 # 打开详情对话框
                 dialog = EntryDetailDialog(entry, self)
                 if dialog.exec():
-                    # 刷新列表
+                    # 刷新标签计数和列表
+                    self._load_tag_filter()
                     self.entry_list_widget.clear()
                     self._load_entries(self.entry_list_widget)
         
@@ -383,12 +431,11 @@ class MainWindow(QMainWindow):
                 self._load_entries(self.entry_list_widget)
             else:
                 # 搜索
-                results = self.entry_repo.search(text, limit=100)
+                results = self.entry_repo.search_summaries(text, limit=100)
                 self.entries = results
                 
-                for entry in results:
-                    item_text = f"{entry.source_text[:50]} → {entry.translation[:50]}"
-                    self.entry_list_widget.addItem(item_text)
+                for summary in results:
+                    self.entry_list_widget.addItem(f"{summary.source_text} → {summary.translation}")
                 
                 logger.debug(f"搜索到 {len(results)} 条记录")
         
@@ -26,21 +26,13 @@ class TranslationWorker(QThread):
     def run(self):
         """执行翻译"""
         try:
-            # 在线程中运行异步代码
-            import asyncio
-
-            # 创建新的事件循环
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # 在常驻后台事件循环中执行，复用 AI 客户端连接池
+            from src.utils.async_runner import get_async_runner
 
-            try:
-                # 执行异步翻译
-                result = loop.run_until_complete(
-                    self.translation_service.translate(self.text)
-                )
-                self.finished.emit(result.translation)
-            finally:
-                loop.close()
+            result = get_async_runner().run(
+                self.translation_service.translate(self.text)
+            )
+            self.finished.emit(result.translation)
 
         except Exception as e:
             logger.error(f"翻译失败: {e}")
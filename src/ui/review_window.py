@@ -301,14 +301,18 @@ class ReviewWindow(QWidget):
         self.answer_label.setText(self.current_entry.translation)
         self.answer_label.show()
 
-        # 显示附加信息
+        # 显示附加信息（按紧急程度开始的复习只带列表所需的列，上下文按需读取）
+        entry = self.current_entry
+        if not isinstance(entry, Entry):
+            entry = self.review_service.entry_repo.get_by_id(entry.id) or entry
+
         extra_info = []
-        if self.current_entry.pronunciation:
-            extra_info.append(f"📢 {self.current_entry.pronunciation}")
-        if self.current_entry.explanation:
-            extra_info.append(f"📖 {self.current_entry.explanation}")
-        if self.current_entry.context:
-            extra_info.append(f"💬 {self.current_entry.context[:100]}")
+        if getattr(entry, "pronunciation", None):
+            extra_info.append(f"📢 {entry.pronunciation}")
+        if getattr(entry, "explanation", None):
+            extra_info.append(f"📖 {entry.explanation}")
+        if getattr(entry, "context", None):
+            extra_info.append(f"💬 {entry.context[:100]}")
 
         if extra_info:
             self.extra_label.setText("\n".join(extra_info))
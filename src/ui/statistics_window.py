@@ -238,23 +238,20 @@ class StatisticsWindow(QWidget):
     def _update_overview(self, start_date, end_date):
         """更新概览数据"""
         try:
-            entry_repo = EntryRepository()
+            # 一次聚合查询得到全部计数（有缓存）
+            summary = EntryRepository().get_review_statistics()
             
             # 总词条数
-            total = entry_repo.get_total_count()
-            self.total_words_label.setText(f"总词条: {total}")
+            self.total_words_label.setText(f"总词条: {summary.get('total_count', 0)}")
             
             # 今日新增
-            today_new = entry_repo.get_entries_by_date(datetime.now().date())
-            self.today_new_label.setText(f"今日新增: {len(today_new)}")
+            self.today_new_label.setText(f"今日新增: {summary.get('today_new', 0)}")
             
-            # 待复习（简化逻辑：创建超过1天未复习的）
-            to_review = entry_repo.get_entries_to_review()
-            self.to_review_label.setText(f"待复习: {len(to_review)}")
+            # 待复习（下次复习时间已到）
+            self.to_review_label.setText(f"待复习: {summary.get('due_count', 0)}")
             
             # 已掌握（熟练度>=80）
-            mastered = entry_repo.get_mastered_entries()
-            self.mastered_label.setText(f"已掌握: {len(mastered)}")
+            self.mastered_label.setText(f"已掌握: {summary.get('mastered_count', 0)}")
             
         except Exception as e:
             logger.error(f"更新概览数据失败: {e}")
@@ -0,0 +1,86 @@
+"""
+后台事件循环
+在常驻线程中运行异步任务，使 HTTP 连接池可以跨多次翻译复用
+"""
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+from loguru import logger
+
+
+class AsyncRunner:
+    """常驻事件循环运行器"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """确保后台事件循环已启动"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="AsyncRunner",
+                    daemon=True
+                )
+                self._thread.start()
+                logger.debug("后台事件循环已启动")
+            return self._loop
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        在后台事件循环中执行协程并等待结果（阻塞调用线程）
+
+        Args:
+            coro: 协程对象
+            timeout: 超时时间（秒），None 表示一直等待
+
+        Returns:
+            协程返回值
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result(timeout)
+
+    def stop(self):
+        """关闭 AI 客户端、异步数据库连接并停止后台事件循环"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+
+        if loop is None:
+            return
+
+        try:
+            from src.core.ai_client_pool import AIClientPool
+            asyncio.run_coroutine_threadsafe(AIClientPool.close_all(), loop).result(5)
+        except Exception as e:
+            logger.warning(f"关闭 AI 客户端失败: {e}")
+
+        try:
+            from src.data.async_database import async_db_manager
+            asyncio.run_coroutine_threadsafe(async_db_manager.close(), loop).result(5)
+        except Exception as e:
+            logger.warning(f"关闭异步数据库连接失败: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread:
+            thread.join(timeout=5)
+        loop.close()
+        logger.debug("后台事件循环已停止")
+
+
+# 全局单例
+_async_runner = None
+
+
+def get_async_runner() -> AsyncRunner:
+    """获取后台事件循环单例"""
+    global _async_runner
+    if _async_runner is None:
+        _async_runner = AsyncRunner()
+    return _async_runner
@@ -8,6 +8,26 @@ from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
 
+# 项目根目录（配置中的相对路径以此为基准，与启动时的工作目录无关）
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def resolve_path(path: str) -> Path:
+    """
+    解析配置中的路径（相对路径按项目根目录解析）
+
+    Args:
+        path: 配置的路径
+
+    Returns:
+        绝对路径
+    """
+    resolved = Path(path).expanduser()
+    if not resolved.is_absolute():
+        resolved = PROJECT_ROOT / resolved
+    return resolved
+
+
 class AppConfig(BaseModel):
     """应用配置"""
     name: str = "TransLearn"
@@ -18,15 +38,36 @@ class AppConfig(BaseModel):
 
 class DatabaseConfig(BaseModel):
     """数据库配置"""
+    backend: str = "mysql"  # mysql / sqlite
+    # SQLite（单机使用，无需数据库服务）
+    sqlite_path: str = "data/translearn.db"
+    sqlite_cache_mb: int = 64  # 页缓存大小
+    sqlite_mmap_mb: int = 256  # 内存映射大小
+    sqlite_busy_timeout_ms: int = 5000  # 写锁等待时间
+    # MySQL
     host: str = "localhost"
     port: int = 3306
     user: str = "root"
     password: str = ""
     database: str = "translearn"
     charset: str = "utf8mb4"
-    pool_size: int = 5
-    max_overflow: int = 10
+    pool_size: int = 5  # 自动确定池大小时作为上限
+    max_overflow: int = 10  # 自动确定池大小时作为上限
     pool_recycle: int = 3600
+    pool_autosize: bool = True  # 按上次运行观测到的并发连接数确定池大小
+    pool_ping_idle_seconds: int = 30  # 借出时只探活空闲超过该时长的连接
+    pool_wait_grow_ms: float = 20  # 上次借出等待 p99 超过该值时池大小放宽到上限
+    # 翻译链路使用异步仓储（需安装 aiosqlite / asyncmy / aiomysql，未安装时自动使用同步仓储）
+    async_enabled: bool = True
+    # SQL 耗时统计
+    query_metrics_enabled: bool = True
+    slow_query_ms: float = 200  # 超过该耗时记录慢查询日志
+    query_caller_sample_every: int = 100  # 每种查询每隔多少条记录一次调用方（慢查询总是记录）
+
+    @property
+    def sqlite_file(self) -> Path:
+        """SQLite 数据库文件的绝对路径（相对路径按项目根目录解析）"""
+        return resolve_path(self.sqlite_path)
 
 
 class HotkeyConfig(BaseModel):
@@ -46,12 +87,25 @@ class AIConfig(BaseModel):
     timeout: int = 15
     max_tokens: int = 500
     temperature: float = 0.3
+    max_connections: int = 10
+    keepalive_expiry: int = 60
+    batch_enabled: bool = True
+    batch_window_ms: int = 20
+    batch_max_items: int = 8
+    batch_max_chars: int = 300
+    requests_per_minute: int = 60
+    tokens_per_minute: int = 60000
+    daily_token_budget: int = 0
+    max_queue_wait: float = 10.0
 
 
 class OnlineDictConfig(BaseModel):
     """在线词典配置"""
     provider: str = "youdao"
     api_key: str = ""
+    app_key: str = ""
+    app_secret: str = ""
+    base_url: str = ""
     timeout: int = 5
 
 
@@ -126,6 +180,14 @@ class CacheConfig(BaseModel):
     enabled: bool = True
     expire_days: int = 30
     max_size_mb: int = 100
+    maintenance_interval_minutes: int = 10  # 后台维护周期
+    evict_target_ratio: float = 0.9  # 超限后淘汰到上限的该比例，避免频繁触发
+    sweep_batch_size: int = 500  # 过期清理每批删除条数
+    sweep_pause_ms: int = 50  # 过期清理批次间暂停
+    negative_cache_size: int = 5000  # 词典未命中缓存条数上限（0=关闭）
+    negative_cache_ttl_hours: int = 24  # 词典未命中缓存有效期
+    hit_flush_interval_seconds: int = 30  # 命中计数批量写回间隔
+    hit_flush_max_keys: int = 200  # 缓冲的缓存键达到该数量时提前写回
 
 
 class BlacklistConfig(BaseModel):
@@ -139,6 +201,14 @@ class DataConfig(BaseModel):
     backup_enabled: bool = True
     backup_interval_days: int = 7
     export_format: str = "csv"
+    compression_enabled: bool = True
+    compression_threshold: int = 1024
+    compression_level: int = 3
+    archive_enabled: bool = True  # 后台归档已删除词条
+    archive_retention_days: int = 30  # 删除超过该天数的词条移入归档表
+    archive_interval_hours: int = 24  # 归档周期
+    archive_batch_size: int = 500  # 每批归档条数
+    archive_pause_ms: int = 50  # 归档批次间暂停
 
 
 class PerformanceConfig(BaseModel):
@@ -166,8 +236,7 @@ class Config(BaseSettings):
         """从文件加载配置"""
         if config_path is None:
             # 默认配置文件路径
-            project_root = Path(__file__).parent.parent.parent
-            config_path = project_root / "data" / "config.toml"
+            config_path = PROJECT_ROOT / "data" / "config.toml"
             
         if not config_path.exists():
             # 如果配置文件不存在，使用示例配置